@@ -0,0 +1,46 @@
+"""Benchmark of the plugin import time at the himena startup.
+
+Run with ``python benchmarks/bench_import.py``.
+"""
+
+import statistics
+import subprocess
+import sys
+
+# Import the plugins as himena does at startup, then import all the job viewer
+# modules, which were imported eagerly before they were registered lazily.
+_CODE = """
+import importlib, time
+t0 = time.perf_counter()
+import himena_relion.relion5, himena_relion.relion5_tomo
+t1 = time.perf_counter()
+from himena_relion._widgets._main import RelionJobViewRegistry
+reg = RelionJobViewRegistry.instance()
+for module in sorted(set(reg._lazy_spa.values()) | set(reg._lazy_tomo.values())):
+    importlib.import_module(module)
+import himena_relion._widgets._plot
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t0)
+"""
+
+
+def _measure() -> tuple[float, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CODE], capture_output=True, text=True, check=True
+    ).stdout
+    lazy, eager = out.split()
+    return float(lazy), float(eager)
+
+
+def main(repeat: int = 5):
+    _measure()  # warm up the file system cache and the bytecode cache
+    results = [_measure() for _ in range(repeat)]
+    lazy = statistics.median(r[0] for r in results)
+    eager = statistics.median(r[1] for r in results)
+    print(f"{'plugin import (lazy viewers)':<40}{lazy * 1e3:>10.1f} ms")
+    print(f"{'plugin import + all viewers':<40}{eager * 1e3:>10.1f} ms")
+    print(f"{'saved at startup':<40}{(eager - lazy) * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark of the low-pass filter used by the image viewers.
+
+Run with ``python benchmarks/bench_lowpass.py``.
+"""
+
+from timeit import repeat
+import numpy as np
+from himena_relion._utils import lowpass_filter
+
+
+def lowpass_filter_per_call(img: np.ndarray, cutoff: float) -> np.ndarray:
+    """The previous implementation, which builds the mesh and runs complex FFTs."""
+    fy, fx = np.fft.fftfreq(img.shape[-2]), np.fft.fftfreq(img.shape[-1])
+    fxx, fyy = np.meshgrid(fx, fy)
+    filter_mask = np.sqrt(fxx**2 + fyy**2) <= cutoff
+    return np.fft.ifft2(np.fft.fft2(img) * filter_mask).real
+
+
+def _bench(label: str, func, number: int):
+    best = min(repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<48}{best * 1e3:>10.3f} ms")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    thumbnails = rng.random((50, 96, 96)).astype(np.float32)
+    micrograph = rng.random((1024, 1024)).astype(np.float32)
+    volume = rng.random((128, 128, 128)).astype(np.float32)
+
+    print("50 thumbnails (96 x 96)")
+    _bench(
+        "  per-call, one by one",
+        lambda: [lowpass_filter_per_call(img, 0.2) for img in thumbnails],
+        number=10,
+    )
+    _bench(
+        "  cached rfft, one by one",
+        lambda: [lowpass_filter(img, 0.2) for img in thumbnails],
+        number=10,
+    )
+    _bench("  cached rfft, batched", lambda: lowpass_filter(thumbnails, 0.2), 10)
+
+    print("binned micrograph (1024 x 1024)")
+    _bench("  per-call", lambda: lowpass_filter_per_call(micrograph, 0.2), 5)
+    _bench("  cached rfft", lambda: lowpass_filter(micrograph, 0.2), 5)
+
+    print("volume (128 x 128 x 128)")
+    _bench("  cached rfft", lambda: lowpass_filter(volume, 0.2, ndim=3), 3)
+
+
+if __name__ == "__main__":
+    main()
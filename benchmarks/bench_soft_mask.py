@@ -0,0 +1,60 @@
+"""Benchmark of the soft-edge mask creation of the manual mask creation job.
+
+Run with ``python benchmarks/bench_soft_mask.py``.
+"""
+
+from timeit import repeat
+import numpy as np
+from scipy import ndimage as ndi
+from himena_relion.relion5.extensions.volume_tools.jobs import soft_edge_mask
+
+
+def soft_edge_mask_full_box(
+    mask: np.ndarray, dilate_pixels: int, edge_pixels: float
+) -> np.ndarray:
+    """The previous implementation, which runs binary dilation and EDT on the box."""
+    size = dilate_pixels * 2 + 1
+    zz, yy, xx = np.indices((size, size, size), dtype=np.float32)
+    center = size // 2
+    distances = np.sqrt((zz - center) ** 2 + (yy - center) ** 2 + (xx - center) ** 2)
+    mask = ndi.binary_dilation(mask, distances <= dilate_pixels)
+    dist_scaled = ndi.distance_transform_edt(~mask) / edge_pixels
+    return (
+        np.cos(np.clip(dist_scaled * np.pi / 2, 0, np.pi)).astype(np.float32) + 1
+    ) / 2
+
+
+def synthetic_mask(size: int, radius_ratio: float) -> np.ndarray:
+    """Binary mask of an ellipsoid with a small blob attached, centered in the box."""
+    zz, yy, xx = np.ogrid[:size, :size, :size]
+    center = size / 2
+    radius = size * radius_ratio
+    ellipsoid = (
+        ((zz - center) / radius) ** 2
+        + ((yy - center) / (radius * 0.8)) ** 2
+        + ((xx - center) / (radius * 0.6)) ** 2
+    ) <= 1
+    blob = ((zz - center - radius) ** 2 + (yy - center) ** 2 + (xx - center) ** 2) <= (
+        radius * 0.3
+    ) ** 2
+    return ellipsoid | blob
+
+
+def _bench(label: str, func, number: int = 1):
+    best = min(repeat(func, number=number, repeat=3)) / number
+    print(f"{label:<48}{best:>10.3f} s")
+
+
+def main():
+    for size, ratio in [(128, 0.3), (256, 0.3), (256, 0.1)]:
+        mask = synthetic_mask(size, ratio)
+        print(f"box {size}^3, mask radius {ratio:.0%} of the box")
+        old = soft_edge_mask_full_box(mask, 3, 6.0)
+        new = soft_edge_mask(mask, dilate_pixels=3, edge_pixels=6.0)
+        print(f"  max difference: {np.abs(old - new).max():.2e}")
+        _bench("  full box", lambda m=mask: soft_edge_mask_full_box(m, 3, 6.0))
+        _bench("  bounding box", lambda m=mask: soft_edge_mask(m, 3, 6.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 from pathlib import Path
 import sys
-from himena_relion.external import run_function
-from himena_relion.pipeline_watcher import run_watcher
 
 
 def main():
     argv = sys.argv[1:]
     if argv[0] == "watch":
+        from himena_relion.pipeline_watcher import run_watcher
+
         if len(argv) < 2:
             relion_dir = Path.cwd()
         else:
@@ -16,4 +16,11 @@ def main():
             locked_ok = True
         run_watcher(relion_dir=relion_dir, locked_ok=locked_ok)
     else:
+        # RELION calls this for every external job execution. GUI components are not
+        # needed, so skip importing them to keep the start-up fast.
+        from himena_relion._impl_objects import set_is_headless
+
+        set_is_headless(True)
+        from himena_relion.external import run_function
+
         run_function()
@@ -0,0 +1,12 @@
+"""Custom widget types used in the annotations.
+
+Widget types are given as import paths, which magicgui resolves only when the widget
+is created. This way, job classes can be defined without importing Qt.
+"""
+
+ToggleButtons = "himena.qt.magicgui.ToggleButtons"
+PathDrop = "himena_relion._widgets._path_input.PathDrop"
+DoseRateEdit = "himena_relion._widgets._magicgui.DoseRateEdit"
+OptimisationSetEdit = "himena_relion._widgets._magicgui.OptimisationSetEdit"
+BfactorEdit = "himena_relion._widgets._magicgui.BfactorEdit"
+Class2DAlgorithmEdit = "himena_relion._widgets._magicgui.Class2DAlgorithmEdit"
@@ -1,5 +1,5 @@
 from typing import Annotated
-from himena_relion._widgets._magicgui import Class2DAlgorithmEdit
+from himena_relion._annotated._widget_types import Class2DAlgorithmEdit
 
 NUM_ITER = Annotated[
     int,
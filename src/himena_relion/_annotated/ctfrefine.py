@@ -1,5 +1,5 @@
 from typing import Annotated
-from himena.qt.magicgui import ToggleButtons
+from himena_relion._annotated._widget_types import ToggleButtons
 
 FIT_CTF_CHOICES = ["No", "Per-micrograph", "Per-particle"]
 
@@ -1,5 +1,5 @@
 from typing import Annotated, Union
-from himena.qt.magicgui import ToggleButtons
+from himena_relion._annotated._widget_types import ToggleButtons
 
 SIZE = Annotated[
     int,
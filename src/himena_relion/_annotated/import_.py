@@ -1,6 +1,5 @@
 from typing import Annotated
-from himena.qt.magicgui import ToggleButtons
-from himena_relion._widgets._magicgui import DoseRateEdit, PathDrop
+from himena_relion._annotated._widget_types import ToggleButtons, DoseRateEdit, PathDrop
 
 FN_IN_RAW = Annotated[
     str,
@@ -1,6 +1,9 @@
 from typing import Annotated
-from himena.qt.magicgui import ToggleButtons
-from himena_relion._widgets._magicgui import PathDrop, OptimisationSetEdit
+from himena_relion._annotated._widget_types import (
+    ToggleButtons,
+    PathDrop,
+    OptimisationSetEdit,
+)
 
 IN_MOVIES = Annotated[
     str,
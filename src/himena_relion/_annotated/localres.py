@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from himena_relion._widgets._path_input import PathDrop
+from himena_relion._annotated._widget_types import PathDrop
 
 ANGPIX = Annotated[
     float | None,
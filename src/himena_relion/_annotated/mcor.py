@@ -1,7 +1,6 @@
 from typing import Annotated
 
-from himena.qt.magicgui import ToggleButtons
-from himena_relion._widgets._path_input import PathDrop
+from himena_relion._annotated._widget_types import ToggleButtons, PathDrop
 
 FIRST_FRAME_SUM = Annotated[
     int,
@@ -1,6 +1,5 @@
 from typing import Annotated
-from himena.qt.magicgui import ToggleButtons
-from himena_relion._widgets._magicgui import BfactorEdit
+from himena_relion._annotated._widget_types import ToggleButtons, BfactorEdit
 
 
 TAU_FUDGE = Annotated[
@@ -1,5 +1,5 @@
 from typing import Annotated
-from himena_relion._widgets._magicgui import PathDrop
+from himena_relion._annotated._widget_types import PathDrop
 
 # mask creation
 LOWPASS_FILTER = Annotated[
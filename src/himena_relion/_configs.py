@@ -77,6 +77,31 @@ class RelionConfig:
         default="/public/EM/RELION/relion/bin/relion_qsub.csh",
         label="Standard Submission Script",
     )
+    lazy_read_threshold: int = config_field(
+        default=512,
+        label="Lazy Reading Threshold (MB)",
+        tooltip=(
+            "MRC files larger than this size are memory-mapped when opened, so that\n"
+            "only the displayed slices are loaded into memory."
+        ),
+    )
+    cache_dir: str = config_field(
+        default="",
+        label="Cache Directory",
+        tooltip=(
+            "Directory where the volumes derived for viewing (averaged, filtered or\n"
+            "binned) are saved, so that they are not computed again. Leave empty to\n"
+            "disable the on-disk cache."
+        ),
+    )
+    cache_size_limit: int = config_field(
+        default=50,
+        label="Cache Size Limit (GB)",
+        tooltip=(
+            "Maximum total size of the cache directory. The least recently used\n"
+            "files are removed when the cache exceeds this size."
+        ),
+    )
 
 
 register_config("himena-relion", "RELION", RelionConfig())
@@ -151,6 +176,39 @@ def get_queue_dict() -> dict[str, str]:
     }
 
 
+def get_lazy_read_threshold() -> int:
+    """File size in bytes above which MRC files are memory-mapped."""
+    try:
+        config = _get_himena_relion_config()
+    except (RuntimeError, StopIteration):
+        # headless or command line use without the main window
+        threshold = RelionConfig().lazy_read_threshold
+    else:
+        threshold = config.lazy_read_threshold
+    return int(threshold) * 1024**2
+
+
+def get_cache_dir() -> str:
+    """Directory of the on-disk cache of derived volumes, empty if disabled."""
+    try:
+        config = _get_himena_relion_config()
+    except (RuntimeError, StopIteration):
+        # viewer widgets may be used without the main window
+        return ""
+    return _may_expand_user(config.cache_dir)
+
+
+def get_cache_size_limit() -> int:
+    """Maximum total size of the cache directory in bytes."""
+    try:
+        config = _get_himena_relion_config()
+    except (RuntimeError, StopIteration):
+        limit = RelionConfig().cache_size_limit
+    else:
+        limit = config.cache_size_limit
+    return int(limit) * 1024**3
+
+
 def _get_himena_relion_config() -> RelionConfig:
     config = get_config(RelionConfig, "himena-relion")
     if config is None:
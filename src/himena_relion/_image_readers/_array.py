@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from functools import lru_cache, reduce
 from io import BytesIO
+import logging
 from pathlib import Path
+import threading
 import time
 from typing import Callable, TYPE_CHECKING, Iterator
 import numpy as np
 from numpy.typing import NDArray
 import mrcfile
 import tifffile
+from himena_relion._configs import get_lazy_read_threshold
+from himena_relion._image_readers import _cache, _pyramid
+
+_LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     Arr = NDArray[np.number]
@@ -26,17 +33,24 @@ class ArrayFilteredView:
         self,
         view: ArrayViewBase,
         post_filter: Callable[[Arr, int], Arr] | None = None,
+        bin_factor: Callable[[], int] | None = None,
     ):
         self._view = view
         if post_filter is None:
             self._post_filter = _no_filter
         else:
             self._post_filter = post_filter
+        self._bin_factor = bin_factor
         self._shape = None
 
     def get_slice(self, index: int) -> Arr:
         """Get a slice of the filtered array."""
-        arr = self._view.get_slice(index)
+        if self._bin_factor is not None and (factor := self._bin_factor()) > 1:
+            arr, binned = self._view.get_binned_slice(index, factor)
+            if binned > 1:
+                return self._post_filter(arr, index, binned=binned)
+        else:
+            arr = self._view.get_slice(index)
         return self._post_filter(arr, index)
 
     def get_scale(self) -> float:
@@ -57,6 +71,10 @@ class ArrayFilteredView:
         """Get the number of slices in the array."""
         return self._view.num_slices()
 
+    def nbytes(self) -> int:
+        """Bytes of the array data loaded in memory (memory-mapped files excluded)."""
+        return self._view.nbytes()
+
     def try_memmap(self, num_retries: int = 5, delay: float = 0.5):
         # writing tomograms takes a long time, so the data may not be ready.
         # `num_slices` will raise an exception if the data is not ready.
@@ -70,16 +88,36 @@ class ArrayFilteredView:
         if last_exception is not None:
             raise last_exception
 
-    def with_filter(self, post_filter: Callable[[Arr, int], Arr]) -> ArrayFilteredView:
-        return ArrayFilteredView(self._view, post_filter)
+    def with_filter(
+        self,
+        post_filter: Callable[[Arr, int], Arr],
+        bin_factor: Callable[[], int] | None = None,
+    ) -> ArrayFilteredView:
+        """Return a new view with the post filter.
+
+        If `bin_factor` is given, the view may read a pre-binned image from the cache.
+        In this case, `post_filter` is called with the `binned` keyword argument,
+        the factor by which the image is already binned.
+        """
+        return ArrayFilteredView(self._view, post_filter, bin_factor)
 
     @classmethod
     def from_array(cls, array: Arr) -> ArrayFilteredView:
         return cls(ArrayDirectView(array))
 
     @classmethod
-    def from_mrc(cls, path: PathLike) -> ArrayFilteredView:
-        return cls(ArrayFromMrc(path))
+    def from_mrc(
+        cls, path: PathLike, use_local_cache: bool = False
+    ) -> ArrayFilteredView:
+        """Read a 3D MRC file.
+
+        If `use_local_cache` is True and the cache directory is configured, a local
+        copy of the file is created in the background and used afterwards. This is
+        useful for large tomograms on shared storage. The copy is float16 if the values
+        fit in it, otherwise float32. Files below the lazy-read threshold are not
+        copied.
+        """
+        return cls(ArrayFromMrc(path, use_local_cache=use_local_cache))
 
     @classmethod
     def from_mrc_splits(cls, paths: list[PathLike]) -> ArrayFilteredView:
@@ -118,6 +156,14 @@ class ArrayViewBase(ABC):
     def get_scale(self) -> float:
         """Get the scale of the array."""
 
+    def get_binned_slice(self, index: int, factor: int) -> tuple[Arr, int]:
+        """Get a slice binned by a divisor of `factor` and the divisor used."""
+        return self.get_slice(index), 1
+
+    def nbytes(self) -> int:
+        """Bytes of the array data loaded in memory."""
+        return 0
+
 
 class ArrayDirectView(ArrayViewBase):
     """Array view that directly wraps a numpy array."""
@@ -136,14 +182,26 @@ class ArrayDirectView(ArrayViewBase):
     def get_scale(self) -> float:
         return 1.0
 
+    def nbytes(self) -> int:
+        if isinstance(self._array, np.memmap):
+            return 0
+        return int(self._array.nbytes)
+
 
 class ArrayFromMrc(ArrayViewBase):
     """Array view that reads slices from a 3D MRC file."""
 
-    def __init__(self, path):
+    def __init__(self, path, use_local_cache: bool = False):
         self._path = Path(path)
+        self._local: np.memmap | None = None
+        self._local_cache_checked = not use_local_cache
 
     def get_slice(self, index: int) -> Arr:
+        if not self._local_cache_checked:
+            self._local_cache_checked = True
+            self._load_or_create_local_copy()
+        if self._local is not None:
+            return np.asarray(self._local[index], dtype=np.float32)
         with mrcfile.mmap(self._path, mode="r") as mrc:
             mmap_data = mrc.data
             if mmap_data.ndim == 2:
@@ -161,13 +219,118 @@ class ArrayFromMrc(ArrayViewBase):
         with mrcfile.open(self._path, mode="r", header_only=True) as mrc:
             return int(mrc.header.nz)
 
+    def get_binned_slice(self, index: int, factor: int) -> tuple[Arr, int]:
+        if (
+            (pfactor := _pyramid.pyramid_factor_for(factor)) > 1
+            and _cache.get_cache_dir()
+            and self.num_slices() == 1
+        ):
+            if (level := _pyramid.read_pyramid_level(self._path, pfactor)) is not None:
+                return np.asarray(level, dtype=np.float32), pfactor
+            _pyramid.start_creating_pyramid(self._path)
+        return self.get_slice(index), 1
+
+    def _load_or_create_local_copy(self):
+        if not _cache.get_cache_dir():
+            return
+        try:
+            if self._path.stat().st_size <= get_lazy_read_threshold():
+                return  # small enough to read directly
+            key = _cache.cache_key([self._path], "local")
+        except OSError:
+            return
+        if (arr := _cache.read_cached_volume(key)) is not None and arr.ndim == 3:
+            self._local = arr
+        else:
+            _cache.start_caching(key, lambda: self._write_local_copy(key))
+
+    def _write_local_copy(self, key: str):
+        from himena_relion.io._io import read_mrc_lazy
+
+        mmap, voxel_size = read_mrc_lazy(self._path)
+        if mmap.ndim != 3:
+            return
+        ok = _cache.write_cached_volume_from_slices(
+            key,
+            mmap.shape,
+            lambda i: mmap[i],
+            voxel_size=float(voxel_size.x),
+            dtype=_local_copy_dtype(self._path),
+        )
+        if ok:
+            self._local = _cache.read_cached_volume(key)
+            _LOGGER.info("Local copy of %s is cached.", self._path.name)
+
+
+_FLOAT16_MAX = float(np.finfo(np.float16).max)
+# float16 keeps the relative precision only above its smallest normal number. The
+# maximum must be large enough so that values 1000 times smaller are still normal.
+_FLOAT16_MIN_SCALE = float(np.finfo(np.float16).smallest_normal) * 1024
+# integers above this are not exactly representable in float16
+_FLOAT16_MAX_INT = 2048
+
+
+def _local_copy_dtype(path: Path) -> type[np.float16] | type[np.float32]:
+    """Data type of the local copy of the MRC file, float16 if the values fit in it.
+
+    The value range is taken from the header statistics, so the file is not read
+    twice. If the statistics are not available, float32 is used.
+    """
+    with mrcfile.open(path, header_only=True, mode="r") as mrc:
+        dtype = mrcfile.utils.data_dtype_from_header(mrc.header)
+        dmin, dmax = float(mrc.header.dmin), float(mrc.header.dmax)
+    if dtype.itemsize == 1 or dtype == np.float16:
+        return np.float16
+    if not (np.isfinite(dmin) and np.isfinite(dmax)) or dmax < dmin:
+        return np.float32  # statistics not calculated
+    max_abs = max(abs(dmin), abs(dmax))
+    if dtype.kind in "iu":
+        fits = max_abs <= _FLOAT16_MAX_INT
+    else:
+        fits = _FLOAT16_MIN_SCALE <= max_abs <= _FLOAT16_MAX
+    return np.float16 if fits else np.float32
+
 
 class ArrayFromMrcSplits(ArrayViewBase):
+    """Array view of the sum of split MRC files, such as half tomograms.
+
+    Each file is memory-mapped once and the summed slices are cached. The files are
+    checked at most once per `_stat_interval` seconds, and opened again if any of
+    them was modified. If the cache directory is configured, the summed volume is
+    saved as a float16 file in a background thread, and slices are read from it
+    afterwards.
+    """
+
+    _slice_cache_size = 8
+    _stat_interval = 1.0
+
     def __init__(self, paths):
         self._paths = [Path(p) for p in paths]
+        self._mmaps: dict[Path, np.memmap] = {}
+        self._sum: np.memmap | None = None
+        self._key: str | None = None
+        self._stats: tuple[tuple[int, int], ...] | None = None
+        self._last_checked = -float("inf")
+        self._slice_cache: OrderedDict[int, Arr] = OrderedDict()
+        self._lock = threading.Lock()
 
     def get_slice(self, index: int) -> Arr:
-        return reduce(lambda a, b: a + b, self._iter_images(index))
+        self._refresh()
+        if self._sum is not None:
+            return np.asarray(self._sum[index], dtype=np.float32)
+        with self._lock:
+            if (cached := self._slice_cache.get(index)) is not None:
+                self._slice_cache.move_to_end(index)
+                return cached
+        images = list(self._iter_images(index))
+        out = reduce(lambda a, b: a + b, images)
+        if len(images) == len(self._paths):
+            with self._lock:
+                self._slice_cache[index] = out
+                while len(self._slice_cache) > self._slice_cache_size:
+                    self._slice_cache.popitem(last=False)
+            self._may_start_writing_sum()
+        return out
 
     def get_scale(self) -> float:
         with mrcfile.open(self._paths[0], header_only=True, mode="r") as mrc:
@@ -180,13 +343,66 @@ class ArrayFromMrcSplits(ArrayViewBase):
 
     def _iter_images(self, index: int) -> Iterator[Arr]:
         for path in self._paths:
+            if (mmap := self._get_mmap(path)) is not None:
+                yield np.asarray(mmap[index])
+
+    def _get_mmap(self, path: Path) -> np.memmap | None:
+        from himena_relion.io._io import read_mrc_lazy
+
+        if (mmap := self._mmaps.get(path)) is None:
             try:
-                with mrcfile.mmap(path, mode="r") as mrc:
-                    out = np.asarray(mrc.data[index])
+                mmap, _ = read_mrc_lazy(path)
             except Exception:
+                # file does not exist or is being written
+                return None
+            self._mmaps[path] = mmap
+        return mmap
+
+    def _refresh(self):
+        """Reopen the files and update the cache key if any of them changed."""
+        if (now := time.monotonic()) - self._last_checked < self._stat_interval:
+            return
+        self._last_checked = now
+        try:
+            stats = tuple(
+                (st.st_mtime_ns, st.st_size) for st in map(Path.stat, self._paths)
+            )
+        except OSError:
+            stats = None
+        if stats == self._stats:
+            return
+        key = sum_ = None
+        if stats is not None and _cache.get_cache_dir():
+            try:
+                key = _cache.cache_key(self._paths, "sum")
+            except OSError:
                 pass
             else:
-                yield out
+                sum_ = _cache.read_cached_volume(key)
+        with self._lock:
+            self._stats = stats
+            self._mmaps.clear()
+            self._slice_cache.clear()
+            self._key, self._sum = key, sum_
+
+    def _may_start_writing_sum(self):
+        if (key := self._key) is not None and self._sum is None:
+            _cache.start_caching(key, lambda: self._write_sum(key))
+
+    def _write_sum(self, key: str):
+        """Save the summed volume to the cache directory."""
+        mmaps = [self._get_mmap(path) for path in self._paths]
+        if any(mmap is None or mmap.ndim != 3 for mmap in mmaps):
+            return
+        ok = _cache.write_cached_volume_from_slices(
+            key,
+            mmaps[0].shape,
+            lambda i: sum(np.asarray(mmap[i], dtype=np.float32) for mmap in mmaps),
+            voxel_size=self.get_scale(),
+        )
+        if ok and key == self._key:
+            self._sum = _cache.read_cached_volume(key)
+            _LOGGER.info("Summed volume of %s is cached.", self._paths[0].name)
 
 
 class ArrayFromFiles(ArrayViewBase):
@@ -239,6 +455,11 @@ class ArrayFromTif(ArrayViewBase):
         self._make_cache()
         return int(self._arr.shape[0])
 
+    def nbytes(self) -> int:
+        if self._arr is None:
+            return 0
+        return int(self._arr.nbytes)
+
     def _make_cache(self):
         if self._arr is None:
             # Opening the file and decompressing all frames takes time, so this process
@@ -0,0 +1,271 @@
+"""Cache of volumes derived from MRC files (averaged, filtered, binned etc.)
+
+Each entry of the on-disk cache is a file or a directory in the cache directory. The
+modification time of an entry is updated when it is read, and the least recently
+used entries are removed when the total size exceeds the configured limit.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+from pathlib import Path
+import shutil
+import threading
+from typing import Callable, Iterable, Iterator, TYPE_CHECKING
+import numpy as np
+import mrcfile
+from himena_relion._configs import get_cache_dir, get_cache_size_limit
+from himena_relion._image_readers._scheduler import get_scheduler, Priority
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_LOGGER = logging.getLogger(__name__)
+_KEYS_IN_PROGRESS: set[str] = set()
+_KEYS_LOCK = threading.Lock()
+
+
+def cache_key(sources: Iterable[str | Path], *params) -> str:
+    """Key of a derived array, determined by the source files and parameters.
+
+    The resolved path, modification time and size of each source file are used, so
+    that the key changes if any of the source files is overwritten.
+    """
+    hasher = hashlib.sha1()
+    for src in sources:
+        src = Path(src).resolve()
+        stat = src.stat()
+        hasher.update(f"{src}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    for param in params:
+        hasher.update(f"{param!r};".encode())
+    return hasher.hexdigest()
+
+
+def cached_file_path(key: str, suffix: str = ".mrc") -> Path | None:
+    """Path to the on-disk cache file of the key, or None if disk cache is disabled."""
+    if not (cache_dir := get_cache_dir()):
+        return None
+    return Path(cache_dir) / key[:2] / f"{key}{suffix}"
+
+
+def read_cached_volume(key: str) -> NDArray[np.floating] | None:
+    """Memory-map the on-disk cache of the key if exists."""
+    from himena_relion.io._io import read_mrc_lazy
+
+    if (path := cached_file_path(key)) is None or not path.exists():
+        return None
+    try:
+        arr, _ = read_mrc_lazy(path)
+    except Exception:
+        _LOGGER.warning("Broken cache file %s is removed.", path, exc_info=True)
+        path.unlink(missing_ok=True)
+        return None
+    touch_cache_entry(path)
+    return arr
+
+
+def touch_cache_entry(path: Path):
+    """Mark the cache file or directory as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # removed by other processes
+
+
+def write_cached_volume(key: str, data: np.ndarray, voxel_size: float = 1.0) -> bool:
+    """Save the array as a float16 MRC file in the cache directory.
+
+    The file is first written to a temporary file and then renamed, so that other
+    processes never see a partially written cache. Returns True if succeeded.
+    """
+    if (path := cached_file_path(key)) is None:
+        return False
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with mrcfile.new(tmp_path, overwrite=True) as mrc:
+            mrc.set_data(np.asarray(data, dtype=np.float16))
+            mrc.voxel_size = voxel_size
+        os.replace(tmp_path, path)
+    except OSError:
+        _LOGGER.warning("Failed to write cache file %s", path, exc_info=True)
+        tmp_path.unlink(missing_ok=True)
+        return False
+    trim_cache_dir()
+    return True
+
+
+def write_cached_volume_from_slices(
+    key: str,
+    shape: tuple[int, int, int],
+    get_slice: Callable[[int], np.ndarray],
+    voxel_size: float = 1.0,
+    dtype: type[np.float16] | type[np.float32] = np.float16,
+) -> bool:
+    """Save a float16 (or float32) volume in the cache directory slice by slice.
+
+    Unlike `write_cached_volume`, the whole volume does not have to be in memory.
+    Returns True if succeeded.
+    """
+    if (path := cached_file_path(key)) is None:
+        return False
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mrc_mode = 12 if np.dtype(dtype) == np.float16 else 2
+        with mrcfile.new_mmap(
+            tmp_path, shape, mrc_mode=mrc_mode, overwrite=True
+        ) as mrc:
+            for i in range(shape[0]):
+                mrc.data[i] = get_slice(i)
+            mrc.voxel_size = voxel_size
+        os.replace(tmp_path, path)
+    except Exception:
+        _LOGGER.warning("Failed to write cache file %s", path, exc_info=True)
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def start_caching(key: str, func: Callable[[], None]) -> bool:
+    """Run `func` in the shared scheduler to create the cache of the key.
+
+    Returns False if the cache of the same key is already being created.
+    """
+
+    def _run():
+        try:
+            func()
+            trim_cache_dir()
+        except Exception:
+            _LOGGER.warning("Failed to create cache %s", key, exc_info=True)
+        finally:
+            with _KEYS_LOCK:
+                _KEYS_IN_PROGRESS.discard(key)
+
+    with _KEYS_LOCK:
+        if key in _KEYS_IN_PROGRESS:
+            return False
+        _KEYS_IN_PROGRESS.add(key)
+    get_scheduler().submit(_run, priority=Priority.BACKGROUND)
+    return True
+
+
+def trim_cache_dir(max_bytes: int | None = None) -> int:
+    """Remove the least recently used cache entries until the size is under limit.
+
+    The most recently used entry is always kept. Returns the number of bytes removed.
+    """
+    if not (cache_dir := get_cache_dir()):
+        return 0
+    if max_bytes is None:
+        max_bytes = get_cache_size_limit()
+    entries = sorted(_iter_cache_entries(Path(cache_dir)), key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for path, size, _ in entries[:-1]:
+        if total <= max_bytes:
+            break
+        if _remove_cache_entry(path):
+            total -= size
+            removed += size
+    if removed:
+        _LOGGER.info("Removed %.1f MB of old cache files.", removed / 1024**2)
+    return removed
+
+
+def clear_cache_dir() -> int:
+    """Remove all the entries in the cache directory and return the bytes removed."""
+    if not (cache_dir := get_cache_dir()):
+        return 0
+    removed = 0
+    for path, size, _ in _iter_cache_entries(Path(cache_dir)):
+        if _remove_cache_entry(path):
+            removed += size
+    return removed
+
+
+def _iter_cache_entries(cache_dir: Path) -> Iterator[tuple[Path, int, float]]:
+    """Iterate over (path, size, last used time) of the cache entries."""
+    if not cache_dir.is_dir():
+        return
+    for subdir in cache_dir.iterdir():
+        if not subdir.is_dir():
+            continue
+        for path in subdir.iterdir():
+            if path.suffix == ".tmp":
+                continue  # being written
+            try:
+                mtime = path.stat().st_mtime
+                if path.is_dir():
+                    size = sum(f.stat().st_size for f in path.iterdir())
+                else:
+                    size = path.stat().st_size
+            except OSError:
+                continue  # removed by other processes
+            yield path, size, mtime
+
+
+def _remove_cache_entry(path: Path) -> bool:
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except OSError:
+        return False
+    return True
+
+
+class DerivedArrayCache:
+    """In-memory LRU cache of derived arrays, backed by the on-disk cache.
+
+    Arrays returned by this cache are shared between callers and must not be
+    modified in place. Arrays saved in the on-disk cache are kept as memory maps,
+    and the in-memory arrays are limited to `maxbytes` in total.
+    """
+
+    def __init__(self, maxsize: int = 4, maxbytes: int = 512 * 1024**2):
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: str,
+        compute: Callable[[], np.ndarray],
+        *,
+        voxel_size: float = 1.0,
+        persist: bool = True,
+    ) -> np.ndarray:
+        """Get the array of the key, calling `compute` only if not cached anywhere."""
+        with self._lock:
+            if (arr := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                return arr
+        if not persist or (arr := read_cached_volume(key)) is None:
+            arr = compute()
+            if persist and write_cached_volume(key, arr, voxel_size):
+                # keep the memory map instead of the array in memory
+                if (mapped := read_cached_volume(key)) is not None:
+                    arr = mapped
+        with self._lock:
+            self._cache[key] = arr
+            while len(self._cache) > 1 and (
+                len(self._cache) > self._maxsize or self._nbytes() > self._maxbytes
+            ):
+                self._cache.popitem(last=False)
+        return arr
+
+    def _nbytes(self) -> int:
+        return sum(
+            arr.nbytes for arr in self._cache.values() if not isinstance(arr, np.memmap)
+        )
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,59 @@
+"""Multiscale pyramid of micrographs, saved in the cache directory."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+import numpy as np
+from himena_relion._image_readers import _cache
+from himena_relion._utils import bin_image
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+PYRAMID_FACTORS = (2, 4, 8)
+
+
+def pyramid_factor_for(bin_factor: int) -> int:
+    """The largest pyramid level that can be used for the bin factor (1 if none)."""
+    return max(
+        (f for f in PYRAMID_FACTORS if bin_factor % f == 0),
+        default=1,
+    )
+
+
+def read_pyramid_level(path: Path, factor: int) -> NDArray[np.float16] | None:
+    """Memory-map the binned micrograph, or None if the pyramid is not created."""
+    try:
+        key = _cache.cache_key([path], "pyramid", factor)
+    except OSError:
+        return None
+    return _cache.read_cached_volume(key)
+
+
+def start_creating_pyramid(path: Path) -> bool:
+    """Create the pyramid of a 2D micrograph in the background."""
+    try:
+        key = _cache.cache_key([path], "pyramid")
+    except OSError:
+        return False
+    return _cache.start_caching(key, lambda: create_pyramid(path))
+
+
+def create_pyramid(path: Path):
+    """Save the 2x, 4x and 8x binned float16 micrographs in the cache directory."""
+    from himena_relion.io._io import read_mrc_lazy
+
+    keys = [_cache.cache_key([path], "pyramid", factor) for factor in PYRAMID_FACTORS]
+    mmap, voxel_size = read_mrc_lazy(path)
+    if mmap.ndim == 3 and mmap.shape[0] == 1:
+        mmap = mmap[0]
+    if mmap.ndim != 2:
+        return
+    img = np.asarray(mmap, dtype=np.float32)
+    last_factor = 1
+    for key, factor in zip(keys, PYRAMID_FACTORS):
+        # bin the previous level to avoid reading the full image again
+        img = bin_image(img, factor // last_factor).astype(np.float32, copy=False)
+        _cache.write_cached_volume(key, img, float(voxel_size.x) * factor)
+        last_factor = factor
@@ -0,0 +1,199 @@
+"""Shared scheduler of image I/O and computation tasks."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priority of tasks. Smaller value is processed first."""
+
+    INTERACTIVE = 0  # slice of the visible viewer
+    PREFETCH = 1  # slices that will probably be shown next
+    THUMBNAIL = 2  # thumbnails and small previews
+    BACKGROUND = 3  # cache creation, indexing etc.
+
+
+class CancelToken:
+    """Token shared by the tasks of a widget to cancel them at once."""
+
+    def __init__(self):
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        """Cancel all the pending tasks submitted with this token."""
+        self._cancelled = True
+
+
+class SchedulerStats(NamedTuple):
+    """Statistics of the scheduler."""
+
+    queue_depth: dict[Priority, int]
+    num_running: int
+    num_completed: int
+    num_cancelled: int
+    mean_wait: float  # seconds from submission to start, of the recent tasks
+    max_wait: float
+    mean_run: float  # seconds from start to end, of the recent tasks
+
+
+class _Task(NamedTuple):
+    future: Future
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    priority: Priority
+    token: CancelToken | None
+    submitted: float
+
+
+class TaskScheduler:
+    """Priority-aware thread pool shared by all the viewers.
+
+    Tasks are processed in the order of priority, then in the order of submission.
+    Thumbnail and background tasks never occupy the last worker, which is reserved
+    for interactive and prefetch tasks (if there are at least two workers), and
+    background tasks occupy at most half of the workers. A running task is never
+    interrupted, so interactive tasks may still wait for other interactive or
+    prefetch tasks.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        if max_workers is None:
+            max_workers = min(max((os.cpu_count() or 1) - 1, 2), 8)
+        self._max_workers = max_workers
+        self._max_background = max(max_workers // 2, 1)
+        self._max_low_priority = max(max_workers - 1, 1)
+        self._queue: list[tuple[int, int, _Task]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._num_running = 0
+        self._num_background = 0
+        self._num_low_priority = 0  # running thumbnail and background tasks
+        self._num_completed = 0
+        self._num_cancelled = 0
+        self._wait_times: deque[float] = deque(maxlen=200)
+        self._run_times: deque[float] = deque(maxlen=200)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        priority: Priority = Priority.BACKGROUND,
+        token: CancelToken | None = None,
+    ) -> Future:
+        """Submit a task and return its future."""
+        future = Future()
+        task = _Task(future, func, args, priority, token, time.perf_counter())
+        with self._cond:
+            heapq.heappush(self._queue, (int(priority), next(self._counter), task))
+            if len(self._threads) < self._max_workers and self._num_idle() == 0:
+                thread = threading.Thread(target=self._run_worker, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return future
+
+    def stats(self) -> SchedulerStats:
+        """Return the current statistics."""
+        with self._cond:
+            depth = {p: 0 for p in Priority}
+            for _, _, task in self._queue:
+                depth[task.priority] += 1
+            waits = list(self._wait_times)
+            runs = list(self._run_times)
+            return SchedulerStats(
+                queue_depth=depth,
+                num_running=self._num_running,
+                num_completed=self._num_completed,
+                num_cancelled=self._num_cancelled,
+                mean_wait=sum(waits) / len(waits) if waits else 0.0,
+                max_wait=max(waits, default=0.0),
+                mean_run=sum(runs) / len(runs) if runs else 0.0,
+            )
+
+    def _num_idle(self) -> int:
+        return len(self._threads) - self._num_running
+
+    def _can_start(self, priority: Priority) -> bool:
+        if priority is Priority.BACKGROUND:
+            if self._num_background >= self._max_background:
+                return False
+        if _is_low_priority(priority):
+            return self._num_low_priority < self._max_low_priority
+        return True
+
+    def _pop_task(self) -> _Task:
+        with self._cond:
+            while True:
+                if self._queue:
+                    task = self._queue[0][2]
+                    if self._can_start(task.priority):
+                        heapq.heappop(self._queue)
+                        if task.token is not None and task.token.cancelled:
+                            task.future.cancel()
+                        if not task.future.set_running_or_notify_cancel():
+                            self._num_cancelled += 1
+                            continue
+                        self._num_running += 1
+                        self._num_background += task.priority is Priority.BACKGROUND
+                        self._num_low_priority += _is_low_priority(task.priority)
+                        self._wait_times.append(time.perf_counter() - task.submitted)
+                        return task
+                self._cond.wait()
+
+    def _run_worker(self):
+        while True:
+            task = self._pop_task()
+            t0 = time.perf_counter()
+            try:
+                result = task.func(*task.args)
+            except BaseException as e:
+                task.future.set_exception(e)
+            else:
+                task.future.set_result(result)
+            finally:
+                with self._cond:
+                    self._num_running -= 1
+                    self._num_background -= task.priority is Priority.BACKGROUND
+                    self._num_low_priority -= _is_low_priority(task.priority)
+                    self._num_completed += 1
+                    self._run_times.append(time.perf_counter() - t0)
+                    self._cond.notify_all()
+
+
+def _is_low_priority(priority: Priority) -> bool:
+    return priority >= Priority.THUMBNAIL
+
+
+_SCHEDULER: TaskScheduler | None = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> TaskScheduler:
+    """Return the scheduler shared in this process."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = TaskScheduler()
+            _LOGGER.debug("Task scheduler with %d workers", _SCHEDULER.max_workers)
+        return _SCHEDULER
@@ -7,6 +7,8 @@ import numpy as np
 if TYPE_CHECKING:
     from superqt.utils import GeneratorWorker
 
+    from himena_relion._image_readers._scheduler import Priority
+
 
 @dataclass
 class TubeObject:
@@ -31,10 +33,28 @@ def set_is_testing(value: bool):
     IS_TESTING = value
 
 
-def start_worker(worker: GeneratorWorker):
+IS_HEADLESS = False
+
+
+def set_is_headless(value: bool):
+    """Set headless mode, where plugins are imported without their GUI components.
+
+    This is used when running external jobs from the command line."""
+    global IS_HEADLESS
+    IS_HEADLESS = value
+
+
+def start_worker(worker: GeneratorWorker, priority: Priority | None = None):
     """Start running the worker.
 
-    This function will run the worker synchronously if in testing mode."""
+    If `priority` is given, the worker runs in the shared task scheduler instead of
+    the Qt thread pool. This function will run the worker synchronously if in
+    testing mode."""
     if IS_TESTING:
         return worker.run()
+    if priority is not None:
+        from himena_relion._image_readers._scheduler import get_scheduler
+
+        get_scheduler().submit(worker.run, priority=priority)
+        return None
     return worker.start()
@@ -32,11 +32,10 @@ from himena_relion.consts import Type, MenuId, JOB_ID_MAP
 from himena_relion._utils import (
     last_job_directory,
     normalize_job_id,
-    open_with_lock,
     unwrap_annotated,
     change_name_for_tomo,
-    update_default_pipeline,
     replace_input_edges,
+    PipelineWriter,
 )
 from himena_relion.schemas import JobStarModel
 from himena_relion.pipeline_watcher import (
@@ -222,9 +221,9 @@ class RelionJob(ABC):
         with job_dir.path.joinpath("job_pipeline.star").open("r+") as f:
             replace_input_edges(f, to_run, new_input_edges)
         default_pipeline_star = rln_dir / "default_pipeline.star"
-        with open_with_lock(default_pipeline_star) as f:
-            replace_input_edges(f, to_run, new_input_edges)
-            update_default_pipeline(f, to_run, state="Scheduled")
+        with PipelineWriter(default_pipeline_star) as writer:
+            writer.replace_input_edges(to_run, new_input_edges)
+            writer.set_state(to_run, "Scheduled")
         run_watcher_new_process(rln_dir)
         default_pipeline_star.touch()
 
@@ -527,9 +526,9 @@ class _Relion5BuiltinContinue(_Relion5BuiltinJob):
         with job_dir.path.joinpath("job_pipeline.star").open("r+") as f:
             replace_input_edges(f, to_run, new_input_edges)
         default_pipeline_star = rln_dir / "default_pipeline.star"
-        with open_with_lock(default_pipeline_star) as f:
-            replace_input_edges(f, to_run, new_input_edges)
-            update_default_pipeline(f, to_run, state="Scheduled")
+        with PipelineWriter(default_pipeline_star) as writer:
+            writer.replace_input_edges(to_run, new_input_edges)
+            writer.set_state(to_run, "Scheduled")
         run_watcher_new_process(rln_dir)
         default_pipeline_star.touch()
 
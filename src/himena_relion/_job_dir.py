@@ -44,6 +44,9 @@ class JobDirectory:
             raise FileNotFoundError(f"Job directory {self.path} does not exist.")
         if self.path.is_file():
             raise NotADirectoryError(f"Job directory {self.path} is not a directory.")
+        # (mtime_ns, size) of job.star -> (parsed model, parameter dict)
+        self._job_star_cache: tuple[tuple[int, int], JobStarModel, dict] | None = None
+        self._state_cache: RelionJobState | None = None
 
     def __init_subclass__(cls):
         """Register the subclass in the type map."""
@@ -72,7 +75,7 @@ class JobDirectory:
 
     def is_tomo(self) -> bool:
         """Return whether this job is a tomography job."""
-        return bool(JobStarModel.validate_file(self.job_star()).job.job_is_tomo)
+        return bool(self._job_star_model().job.job_is_tomo)
 
     @property
     def job_number(self) -> str:
@@ -93,7 +96,7 @@ class JobDirectory:
         if job_cls := self._to_job_class():
             return job_cls.job_title()
         try:
-            label = JobStarModel.validate_file(self.job_star()).job.job_type_label
+            label = self._job_star_model().job.job_type_label
             return JOB_ID_MAP[label]
         except Exception:
             return "Unknown"
@@ -154,9 +157,8 @@ class JobDirectory:
     def _to_job_class(self) -> type[RelionJob] | None:
         from himena_relion._job_class import iter_relion_jobs, _Relion5BuiltinContinue
 
-        job_star_path = self.job_star()
         try:
-            job_star = JobStarModel.validate_file(job_star_path)
+            job_star = self._job_star_model()
         except FileNotFoundError:
             return None
         job_type = job_star.job.job_type_label
@@ -192,7 +194,17 @@ class JobDirectory:
         pipeline.write_star(self.job_pipeline())
 
     def state(self) -> RelionJobState:
-        """Return the state of the job based on the existence of certain files."""
+        """Return the state of the job based on the existence of certain files.
+
+        The state is cached and only invalidated by `notify_file_changed` when one of
+        the `RELION_JOB_*` files changes. Call `refresh` before this method if this
+        object is not updated by file events.
+        """
+        if self._state_cache is None:
+            self._state_cache = self._read_state()
+        return self._state_cache
+
+    def _read_state(self) -> RelionJobState:
         if self.path.joinpath("RELION_JOB_EXIT_SUCCESS").exists():
             return RelionJobState.EXIT_SUCCESS
         elif self.path.joinpath("RELION_JOB_EXIT_FAILURE").exists():
@@ -208,8 +220,28 @@ class JobDirectory:
         return self.get_job_params_as_dict().get(param, default)
 
     def get_job_params_as_dict(self) -> dict[str, str]:
-        job_star = JobStarModel.validate_file(self.job_star())
-        return job_star.joboptions_values.to_dict()
+        self._job_star_model()
+        return dict(self._job_star_cache[2])
+
+    def notify_file_changed(self, path: Path):
+        """Update the cached states upon a file change in the job directory."""
+        if path.name.startswith("RELION_JOB_"):
+            self._state_cache = None
+
+    def refresh(self):
+        """Discard all the cached states of this job."""
+        self._job_star_cache = None
+        self._state_cache = None
+
+    def _job_star_model(self) -> JobStarModel:
+        """Return the parsed job.star, cached until the file is modified."""
+        stat = self.job_star().stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if (cache := self._job_star_cache) is None or cache[0] != key:
+            job_star = JobStarModel.validate_file(self.job_star())
+            params = job_star.joboptions_values.to_dict()
+            self._job_star_cache = cache = (key, job_star, params)
+        return cache[1]
 
     def clear_job(self):
         for item in self.path.iterdir():
@@ -247,8 +279,7 @@ class JobDirectory:
 
     def job_type_label(self) -> str:
         """Read job.star and get the job type label."""
-        job_star = JobStarModel.validate_file(self.job_star())
-        return job_star.job.job_type_label
+        return self._job_star_model().job.job_type_label
 
     def glob_in_subdirs(self, pattern: str) -> Iterator[Path]:
         """Glob files matching the given pattern under subdirectories of this job."""
@@ -471,7 +502,9 @@ class TomogramInfo(AlignedTiltSeriesInfo):
                 ]
             )
         else:
-            return ArrayFilteredView.from_mrc(rln_dir / self.reconstructed_tomogram[0])
+            return ArrayFilteredView.from_mrc(
+                rln_dir / self.reconstructed_tomogram[0], use_local_cache=True
+            )
 
 
 class PickJobDirectory(JobDirectory):
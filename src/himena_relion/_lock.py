@@ -0,0 +1,293 @@
+"""Lock of a RELION project directory.
+
+RELION locks the pipeline by creating the ``.relion_lock`` directory, because
+``mkdir`` is atomic even on network file systems. The same protocol is used here for
+compatibility with relion_pipeliner and the RELION GUI. Instead of polling, waiting
+processes are woken up by the file system notification of the lock removal, with an
+exponential backoff as a fallback for file systems without notification.
+"""
+
+from __future__ import annotations
+
+from contextlib import closing, contextmanager, suppress
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Iterator, NamedTuple
+import uuid
+
+import psutil
+from watchfiles import watch, Change
+
+_LOGGER = logging.getLogger(__name__)
+
+LOCK_DIR_NAME = ".relion_lock"
+_OWNER_FILE_NAME = "himena_lock_owner.json"
+_MIN_BACKOFF = 0.005
+_MAX_BACKOFF = 0.5
+
+
+class LockStats(NamedTuple):
+    """Statistics of the lock acquisitions in this process."""
+
+    num_acquired: int
+    num_contended: int  # acquired after waiting for others
+    num_timeouts: int
+    num_stale_removed: int
+    mean_wait: float  # seconds, over all the acquisitions
+    max_wait: float
+
+
+class _LockOwner(NamedTuple):
+    """Content of the owner file in the lock directory."""
+
+    host: str
+    pid: int
+    nonce: str  # unique to each acquisition
+
+
+class _LockHandle(NamedTuple):
+    """Identity of a lock directory created by this process."""
+
+    nonce: str
+    inode: tuple[int, int] | None  # (st_dev, st_ino) of the lock directory
+
+
+class RelionPipelineLockError(RuntimeError):
+    """Raised when failed to acquire lock for RELION default_pipeline.star file."""
+
+
+class ProjectLockManager:
+    """Acquire and release the ``.relion_lock`` lock of RELION projects.
+
+    The lock directory created by this class contains a small JSON file of the host
+    name, the process ID and a nonce unique to the acquisition, so that a lock left by
+    a crashed process is detected and removed, and a lock is only released by its
+    owner. Locks created by RELION itself have no owner file and are never removed.
+    The statistics of the acquisitions are logged when waiting or failing.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._num_acquired = 0
+        self._num_contended = 0
+        self._num_timeouts = 0
+        self._num_stale_removed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @contextmanager
+    def hold(self, project_dir: str | Path, wait_sec: float = 1.5) -> Iterator[None]:
+        """Hold the lock of the project directory in this context."""
+        lock_dir = Path(project_dir) / LOCK_DIR_NAME
+        handle = self._acquire(lock_dir, wait_sec)
+        try:
+            yield
+        finally:
+            self._release(lock_dir, handle)
+
+    def stats(self) -> LockStats:
+        """Return the statistics of the lock acquisitions."""
+        with self._mutex:
+            num_trials = self._num_acquired + self._num_timeouts
+            return LockStats(
+                num_acquired=self._num_acquired,
+                num_contended=self._num_contended,
+                num_timeouts=self._num_timeouts,
+                num_stale_removed=self._num_stale_removed,
+                mean_wait=self._total_wait / num_trials if num_trials else 0.0,
+                max_wait=self._max_wait,
+            )
+
+    def _acquire(self, lock_dir: Path, wait_sec: float) -> _LockHandle:
+        start = time.perf_counter()
+        deadline = start + wait_sec
+        backoff = _MIN_BACKOFF
+        contended = False
+        while True:
+            try:
+                lock_dir.mkdir(exist_ok=False)
+            except FileNotFoundError:
+                raise  # FileNotFoundError is a subclass of OSError.
+            except OSError:
+                contended = True
+            else:
+                handle = _LockHandle(uuid.uuid4().hex, _inode(lock_dir))
+                self._write_owner(lock_dir, handle.nonce)
+                self._record(time.perf_counter() - start, contended, timeout=False)
+                return handle
+            if self._remove_if_stale(lock_dir):
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._record(time.perf_counter() - start, contended, timeout=True)
+                _LOGGER.warning(
+                    "Project lock timed out: %s", _format_stats(self.stats())
+                )
+                raise RelionPipelineLockError(
+                    f"Failed to acquire lock for {lock_dir.parent}. Another instance "
+                    "may be editing the pipeline, or the previous run may have crashed."
+                )
+            _wait_for_removal(lock_dir, min(backoff, remaining))
+            backoff = min(backoff * 2, _MAX_BACKOFF)
+
+    def _release(self, lock_dir: Path, handle: _LockHandle):
+        owner = _read_owner(lock_dir)
+        if _inode(lock_dir) != handle.inode or (
+            owner is not None and owner.nonce != handle.nonce
+        ):
+            # the lock was removed as a stale one, and may be held by others now
+            _LOGGER.error("The lock %s is not owned by this process", lock_dir)
+            return
+        with suppress(Exception):
+            lock_dir.joinpath(_OWNER_FILE_NAME).unlink(missing_ok=True)
+            lock_dir.rmdir()
+
+    def _write_owner(self, lock_dir: Path, nonce: str):
+        owner = {"host": socket.gethostname(), "pid": os.getpid(), "nonce": nonce}
+        try:
+            lock_dir.joinpath(_OWNER_FILE_NAME).write_text(json.dumps(owner))
+        except OSError:
+            _LOGGER.warning("Failed to write the lock owner file", exc_info=True)
+
+    def _remove_if_stale(self, lock_dir: Path) -> bool:
+        """Remove the lock if its owner process in this host is dead.
+
+        The lock is renamed to a name unique to this thread, so that only one of the
+        processes removing the same stale lock succeeds. It is renamed only if it is
+        still the directory (checked by its inode) of the dead owner. This is not
+        atomic: a new lock created between the check and the rename is detected by
+        its inode and nonce after renaming, and renamed back if no other lock has
+        been created in the meantime.
+        """
+        inode = _inode(lock_dir)
+        owner = _read_owner(lock_dir)
+        if inode is None or owner is None:
+            # not locked by himena-relion, or the owner file is being written
+            return False
+        if owner.host != socket.gethostname() or psutil.pid_exists(owner.pid):
+            return False
+        if _inode(lock_dir) != inode:
+            return False  # replaced by a new lock while reading the owner
+        removing = lock_dir.with_name(
+            f"{lock_dir.name}.stale.{os.getpid()}.{threading.get_ident()}"
+        )
+        try:
+            os.rename(lock_dir, removing)
+        except OSError:
+            return False  # already removed or renamed by others
+        if _inode(removing) != inode or _read_owner(removing) != owner:
+            # the stale lock was replaced by a new one just before renaming
+            _restore_lock(removing, lock_dir)
+            return False
+        with suppress(OSError):
+            removing.joinpath(_OWNER_FILE_NAME).unlink()
+            removing.rmdir()
+        with self._mutex:
+            self._num_stale_removed += 1
+        _LOGGER.warning(
+            "Removed the stale lock %s of dead process %s: %s",
+            lock_dir,
+            owner.pid,
+            _format_stats(self.stats()),
+        )
+        return True
+
+    def _record(self, wait: float, contended: bool, timeout: bool):
+        with self._mutex:
+            if timeout:
+                self._num_timeouts += 1
+            else:
+                self._num_acquired += 1
+                self._num_contended += int(contended)
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        if contended:
+            _LOGGER.info(
+                "Waited %.1f ms for the project lock: %s",
+                wait * 1000,
+                _format_stats(self.stats()),
+            )
+
+
+def _read_owner(lock_dir: Path) -> _LockOwner | None:
+    """Return the owner of the lock, or None if unknown."""
+    try:
+        owner = json.loads(lock_dir.joinpath(_OWNER_FILE_NAME).read_text())
+        return _LockOwner(owner["host"], int(owner["pid"]), str(owner.get("nonce")))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _inode(path: Path) -> tuple[int, int] | None:
+    """Return the (st_dev, st_ino) of the path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _restore_lock(renamed: Path, lock_dir: Path):
+    """Rename a live lock that was renamed by mistake back to the lock directory."""
+    # renaming onto an empty directory would silently replace the newer lock
+    if os.path.lexists(lock_dir):
+        _LOGGER.error(
+            "Could not restore the lock %s because it was taken again. The renamed "
+            "lock is left as %s",
+            lock_dir,
+            renamed,
+        )
+        return
+    try:
+        os.rename(renamed, lock_dir)
+    except OSError:
+        _LOGGER.error("Failed to restore the lock %s", lock_dir, exc_info=True)
+
+
+def _format_stats(stats: LockStats) -> str:
+    return (
+        f"{stats.num_acquired} acquired ({stats.num_contended} contended), "
+        f"{stats.num_timeouts} timed out, {stats.num_stale_removed} stale removed, "
+        f"wait mean {stats.mean_wait * 1000:.1f} ms / max {stats.max_wait * 1000:.1f} ms"
+    )
+
+
+def _wait_for_removal(lock_dir: Path, timeout: float):
+    """Wait until the lock directory is removed or `timeout` seconds pass."""
+    name = lock_dir.name
+
+    def _filter(change: Change, path: str) -> bool:
+        return change == Change.deleted and Path(path).name == name
+
+    try:
+        changes = watch(
+            lock_dir.parent,
+            watch_filter=_filter,
+            recursive=False,
+            step=1,
+            rust_timeout=max(int(timeout * 1000), 1),
+            yield_on_timeout=True,
+        )
+        with closing(changes):
+            next(changes, None)
+    except (OSError, RuntimeError):
+        # file system notification is not available
+        time.sleep(timeout)
+
+
+_MANAGER: ProjectLockManager | None = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_lock_manager() -> ProjectLockManager:
+    """Return the lock manager shared in this process."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = ProjectLockManager()
+        return _MANAGER
@@ -0,0 +1,167 @@
+"""Vectorized rigid-body transformation of particle tables.
+
+Rotations follow the RELION convention. Euler angles (rot, tilt, psi) are ZYZ angles
+in degrees, and `euler_to_matrix` gives the matrix of RELION's `Euler_angles2matrix`,
+which is the inverse of `Rotation.from_euler("ZYZ", (rot, tilt, psi))` of scipy.
+
+Matrices are 3x3 nested lists whose elements are either scalars or 1D arrays of all
+the particles ("structure of arrays"), so that millions of particles are transformed
+at once without Python loops and without allocating (N, 3, 3) arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union, TYPE_CHECKING
+import numpy as np
+import polars as pl
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    Scalar = Union[NDArray[np.float64], float]
+    Matrix = list[list[Scalar]]
+
+EULER_COLUMNS = ("rlnAngleRot", "rlnAngleTilt", "rlnAnglePsi")
+ORIGIN_COLUMNS = ("rlnOriginXAngst", "rlnOriginYAngst", "rlnOriginZAngst")
+_GIMBAL_EPS = 1e-6
+
+
+def euler_to_matrix(rot: Scalar, tilt: Scalar, psi: Scalar) -> Matrix:
+    """Rotation matrix of the ZYZ Euler angles in degrees."""
+    ca, sa = _cos_sin(rot)
+    cb, sb = _cos_sin(tilt)
+    cg, sg = _cos_sin(psi)
+    cc = cb * ca
+    sc = cb * sa
+    return [
+        [cg * cc - sg * sa, cg * sc + sg * ca, -cg * sb],
+        [-sg * cc - cg * sa, -sg * sc + cg * ca, sg * sb],
+        [sb * ca, sb * sa, cb],
+    ]
+
+
+def matrix_to_euler(mat: Matrix) -> tuple[Scalar, Scalar, Scalar]:
+    """ZYZ Euler angles (rot, tilt, psi) in degrees of the rotation matrix.
+
+    The tilt angle is always in [0, 180]. If the tilt angle is 0 or 180, the
+    rotation is represented only by psi, as RELION does.
+    """
+    abs_sb = np.hypot(mat[0][2], mat[1][2])
+    is_gimbal = abs_sb < _GIMBAL_EPS
+    rot = np.where(is_gimbal, 0.0, np.arctan2(mat[2][1], mat[2][0]))
+    tilt = np.arctan2(abs_sb, mat[2][2])
+    psi = np.where(
+        is_gimbal,
+        np.where(
+            np.asarray(mat[2][2]) < 0,
+            np.arctan2(mat[1][0], np.negative(mat[0][0])),
+            np.arctan2(np.negative(mat[1][0]), mat[0][0]),
+        ),
+        np.arctan2(mat[1][2], np.negative(mat[0][2])),
+    )
+    return np.rad2deg(rot), np.rad2deg(tilt), np.rad2deg(psi)
+
+
+def matmul(a: Matrix, b: Matrix) -> Matrix:
+    """Matrix product of two 3x3 matrices."""
+    return [
+        [_dot(a[i], [b[k][j] for k in range(3)]) for j in range(3)] for i in range(3)
+    ]
+
+
+def transpose(mat: Matrix) -> Matrix:
+    """Transpose (= inverse) of a rotation matrix."""
+    return [[mat[j][i] for j in range(3)] for i in range(3)]
+
+
+def apply(mat: Matrix, vec: Sequence[Scalar]) -> list[Scalar]:
+    """Rotate the (X, Y, Z) vector by the matrix."""
+    return [_dot(row, vec) for row in mat]
+
+
+def particle_matrix(df: pl.DataFrame, columns: Sequence[str] = EULER_COLUMNS) -> Matrix:
+    """Rotation matrices of the particles. Missing angle columns are regarded as 0."""
+    return euler_to_matrix(*(_column_or_zero(df, name) for name in columns))
+
+
+def with_particle_matrix(
+    df: pl.DataFrame,
+    mat: Matrix,
+    columns: Sequence[str] = EULER_COLUMNS,
+) -> pl.DataFrame:
+    """Update the Euler angle columns of the particles by the rotation matrices."""
+    angles = matrix_to_euler(mat)
+    return df.with_columns(
+        _as_series(name, angle, df.height)
+        for name, angle in zip(columns, angles, strict=True)
+    )
+
+
+def shift_origins(
+    df: pl.DataFrame,
+    shift: tuple[float, float, float],
+    euler_columns: Sequence[str] = EULER_COLUMNS,
+    origin_columns: Sequence[str] = ORIGIN_COLUMNS,
+) -> pl.DataFrame:
+    """Move the particle centers to `shift` (X, Y, Z) of the reference map.
+
+    `shift` must be in the same unit as the origin columns. The shift is rotated to
+    the frame of each particle and added to the origins, which is equivalent to
+    ``relion_star_handler --center``. The Z origin is only updated if it exists.
+    """
+    mat = particle_matrix(df, euler_columns)
+    projected = apply(mat, [float(s) for s in shift])
+    return df.with_columns(
+        _as_series(name, _column_or_zero(df, name) + delta, df.height)
+        for name, delta in zip(origin_columns, projected)
+        if name in df.columns or name != origin_columns[2]
+    )
+
+
+def center_of_mass(img: NDArray[np.number]) -> tuple[float, ...]:
+    """Center of mass of the image in the array axis order.
+
+    Each coordinate is calculated from the marginal sum along the other axes, so
+    that no index grid of the image size is allocated.
+    """
+    img = np.asarray(img)
+    total = img.sum(dtype=np.float64)
+    if total == 0:
+        return (0.0,) * img.ndim
+    out: list[float] = []
+    for axis in range(img.ndim):
+        other_axes = tuple(i for i in range(img.ndim) if i != axis)
+        marginal = img.sum(axis=other_axes, dtype=np.float64)
+        out.append(float(np.dot(marginal, np.arange(img.shape[axis])) / total))
+    return tuple(out)
+
+
+def _cos_sin(angle: Scalar) -> tuple[Scalar, Scalar]:
+    rad = np.deg2rad(angle)
+    if np.ndim(rad) == 0:
+        return float(np.cos(rad)), float(np.sin(rad))
+    return np.cos(rad), np.sin(rad)
+
+
+def _dot(a: Sequence[Scalar], b: Sequence[Scalar]) -> Scalar:
+    """Dot product that skips the terms multiplied by zero."""
+    out: Scalar = 0.0
+    for x, y in zip(a, b, strict=True):
+        if _is_zero(x) or _is_zero(y):
+            continue
+        out = out + x * y
+    return out
+
+
+def _is_zero(x: Scalar) -> bool:
+    return np.ndim(x) == 0 and x == 0
+
+
+def _column_or_zero(df: pl.DataFrame, name: str) -> Scalar:
+    if name in df.columns:
+        return df[name].cast(pl.Float64).to_numpy()
+    return 0.0
+
+
+def _as_series(name: str, value: Scalar, size: int) -> pl.Series:
+    return pl.Series(name, np.broadcast_to(np.asarray(value, dtype=np.float64), size))
@@ -1,21 +1,35 @@
 from __future__ import annotations
 
-from contextlib import contextmanager, suppress
+from contextlib import contextmanager
 import os
 import shutil
+import stat
+import tempfile
 from pathlib import Path
 import logging
 import time
-from typing import Annotated, Any, Iterable, TextIO, get_args, get_origin, TYPE_CHECKING
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    TextIO,
+    get_args,
+    get_origin,
+    TYPE_CHECKING,
+)
 from functools import lru_cache
 
 import numpy as np
 import polars as pl
+from scipy import fft as sfft
 
 from himena.types import is_subtype
 from himena_relion.consts import Type
 from himena_relion.schemas import RelionPipelineModel
 from himena_relion._configs import get_relion_pipeliner_exe
+from himena_relion._lock import get_lock_manager, RelionPipelineLockError  # noqa: F401
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -44,25 +58,76 @@ def bin_image(img: np.ndarray, nbin: int) -> np.ndarray:
         raise ValueError(f"Expected 2D or 3D image, got {img.ndim}D")
 
 
-def lowpass_filter(img: np.ndarray, cutoff: float) -> np.ndarray:
-    """Apply a low-pass filter to a 2D image in Fourier space."""
+def lowpass_filter(
+    img: np.ndarray,
+    cutoff: float,
+    *,
+    ndim: int = 2,
+    kind: Literal["ideal", "butterworth", "gaussian"] = "ideal",
+) -> np.ndarray:
+    """Apply a low-pass filter in Fourier space.
+
+    The filter is applied to the last `ndim` axes, so a stack of images can be
+    filtered at once. Transfer functions are cached for each shape and cutoff.
+
+    Parameters
+    ----------
+    img : np.ndarray
+        Image, volume or their stack.
+    cutoff : float
+        Cutoff frequency relative to the sampling rate. Images are returned as is if
+        the cutoff is not in (0, 0.9).
+    ndim : int, default 2
+        Number of spatial dimensions.
+    kind : str, default "ideal"
+        Type of the filter. "ideal" zeros all the frequencies above the cutoff, while
+        "butterworth" and "gaussian" attenuate to 0.5 at the cutoff.
+    """
     if cutoff <= 0 or cutoff >= 0.9:
         return img
-    fr = frequency_mesh(img.shape)
-    filter_mask = fr <= cutoff
-    img_ft = np.fft.fft2(img)
-    img_ft_filtered = img_ft * filter_mask
-    img_filtered = np.fft.ifft2(img_ft_filtered).real
-    return img_filtered
-
-
-@lru_cache(maxsize=32)
-def frequency_mesh(shape: tuple[int, int]) -> np.ndarray:
-    """Generate a frequency mesh for a given image shape."""
-    fy, fx = np.fft.fftfreq(shape[0]), np.fft.fftfreq(shape[1])
-    fxx, fyy = np.meshgrid(fx, fy)
-    fr = np.sqrt(fxx**2 + fyy**2)
-    return fr
+    img = np.asarray(img)
+    if img.dtype != np.float64:
+        img = img.astype(np.float32, copy=False)
+    shape = img.shape[-ndim:]
+    axes = tuple(range(-ndim, 0))
+    transfer = _lowpass_transfer(shape, round(float(cutoff), 8), kind, img.dtype)
+    img_ft = sfft.rfftn(img, axes=axes, workers=_FFT_WORKERS)
+    img_ft *= transfer
+    return sfft.irfftn(img_ft, s=shape, axes=axes, workers=_FFT_WORKERS)
+
+
+def lowpass_filter_3d(img: np.ndarray, cutoff: float) -> NDArray[np.float32]:
+    """Apply a low-pass filter to a 3D volume."""
+    img = np.asarray(img, dtype=np.float32)
+    return lowpass_filter(img, cutoff, ndim=3)
+
+
+_FFT_WORKERS = -1  # use all the CPUs
+
+
+@lru_cache(maxsize=64)
+def _lowpass_transfer(
+    shape: tuple[int, ...],
+    cutoff: float,
+    kind: str,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Transfer function of a low-pass filter for the real FFT of the shape."""
+    freqs = [np.fft.fftfreq(n) for n in shape[:-1]] + [np.fft.rfftfreq(shape[-1])]
+    fr2 = np.zeros([f.size for f in freqs], dtype=np.float64)
+    for i, f in enumerate(freqs):
+        fr2 += (f**2).reshape([-1 if j == i else 1 for j in range(len(freqs))])
+    if kind == "ideal":
+        transfer = fr2 <= cutoff**2
+    elif kind == "butterworth":
+        transfer = 1 / (1 + (fr2 / cutoff**2) ** 4)
+    elif kind == "gaussian":
+        transfer = np.exp(-np.log(2) * fr2 / cutoff**2)
+    else:
+        raise ValueError(f"Unknown low-pass filter kind: {kind!r}")
+    transfer = transfer.astype(dtype)
+    transfer.flags.writeable = False
+    return transfer
 
 
 # Adapted from skimage.filters.thresholding (BSD-2-Clause license)
@@ -188,6 +253,9 @@ def normalize_job_id(d: str | Path) -> str:
     return d
 
 
+_JOB_STATES = ("Scheduled", "Running", "Failed", "Succeeded", "Aborted")
+
+
 def update_default_pipeline(
     f: TextIO,
     job_id: str,
@@ -196,29 +264,12 @@ def update_default_pipeline(
     *,
     check_state: bool = True,
 ):
-    if (
-        check_state
-        and state is not None
-        and state not in ("Scheduled", "Running", "Failed", "Succeeded", "Aborted")
-    ):
-        raise ValueError(f"State {state!r} is not a valid RELION job state.")
+    if check_state and state is not None:
+        _assert_job_state(state)
     f.seek(0)
     try:
         pipeline_star = RelionPipelineModel.validate_text(f.read())
-        pos_sl = pipeline_star.processes.process_name == normalize_job_id(job_id)
-        if len(true_ids := np.where(pos_sl)) == 1:
-            if len(true_ids[0]) == 0:
-                _LOGGER.warning("%s not found in pipeline", normalize_job_id(job_id))
-                return
-            true_id = int(true_ids[0][0])
-            df = pipeline_star.processes.dataframe
-            if state is not None:
-                ic = df.columns.index("rlnPipeLineProcessStatusLabel")
-                df[true_id, ic] = state
-            if alias is not None:
-                ic = df.columns.index("rlnPipeLineProcessAlias")
-                df[true_id, ic] = alias
-            pipeline_star.processes = df
+        if _update_process(pipeline_star, job_id, state=state, alias=alias):
             f.seek(0)
             f.truncate(0)
             f.write(pipeline_star.to_string())
@@ -226,6 +277,12 @@ def update_default_pipeline(
         _LOGGER.warning("Failed to update job state for %s", job_id, exc_info=True)
 
 
+def _assert_job_state(state: str) -> str:
+    if state not in _JOB_STATES:
+        raise ValueError(f"State {state!r} is not a valid RELION job state.")
+    return state
+
+
 def _assert_input_edge(val) -> str:
     if not isinstance(val, str):
         raise ValueError(f"Expected input edge to be a string, got {type(val)}")
@@ -235,6 +292,41 @@ def _assert_input_edge(val) -> str:
 def replace_input_edges(f: TextIO, to_run: str, new_inputs: Iterable[str] = ()):
     f.seek(0)
     pipeline_model = RelionPipelineModel.validate_text(f.read())
+    _replace_input_edges(pipeline_model, to_run, new_inputs)
+    f.seek(0)
+    f.truncate()
+    f.write(pipeline_model.to_string())
+
+
+def _update_process(
+    pipeline_model: RelionPipelineModel,
+    job_id: str,
+    state: str | None = None,
+    alias: str | None = None,
+) -> bool:
+    """Update the state and/or alias of a process. Return False if not found."""
+    pos_sl = pipeline_model.processes.process_name == normalize_job_id(job_id)
+    true_ids = np.where(pos_sl)[0]
+    if len(true_ids) == 0:
+        _LOGGER.warning("%s not found in pipeline", normalize_job_id(job_id))
+        return False
+    true_id = int(true_ids[0])
+    df = pipeline_model.processes.dataframe
+    if state is not None:
+        ic = df.columns.index("rlnPipeLineProcessStatusLabel")
+        df[true_id, ic] = state
+    if alias is not None:
+        ic = df.columns.index("rlnPipeLineProcessAlias")
+        df[true_id, ic] = alias
+    pipeline_model.processes = df
+    return True
+
+
+def _replace_input_edges(
+    pipeline_model: RelionPipelineModel,
+    to_run: str,
+    new_inputs: Iterable[str] = (),
+):
     to_run = normalize_job_id(to_run)
     pipeline_input_edges = pipeline_model.input_edges
     new_from_node = [_assert_input_edge(n) for n in new_inputs]
@@ -250,9 +342,148 @@ def replace_input_edges(f: TextIO, to_run: str, new_inputs: Iterable[str] = ()):
         ).dataframe
         df = pl.concat([df, df_new], how="vertical_relaxed")
     pipeline_model.input_edges = df
-    f.seek(0)
-    f.truncate()
-    f.write(pipeline_model.to_string())
+
+
+def _remove_processes(pipeline_model: RelionPipelineModel, job_ids: Iterable[str]):
+    """Remove the processes and all the nodes and edges that belong to them."""
+    job_ids = [normalize_job_id(job_id) for job_id in job_ids]
+    # node names are e.g. "Extract/job010/particles.star"
+    pipeline_model.processes = pipeline_model.processes.dataframe.filter(
+        ~pipeline_model.processes.process_name.is_in(job_ids)
+    )
+    pipeline_model.nodes = pipeline_model.nodes.dataframe.filter(
+        ~_is_node_of(pipeline_model.nodes.name, job_ids)
+    )
+    if (input_edges := pipeline_model.input_edges) is not None:
+        pipeline_model.input_edges = input_edges.dataframe.filter(
+            ~(
+                _is_node_of(input_edges.from_node, job_ids)
+                | input_edges.process.is_in(job_ids)
+            )
+        )
+    if (output_edges := pipeline_model.output_edges) is not None:
+        pipeline_model.output_edges = output_edges.dataframe.filter(
+            ~output_edges.process.is_in(job_ids)
+        )
+
+
+def _is_node_of(node_names: pl.Series, job_ids: list[str]) -> pl.Series:
+    job_id_of_node = node_names.str.extract(r"^([^/]+/[^/]+/)", 1)
+    return job_id_of_node.is_in(job_ids).fill_null(False)
+
+
+class PipelineWriter:
+    """Batch of edits to the default_pipeline.star file, applied in one write.
+
+    The edits are applied to the file content read without the lock, and the result
+    is written to a temporary file. The lock is only held to check that the pipeline
+    file is unchanged since it was read and to replace it by the temporary file. If
+    the file has been changed by others (such as relion_pipeliner), the edits are
+    applied again to the new content.
+
+    >>> with PipelineWriter(path) as writer:
+    ...     writer.replace_input_edges("Select/job013/", ["Extract/job012/a.star"])
+    ...     writer.set_state("Select/job013/", "Scheduled")
+    """
+
+    def __init__(
+        self,
+        pipeline_path: str | Path,
+        wait_sec: float = 1.5,
+        max_retry: int = 3,
+    ):
+        self._path = Path(pipeline_path)
+        self._wait_sec = wait_sec
+        self._max_retry = max_retry
+        self._edits: list[Callable[[RelionPipelineModel], Any]] = []
+
+    def __enter__(self) -> PipelineWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+    def set_state(self, job_id: str | Path, state: str) -> PipelineWriter:
+        """Change the state of the job (such as "Scheduled" or "Succeeded")."""
+        _assert_job_state(state)
+        self._edits.append(lambda m: _update_process(m, job_id, state=state))
+        return self
+
+    def set_alias(self, job_id: str | Path, alias: str) -> PipelineWriter:
+        """Change the alias of the job."""
+        self._edits.append(lambda m: _update_process(m, job_id, alias=alias))
+        return self
+
+    def replace_input_edges(
+        self,
+        job_id: str | Path,
+        new_inputs: Iterable[str] = (),
+    ) -> PipelineWriter:
+        """Replace all the input edges to the job by the new input nodes."""
+        new_inputs = [_assert_input_edge(n) for n in new_inputs]
+        self._edits.append(lambda m: _replace_input_edges(m, job_id, new_inputs))
+        return self
+
+    def remove_jobs(self, job_ids: Iterable[str | Path]) -> PipelineWriter:
+        """Remove the jobs and their nodes and edges from the pipeline."""
+        job_ids = list(job_ids)
+        self._edits.append(lambda m: _remove_processes(m, job_ids))
+        return self
+
+    def commit(self) -> bool:
+        """Apply all the edits and return True if the pipeline file was updated."""
+        edits, self._edits = self._edits, []
+        if not edits:
+            return False
+        for _ in range(self._max_retry):
+            old_text = self._path.read_text()
+            new_text = _apply_pipeline_edits(old_text, edits)
+            if new_text == old_text:
+                return False
+            tmp_path = self._write_temp(new_text)
+            try:
+                with pipeline_lock(self._path, wait_sec=self._wait_sec):
+                    if self._path.read_text() == old_text:
+                        os.replace(tmp_path, self._path)
+                        return True
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            _LOGGER.info("%s was modified while editing, retrying", self._path)
+
+        # the pipeline is busy, edit under the lock as a last resort
+        with open_with_lock(self._path, wait_sec=self._wait_sec) as f:
+            old_text = f.read()
+            new_text = _apply_pipeline_edits(old_text, edits)
+            if new_text != old_text:
+                f.seek(0)
+                f.truncate()
+                f.write(new_text)
+        return new_text != old_text
+
+    def _write_temp(self, text: str) -> Path:
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{self._path.name}.", suffix=".tmp", dir=self._path.parent
+        )
+        tmp_path = Path(tmp)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            # mkstemp creates a file only readable by the owner
+            os.chmod(tmp_path, stat.S_IMODE(self._path.stat().st_mode))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path
+
+
+def _apply_pipeline_edits(
+    text: str, edits: list[Callable[[RelionPipelineModel], Any]]
+) -> str:
+    pipeline_model = RelionPipelineModel.validate_text(text)
+    for edit in edits:
+        edit(pipeline_model)
+    return pipeline_model.to_string()
 
 
 def read_or_show_job(ui: MainWindow, path: Path):
@@ -354,6 +585,13 @@ def bytes_to_size_str(num_bytes: int) -> str:
     return size_str
 
 
+@contextmanager
+def pipeline_lock(pipeline_path: str | Path, wait_sec: float = 1.5):
+    """Hold the RELION lock of the pipeline file, without opening it."""
+    with get_lock_manager().hold(Path(pipeline_path).parent, wait_sec=wait_sec):
+        yield
+
+
 @contextmanager
 def open_with_lock(
     pipeline_path: str | Path,
@@ -362,31 +600,29 @@ def open_with_lock(
 ):
     """Open a file with a lock to prevent concurrent access."""
     pipeline_path = Path(pipeline_path)
-    lock_dir = pipeline_path.parent / ".relion_lock"
-    each_wait = 0.05
-    num_trial = int(wait_sec / each_wait) + 1
-    for _ in range(num_trial):
+    with pipeline_lock(pipeline_path, wait_sec=wait_sec):
         try:
-            lock_dir.mkdir(exist_ok=False)
-        except FileNotFoundError:
-            raise  # FileNotFoundError is a subclass of OSError.
-        except OSError:
-            time.sleep(each_wait)
-        else:
-            break
-    else:
-        raise RelionPipelineLockError(
-            f"Failed to acquire lock for {pipeline_path}. Another instance may be "
-            "editing the pipeline, or the previous run may have crashed. "
-        )
-    try:
-        with pipeline_path.open(mode) as f:
-            yield f
-    finally:
-        pipeline_path.touch()
-        # remove the lock
-        with suppress(Exception):
-            lock_dir.rmdir()
+            with pipeline_path.open(mode) as f:
+                yield f
+        finally:
+            pipeline_path.touch()
+
+
+def watch_file(path: str | Path, **kwargs):
+    """Watch changes of a file, even if it is replaced by renaming another file.
+
+    Watching the file itself stops working once it is replaced (as `PipelineWriter`
+    does), so the parent directory is watched instead.
+    """
+    from watchfiles import watch
+
+    path = Path(path)
+    return watch(
+        path.parent,
+        watch_filter=lambda _, fp: Path(fp).name == path.name,
+        recursive=False,
+        **kwargs,
+    )
 
 
 def extract_input_edges(params: dict[str, str], keys: Iterable[str]) -> list[str]:
@@ -398,10 +634,6 @@ def extract_input_edges(params: dict[str, str], keys: Iterable[str]) -> list[str
     return edges
 
 
-class RelionPipelineLockError(RuntimeError):
-    """Raised when failed to acquire lock for RELION default_pipeline.star file."""
-
-
 def read_mod(path: str | Path) -> pl.DataFrame:
     import imodmodel
 
@@ -1,7 +1,11 @@
 from himena import StandardType
 from himena.plugins import register_widget_class
 from himena_relion.consts import Type
-from himena_relion._widgets._main import register_job, QRelionJobWidget
+from himena_relion._widgets._main import (
+    register_job,
+    register_job_lazy,
+    QRelionJobWidget,
+)
 from himena_relion._widgets._widgets_external import QExternalJobView
 from himena_relion._widgets._job_widgets import (
     JobWidgetBase,
@@ -17,7 +21,6 @@ from himena_relion._widgets._view_nd import (
     Q2DFilterWidget,
 )
 from himena_relion._widgets._spinbox import QIntWidget, QIntChoiceWidget
-from himena_relion._widgets._plot import QPlotCanvas
 from himena_relion._widgets._misc import (
     spacer_widget,
     QMoreActionButton,
@@ -31,6 +34,7 @@ from himena_relion._widgets._trash_widget import QTrashWidget
 
 __all__ = [
     "register_job",
+    "register_job_lazy",
     "JobWidgetBase",
     "QJobScrollArea",
     "QPlotCanvas",
@@ -58,3 +62,12 @@ register_widget_class(Type.RELION_JOB, QRelionJobWidget)
 register_widget_class(StandardType.IMAGE, Q3DViewer, priority=0)
 
 register_job("relion.external")(QExternalJobView)
+
+
+def __getattr__(name: str):
+    # matplotlib is slow to import and only needed when a job viewer is built.
+    if name == "QPlotCanvas":
+        from himena_relion._widgets._plot import QPlotCanvas
+
+        return QPlotCanvas
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
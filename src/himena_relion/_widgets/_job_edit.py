@@ -1,11 +1,11 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from functools import cache
 import logging
 from pathlib import Path
 import time
-from typing import Any, Union
+from typing import Any, Iterable, NamedTuple, Union
 
 from himena import MainWindow
 from qtpy import QtWidgets as QtW, QtCore, QtGui
@@ -117,6 +117,10 @@ class QJobScheduler(QtW.QWidget):
         if init_params:
             job_cls.init_widgets_for_run(self._job_param_widget._mgui_widgets)
 
+    def prewarm_forms(self, job_classes: Iterable[type[RelionJob]]):
+        """Prepare the parameter forms of the job classes in idle time."""
+        self._job_param_widget.prewarm(job_classes)
+
     def set_parameters(self, params: dict):
         job_cls = self._assert_job_class_selected()
         params = job_cls.normalize_kwargs_inv(**params)
@@ -191,7 +195,19 @@ class QJobScheduler(QtW.QWidget):
         return self._current_job_cls
 
 
+class _JobForm(NamedTuple):
+    """Constructed parameter form of a job class."""
+
+    container: QtW.QWidget
+    widgets: dict[str, ValueWidget]
+    defaults: dict[str, Any]  # widget values right after construction
+    enabled: dict[str, bool]
+
+
 class QJobParameter(QtW.QScrollArea):
+    # maximum number of job forms kept hidden for reuse
+    _max_cached_forms = 8
+
     def __init__(self):
         super().__init__()
         self.setWidgetResizable(True)
@@ -200,18 +216,64 @@ class QJobParameter(QtW.QScrollArea):
         self._param_layout = QtW.QVBoxLayout(self._scroll_area_inner)
         self._param_layout.setContentsMargins(0, 0, 0, 0)
         self._mgui_widgets: dict[str, ValueWidget] = {}
-        self._groupboxes: list[QtW.QGroupBox] = []
+        self._current_form: _JobForm | None = None
+        self._forms: OrderedDict[type[RelionJob], _JobForm] = OrderedDict()
+        self._prewarm_queue: list[type[RelionJob]] = []
 
     def clear_content(self):
-        for groupbox in self._groupboxes:
-            self._param_layout.removeWidget(groupbox)
-            groupbox.deleteLater()
-        self._mgui_widgets.clear()
-        self._groupboxes.clear()
+        if self._current_form is not None:
+            self._current_form.container.setVisible(False)
+        self._current_form = None
+        self._mgui_widgets = {}
 
     def update_by_job(self, job_cls: type[RelionJob]):
         """Update the widget based on the job directory."""
         self.clear_content()
+        if (form := self._forms.get(job_cls)) is not None:
+            self._forms.move_to_end(job_cls)
+            self._reset_form(form)
+        else:
+            form = self._build_form(job_cls)
+        form.container.setVisible(True)
+        self._current_form = form
+        self._mgui_widgets = form.widgets
+
+    def prewarm(self, job_classes: Iterable[type[RelionJob]]):
+        """Construct the forms of the job classes one by one in idle time."""
+        self._prewarm_queue = [
+            job_cls for job_cls in job_classes if job_cls not in self._forms
+        ][: self._max_cached_forms]
+        if self._prewarm_queue:
+            QtCore.QTimer.singleShot(0, self._prewarm_next)
+
+    def _prewarm_next(self):
+        if not self._prewarm_queue:
+            return
+        job_cls = self._prewarm_queue.pop(0)
+        if job_cls not in self._forms:
+            try:
+                self._build_form(job_cls)
+            except Exception:
+                _LOGGER.warning("Failed to prepare the form of %s", job_cls)
+        if self._prewarm_queue:
+            QtCore.QTimer.singleShot(0, self._prewarm_next)
+
+    def _reset_form(self, form: _JobForm):
+        # enabled states first, because setting values may change them again
+        for name, widget in form.widgets.items():
+            widget.enabled = form.enabled[name]
+        for name, widget in form.widgets.items():
+            try:
+                widget.value = form.defaults[name]
+            except Exception:
+                _LOGGER.warning("Failed to reset parameter %r", name)
+
+    def _build_form(self, job_cls: type[RelionJob]) -> _JobForm:
+        """Construct the form of the job class and add it to the cache (hidden)."""
+        container = QtW.QWidget()
+        container_layout = QtW.QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        mgui_widgets: dict[str, ValueWidget] = {}
 
         # convert `run` to widgets.
         sig = job_cls._signature()
@@ -249,11 +311,29 @@ class QJobParameter(QtW.QScrollArea):
                     else:
                         widget.max_width = 270
                 gb_layout.addWidget(widget.native)
-                self._mgui_widgets[widget.name] = widget
-            self._param_layout.addWidget(gb)
-            self._groupboxes.append(gb)
+                mgui_widgets[widget.name] = widget
+            container_layout.addWidget(gb)
         # initialize widgets
-        job_cls.setup_widgets(self._mgui_widgets)
+        job_cls.setup_widgets(mgui_widgets)
+        container.setVisible(False)
+        self._param_layout.addWidget(container)
+        form = _JobForm(
+            container,
+            mgui_widgets,
+            defaults={name: w.value for name, w in mgui_widgets.items()},
+            enabled={name: w.enabled for name, w in mgui_widgets.items()},
+        )
+        self._forms[job_cls] = form
+        evictable = [
+            cls
+            for cls, f in self._forms.items()
+            if f is not form and f is not self._current_form
+        ]
+        for old_cls in evictable[: len(self._forms) - self._max_cached_forms]:
+            old = self._forms.pop(old_cls)
+            self._param_layout.removeWidget(old.container)
+            old.container.deleteLater()
+        return form
 
     def set_parameters(self, params: dict, enabled: bool = True):
         # NOTE: params must be normalized already
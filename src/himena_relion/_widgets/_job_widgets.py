@@ -19,6 +19,7 @@ from himena.qt import drag_files, QColoredSVGIcon, QColoredToolButton
 from himena.exceptions import Cancelled
 from himena_relion import _job_class, _job_dir
 from himena_relion._impl_objects import start_worker
+from himena_relion._image_readers._scheduler import Priority
 from himena_relion._utils import (
     normalize_job_id,
     read_icon_svg,
@@ -28,7 +29,9 @@ from himena_relion._utils import (
 )
 from himena_relion._pipeline import RelionPipeline
 from himena_relion._widgets._job_edit import QJobParameter
-from himena_relion._widgets._misc import spacer_widget
+from himena_relion._widgets._memory import get_memory_budget
+from himena_relion._widgets._misc import spacer_widget, QMicrographListWidget
+from himena_relion._widgets._spinbox import QIntChoiceWidget
 from himena_relion.schemas._pipeline import RelionPipelineModel
 from himena_relion.io import _impl
 
@@ -56,6 +59,15 @@ class JobWidgetBase:
 
 
 class QJobScrollArea(QtW.QScrollArea, JobWidgetBase):
+    """Scroll area of job results.
+
+    Images and meshes in this widget are counted in the memory budget of the job
+    widgets. If this widget is released due to the budget, it will be initialized
+    again with `_job_dir` when shown.
+    """
+
+    _job_dir: _job_dir.JobDirectory | None = None
+
     def __init__(self):
         super().__init__()
         self.inner = QtW.QWidget()
@@ -70,6 +82,56 @@ class QJobScrollArea(QtW.QScrollArea, JobWidgetBase):
         layout.setSizeConstraint(QtW.QLayout.SizeConstraint.SetMinimumSize)
         self._layout = layout
         self._worker: GeneratorWorker | None = None
+        self._memory_released = False
+        get_memory_budget().register(self)
+
+    def memory_usage(self) -> int:
+        """Bytes of the images and meshes held by this widget."""
+        return sum(child.memory_usage() for child in self._memory_holders())
+
+    def release_memory(self):
+        """Release the images and meshes until this widget is shown again."""
+        for child in self._memory_holders():
+            child.release_memory()
+        self._memory_released = True
+
+    def _memory_holders(self) -> list[QtW.QWidget]:
+        return [
+            child
+            for child in self.inner.findChildren(QtW.QWidget)
+            if callable(getattr(child, "release_memory", None))
+        ]
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        get_memory_budget().mark_visible(self)
+        if self._memory_released:
+            self._memory_released = False
+            try:
+                self.reload()
+            except Exception:
+                _LOGGER.error(
+                    f"Failed to reload job widget {type(self).__name__!r}",
+                    exc_info=True,
+                )
+
+    def reload(self):
+        """Load the released images and meshes again.
+
+        `initialize` usually updates the views only when new files are found, so the
+        current selections of the list and iteration widgets are emitted again.
+        """
+        if self._job_dir is None:
+            return
+        self.initialize(self._job_dir)
+        for child in self.inner.findChildren(QMicrographListWidget):
+            child.emit_current()
+        for child in self.inner.findChildren(QIntChoiceWidget):
+            child.emit_current()
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        get_memory_budget().schedule_enforce()
 
     def resizeEvent(self, a0):
         super().resizeEvent(a0)
@@ -78,6 +140,7 @@ class QJobScrollArea(QtW.QScrollArea, JobWidgetBase):
 
     def closeEvent(self, a0):
         self.window_closed_callback()
+        get_memory_budget().unregister(self)
         return super().closeEvent(a0)
 
     def window_closed_callback(self):
@@ -93,7 +156,12 @@ class QJobScrollArea(QtW.QScrollArea, JobWidgetBase):
     def _start_worker(self):
         self._worker.yielded.connect(self._on_yielded)
         # self._worker.finished.connect(self.window_closed_callback)
-        start_worker(self._worker)
+        # hidden tabs must not delay the visible one
+        if self.isVisible():
+            priority = Priority.THUMBNAIL
+        else:
+            priority = Priority.BACKGROUND
+        start_worker(self._worker, priority=priority)
 
 
 class QTextEditBase(QtW.QWidget, JobWidgetBase):
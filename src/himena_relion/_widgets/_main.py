@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Callable, Iterator, TypeVar, TYPE_CHECKING
+import importlib
 import logging
 import weakref
 
@@ -24,6 +25,7 @@ from himena_relion._widgets._job_widgets import (
 )
 from himena_relion._widgets._misc import spacer_widget
 from himena_relion._impl_objects import RelionJobIsTesting
+from himena_relion.external.work_units import parse_progress
 from himena_relion.consts import RelionJobState
 
 if TYPE_CHECKING:
@@ -139,6 +141,7 @@ class QRelionJobWidget(QRelionJobWidgetBase):
         job_dir = model.value
         if not isinstance(job_dir, _job_dir.JobDirectory):
             raise TypeError(f"Expected JobDirectory, got {type(job_dir)}")
+        job_dir.refresh()
         if isinstance(model.metadata, RelionJobIsTesting):
             self._watcher = None
         else:
@@ -223,6 +226,7 @@ class QRelionJobWidget(QRelionJobWidgetBase):
                 f"Job directory {self._job_dir.path} has been deleted externally. This "
                 "widget will no longer respond to changes. Please close this widget."
             )
+        self._job_dir.notify_file_changed(Path(path))
         msg = ""
         for wdt in self._iter_job_widgets():
             wdt.on_job_updated(self._job_dir, Path(path))
@@ -240,6 +244,9 @@ class RelionJobViewRegistry:
     def __init__(self):
         self._registered_spa = {}
         self._registered_tomo = {}
+        # job type label -> module path that registers the widget class on import
+        self._lazy_spa: dict[str, str] = {}
+        self._lazy_tomo: dict[str, str] = {}
 
     @classmethod
     def instance(cls) -> RelionJobViewRegistry:
@@ -253,19 +260,41 @@ class RelionJobViewRegistry:
     ) -> Callable[[_job_dir.JobDirectory], JobWidgetBase] | None:
         """Get the widget class for a specific job type."""
         label = job_dir.job_type_label()
+        spa = (self._registered_spa, self._lazy_spa)
+        tomo = (self._registered_tomo, self._lazy_tomo)
         if job_dir.is_tomo():
-            registries = [self._registered_tomo, self._registered_spa]
+            registries = [tomo, spa]
         else:
-            registries = [self._registered_spa, self._registered_tomo]
+            registries = [spa, tomo]
 
         # split by `.` and try each part
-        for reg in registries:
+        for reg, lazy in registries:
             num_substrings = label.count(".") + 1
             for i in range(max(label.count("."), 1)):
                 label_sub = ".".join(label.split(".")[: num_substrings - i])
-                if factory := reg.get(label_sub, None):
+                if factory := self._get_or_import(reg, lazy, label_sub):
                     return factory
 
+    def registered_job_types(self, is_tomo: bool = False) -> list[str]:
+        """List all the job types with a widget class, without importing them."""
+        if is_tomo:
+            return sorted(self._registered_tomo.keys() | self._lazy_tomo.keys())
+        return sorted(self._registered_spa.keys() | self._lazy_spa.keys())
+
+    def _get_or_import(
+        self, reg: dict[str, Callable], lazy: dict[str, str], label: str
+    ) -> Callable | None:
+        if factory := reg.get(label, None):
+            return factory
+        if module := lazy.get(label, None):
+            t0 = default_timer()
+            importlib.import_module(module)
+            del lazy[label]
+            _LOGGER.info(
+                f"Imported {module} for {label!r} in {default_timer() - t0:.3f} seconds"
+            )
+            return reg.get(label, None)
+
 
 _T = TypeVar("_T", bound=JobWidgetBase)
 
@@ -289,6 +318,29 @@ def register_job(
     return inner
 
 
+def register_job_lazy(
+    job_types: dict[str, str],
+    is_tomo: bool = False,
+) -> None:
+    """Register the modules that define the widget classes for given job types.
+
+    Each module is imported when a job of the corresponding type is opened for the
+    first time, and is expected to register the widget class using `register_job`.
+
+    Parameters
+    ----------
+    job_types : dict[str, str]
+        Mapping from job type label to the absolute module path.
+    is_tomo : bool, default False
+        Whether the job types are registered for tomography jobs.
+    """
+    ins = RelionJobViewRegistry.instance()
+    if is_tomo:
+        ins._lazy_tomo.update(job_types)
+    else:
+        ins._lazy_spa.update(job_types)
+
+
 class QRelionJobWidgetControl(QtW.QWidget):
     def __init__(self, parent: QRelionJobWidget):
         super().__init__()
@@ -351,6 +403,9 @@ class QRelionJobWidgetControl(QtW.QWidget):
 
     def set_msg(self, msg: str):
         """Set the one-line message in the control widget."""
+        if progress := parse_progress(msg.rsplit("\n", 1)[-1]):
+            _, done, total = progress
+            msg = f"[{done / max(total, 1):.0%}] {msg}"
         self._oneline_msg.setText(msg)
         if msg:
             self._oneline_msg.setToolTip("The last two lines of run.out")
@@ -0,0 +1,246 @@
+"""Memory budget of the images and meshes held by the job widgets.
+
+Every `QJobScrollArea` is registered to the budget manager. When the total memory
+usage exceeds the budget, the heavy resources of the least recently visible widgets
+are released. Released widgets are initialized again when they are shown.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import logging
+import threading
+from typing import Iterator, NamedTuple, TYPE_CHECKING
+import weakref
+
+import psutil
+from qtpy import QtWidgets as QtW, QtCore
+
+from himena_relion._utils import bytes_to_size_str
+
+if TYPE_CHECKING:
+    from himena_relion._widgets._job_widgets import QJobScrollArea
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_DEFAULT_BUDGET = 8 * 1024**3
+# widgets smaller than this are not worth initializing again
+_MIN_RELEASE_BYTES = 1024**2
+
+
+class JobMemoryUsage(NamedTuple):
+    """Memory usage of a job widget."""
+
+    job: str
+    tab: str
+    nbytes: int
+    visible: bool
+    released: bool
+
+
+class MemoryBudget:
+    """Limit the total memory of the resources held by the job widgets."""
+
+    def __init__(self, budget: int | None = None):
+        if budget is None:
+            budget = min(psutil.virtual_memory().total // 4, _MAX_DEFAULT_BUDGET)
+        self._budget = int(budget)
+        # least recently visible first
+        self._areas: OrderedDict[int, weakref.ref[QJobScrollArea]] = OrderedDict()
+        self._enforce_scheduled = False
+
+    @property
+    def budget(self) -> int:
+        """The memory budget in bytes."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: int):
+        if value <= 0:
+            raise ValueError(f"Budget must be positive, got {value}.")
+        self._budget = int(value)
+        self.enforce()
+
+    def register(self, area: QJobScrollArea):
+        """Register a job widget to this budget."""
+        key = id(area)
+        self._areas[key] = weakref.ref(area, lambda _, key=key: self._forget(key))
+
+    def unregister(self, area: QJobScrollArea):
+        """Unregister a job widget."""
+        self._forget(id(area))
+
+    def mark_visible(self, area: QJobScrollArea):
+        """Mark the job widget as the most recently visible one."""
+        if (key := id(area)) in self._areas:
+            self._areas.move_to_end(key)
+
+    def schedule_enforce(self):
+        """Enforce the budget after the pending events are processed."""
+        if not self._enforce_scheduled:
+            self._enforce_scheduled = True
+            QtCore.QTimer.singleShot(0, self._run_scheduled_enforce)
+
+    def enforce(self) -> int:
+        """Release the hidden widgets until the budget is met.
+
+        Widgets are released from the least recently visible one. Return the number
+        of bytes released.
+        """
+        usages = [(area, area.memory_usage()) for area in self._iter_areas()]
+        total = sum(nbytes for _, nbytes in usages)
+        released = 0
+        for area, nbytes in usages:
+            if total <= self._budget:
+                break
+            if nbytes < _MIN_RELEASE_BYTES or area.isVisible():
+                continue
+            area.release_memory()
+            total -= nbytes
+            released += nbytes
+            _LOGGER.info(
+                "Released %s of %s", bytes_to_size_str(nbytes), _area_title(area)
+            )
+        return released
+
+    def release_hidden(self) -> int:
+        """Release all the hidden widgets regardless of the budget."""
+        released = 0
+        for area in list(self._iter_areas()):
+            if area.isVisible() or (nbytes := area.memory_usage()) == 0:
+                continue
+            area.release_memory()
+            released += nbytes
+        return released
+
+    def total(self) -> int:
+        """Total bytes used by the registered widgets."""
+        return sum(area.memory_usage() for area in self._iter_areas())
+
+    def usages(self) -> list[JobMemoryUsage]:
+        """Memory usage of each widget, the most recently visible first."""
+        out: list[JobMemoryUsage] = []
+        for area in self._iter_areas():
+            out.append(
+                JobMemoryUsage(
+                    job=_area_title(area),
+                    tab=area.tab_title(),
+                    nbytes=area.memory_usage(),
+                    visible=area.isVisible(),
+                    released=area._memory_released,
+                )
+            )
+        return out[::-1]
+
+    def _iter_areas(self) -> Iterator[QJobScrollArea]:
+        for key, ref in list(self._areas.items()):
+            if (area := ref()) is None:
+                continue
+            try:
+                area.isVisible()
+            except RuntimeError:  # C++ object already deleted
+                self._forget(key)
+            else:
+                yield area
+
+    def _forget(self, key: int):
+        self._areas.pop(key, None)
+
+    def _run_scheduled_enforce(self):
+        self._enforce_scheduled = False
+        self.enforce()
+
+
+def _area_title(area: QJobScrollArea) -> str:
+    if (job_dir := area._job_dir) is None:
+        return type(area).__name__
+    try:
+        return job_dir.job_normal_id()
+    except ValueError:  # not in a RELION project
+        return job_dir.path.name
+
+
+_BUDGET: MemoryBudget | None = None
+_BUDGET_LOCK = threading.Lock()
+
+
+def get_memory_budget() -> MemoryBudget:
+    """Return the memory budget shared by all the job widgets."""
+    global _BUDGET
+    with _BUDGET_LOCK:
+        if _BUDGET is None:
+            _BUDGET = MemoryBudget()
+        return _BUDGET
+
+
+class QMemoryBudgetPanel(QtW.QWidget):
+    """Diagnostics panel of the memory used by the job widgets."""
+
+    def __init__(self, budget: MemoryBudget | None = None, parent=None):
+        super().__init__(parent)
+        self._budget = budget or get_memory_budget()
+        layout = QtW.QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        self._table = QtW.QTableWidget(0, 4)
+        self._table.setHorizontalHeaderLabels(["Job", "Tab", "Memory", "State"])
+        self._table.setEditTriggers(QtW.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setStretchLastSection(True)
+        self._total_label = QtW.QLabel()
+        self._budget_box = QtW.QDoubleSpinBox()
+        self._budget_box.setRange(0.1, 1024.0)
+        self._budget_box.setDecimals(1)
+        self._budget_box.setSuffix(" GB")
+        self._budget_box.setValue(self._budget.budget / 1024**3)
+        self._budget_box.setToolTip("Memory budget of all the job widgets.")
+        self._budget_box.editingFinished.connect(self._on_budget_changed)
+        refresh_btn = QtW.QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        release_btn = QtW.QPushButton("Release hidden")
+        release_btn.setToolTip(
+            "Release images and meshes of all the hidden tabs. They are loaded again "
+            "when the tab is shown."
+        )
+        release_btn.clicked.connect(self._on_release_hidden)
+        hlayout = QtW.QHBoxLayout()
+        hlayout.setContentsMargins(0, 0, 0, 0)
+        hlayout.addWidget(QtW.QLabel("Budget:"))
+        hlayout.addWidget(self._budget_box)
+        hlayout.addWidget(refresh_btn)
+        hlayout.addWidget(release_btn)
+        layout.addLayout(hlayout)
+        layout.addWidget(self._total_label)
+        layout.addWidget(self._table)
+        self.refresh()
+
+    def refresh(self):
+        """Update the table with the current memory usage."""
+        usages = self._budget.usages()
+        self._table.setRowCount(len(usages))
+        for row, usage in enumerate(usages):
+            if usage.visible:
+                state = "Visible"
+            elif usage.released:
+                state = "Released"
+            else:
+                state = "Hidden"
+            texts = [usage.job, usage.tab, bytes_to_size_str(usage.nbytes), state]
+            for col, text in enumerate(texts):
+                self._table.setItem(row, col, QtW.QTableWidgetItem(text))
+        total = sum(usage.nbytes for usage in usages)
+        self._total_label.setText(
+            f"Total: {bytes_to_size_str(total)} / "
+            f"{bytes_to_size_str(self._budget.budget)}"
+        )
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        self.refresh()
+
+    def _on_budget_changed(self):
+        self._budget.budget = int(self._budget_box.value() * 1024**3)
+        self.refresh()
+
+    def _on_release_hidden(self):
+        self._budget.release_hidden()
+        self.refresh()
@@ -115,6 +115,10 @@ class QMicrographListWidget(QtW.QTableView):
         if 0 <= index < self.rowCount():
             self.selectRow(index)
 
+    def emit_current(self):
+        """Emit `current_changed` for the current selection again."""
+        self._on_selection_changed()
+
 
 class QImageViewTextEdit(QtW.QTextEdit):
     """A text edit used for displaying images with text annotations."""
@@ -125,6 +129,7 @@ class QImageViewTextEdit(QtW.QTextEdit):
         self.setMinimumHeight(200)
         self._image_size_pixel = image_size_pixel
         self._font_size = font_size
+        self._image_bytes = 0
 
     def image_to_base64(
         self,
@@ -132,33 +137,59 @@ class QImageViewTextEdit(QtW.QTextEdit):
         text: str = "",
         lowpass_cutoff: float = 1.0,
     ) -> str:
-        img_slice_small = ndi.zoom(
-            img_slice,
-            self._image_size_pixel / img_slice.shape[0],
-            order=1,
-            prefilter=False,
-        )
-        img_slice_filt = lowpass_filter(img_slice_small, lowpass_cutoff)
-        img_slice_normed = (
-            (img_slice_filt - img_slice_filt.min())
-            / (img_slice_filt.max() - img_slice_filt.min())
-            * 255
-        )
-        img_slice = img_slice_normed.astype(np.uint8)
+        return self.images_to_base64(img_slice[np.newaxis], [text], lowpass_cutoff)[0]
 
-        pil_img = Image.fromarray(img_slice).convert("RGB")
-        draw = ImageDraw.Draw(pil_img)
+    def images_to_base64(
+        self,
+        img_stack: np.ndarray,
+        texts: list[str] | None = None,
+        lowpass_cutoff: float = 1.0,
+    ) -> list[str]:
+        """Convert a stack of same-sized images to base64 PNG strings at once.
+
+        Resizing, filtering and normalization are done for the whole stack in a
+        vectorized way, so this is much faster than calling `image_to_base64` for
+        each image.
+        """
+        zoom = self._image_size_pixel / img_stack.shape[1]
+        stack_small = ndi.zoom(img_stack, (1, zoom, zoom), order=1, prefilter=False)
+        stack_filt = lowpass_filter(stack_small, lowpass_cutoff)
+        smin = stack_filt.min(axis=(1, 2), keepdims=True)
+        smax = stack_filt.max(axis=(1, 2), keepdims=True)
+        stack_normed = (stack_filt - smin) / (smax - smin) * 255
+        stack_uint8 = stack_normed.astype(np.uint8)
+
+        if texts is None:
+            texts = [""] * stack_uint8.shape[0]
         font = ImageFont.load_default()
         font.size = self._font_size
-        draw.text((5, 5), text, fill=(0, 255, 0), font=font)
+        out: list[str] = []
+        for img_slice, text in zip(stack_uint8, texts, strict=True):
+            pil_img = Image.fromarray(img_slice).convert("RGB")
+            draw = ImageDraw.Draw(pil_img)
+            draw.text((5, 5), text, fill=(0, 255, 0), font=font)
 
-        buffer = BytesIO()
-        pil_img.save(buffer, format="PNG")
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        return img_str
+            buffer = BytesIO()
+            pil_img.save(buffer, format="PNG")
+            out.append(base64.b64encode(buffer.getvalue()).decode())
+        return out
 
     def insert_base64_image(self, img_str: str):
         self.insertHtml(f'<img src="data:image/png;base64,{img_str}"/>')
+        # the HTML source is stored as UTF-16 and the decoded image as RGBA
+        self._image_bytes += len(img_str) * 2 + self._image_size_pixel**2 * 4
+
+    def clear(self):
+        super().clear()
+        self._image_bytes = 0
+
+    def memory_usage(self) -> int:
+        """Bytes of the images inserted to this text edit."""
+        return self._image_bytes
+
+    def release_memory(self):
+        """Remove all the images."""
+        self.clear()
 
     def prep_uuid(self) -> uuid.UUID:
         return uuid.uuid4()
@@ -91,7 +91,9 @@ class QMicrographParticleOverlay(QtW.QWidget):
         image_scale = mic_view.get_scale()
         self._filter_widget.set_image_scale(image_scale)
         self._viewer.set_array_view(
-            mic_view.with_filter(self._filter_widget.apply),
+            mic_view.with_filter(
+                self._filter_widget.apply, self._filter_widget.bin_factor
+            ),
             clim=self._viewer._last_clim,
         )
         self._reload_coords(_mic_path)
@@ -118,6 +118,11 @@ class QIntChoiceWidget(QIntWidget):
             self.setValue(0)
         self._on_iter_changed(self._iter_current_value)
 
+    def emit_current(self):
+        """Emit `current_changed` for the current value again."""
+        if self._iter_current_value in self._choices:
+            self.current_changed.emit(self._iter_current_value)
+
     def _on_iter_changed(self, value: int):
         niter_list = self._choices
         if len(niter_list) == 0:
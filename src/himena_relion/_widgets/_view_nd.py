@@ -1,5 +1,8 @@
 from __future__ import annotations
-from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+import threading
 from typing import Literal, NamedTuple
 from himena import StandardType, WidgetDataModel
 import numpy as np
@@ -20,6 +23,7 @@ from himena_builtins.qt.widgets._image_components import (
 )
 
 from himena_relion._image_readers import ArrayFilteredView
+from himena_relion._image_readers._scheduler import CancelToken, Priority, get_scheduler
 from himena_relion._widgets._spinbox import QIntWidget
 from himena_relion._widgets._vispy import (
     Vispy2DViewer,
@@ -37,6 +41,47 @@ class SliceResult(NamedTuple):
     sizes: NDArray[np.float32]
     face_colors: NDArray[np.float32]
     edge_colors: NDArray[np.float32]
+    histogram: SliceHistogram
+
+
+class SliceHistogram(NamedTuple):
+    """Subsample of a slice for the histogram, computed in the worker thread."""
+
+    sample: NDArray[np.number]
+    minmax: tuple[float, float]
+
+    @classmethod
+    def from_image(
+        cls,
+        image: NDArray[np.number],
+        max_samples: int = 2**16,
+    ) -> SliceHistogram:
+        """Take a strided subsample of the image."""
+        step = max(int(np.ceil(np.sqrt(image.size / max_samples))), 1)
+        if image.ndim == 2:
+            sample = image[::step, ::step].ravel()
+        else:
+            sample = image.ravel()[:: step**2]
+        if sample.size == 0:
+            return cls(np.zeros(0, dtype=image.dtype), (0.0, 1.0))
+        return cls(sample.copy(), (float(sample.min()), float(sample.max())))
+
+    def set_to(
+        self,
+        hist_view: QHistogramView,
+        clim: tuple[float, float],
+        bin_range: tuple[float, float],
+    ):
+        """Paint the histogram with the bins spanning `bin_range`.
+
+        `bin_range` must include the min/max of the sample.
+        """
+        sample = self.sample
+        if sample.size > 0 and sample.dtype.kind != "b":
+            # the bins of QHistogramView span the min/max of the input array
+            bounds = np.asarray(bin_range, dtype=sample.dtype)
+            sample = np.concatenate([sample, bounds])
+        hist_view.set_hist_for_array(sample, clim)
 
 
 class QViewer(QtW.QWidget):
@@ -45,6 +90,13 @@ class QViewer(QtW.QWidget):
     def set_background_color(self, color):
         self._canvas._scene.bgcolor = color
 
+    def memory_usage(self) -> int:
+        """Bytes of the image data held by this viewer."""
+        return 0
+
+    def release_memory(self):
+        """Release the image data held by this viewer."""
+
     def _show_usage(self):
         current_instance()._backend_main_window._add_whats_this(
             doc_to_whats_this(self.__doc__), style="markdown"
@@ -77,6 +129,11 @@ class Q2DViewerBase(QViewer):
         self._canvas.auto_fit()
         self._canvas.update_canvas()
 
+    def _image_nbytes(self) -> int:
+        if not self._canvas._image.visible:
+            return 0  # placeholder
+        return _array_nbytes(self._canvas.image)
+
     def _show_context_menu(self):
         menu = self._make_context_menu()
         pos = menu.mapFromGlobal(QtGui.QCursor.pos())
@@ -99,6 +156,12 @@ class Q2DSimpleViewer(Q2DViewerBase):
         if clim is not None:
             self._canvas.contrast_limits = clim
 
+    def memory_usage(self) -> int:
+        return self._image_nbytes()
+
+    def release_memory(self):
+        self._canvas.image = None
+
     def set_points(
         self,
         points_xy: np.ndarray,
@@ -162,12 +225,25 @@ class Q2DViewer(Q2DViewerBase):
     - Wheel ... zoom
     """
 
-    _executor = ThreadPoolExecutor(max_workers=2)
+    _slice_cache_bytes = 128 * 1024**2
+    _num_prefetch = 1  # number of slices prefetched on each side
 
     def __init__(self, zlabel: str = "z", parent=None):
         super().__init__(parent)
         self._last_future: Future[SliceResult] | None = None
+        # cancels all the pending tasks of this viewer when it is hidden
+        self._cancel_token = CancelToken()
+        # slider value -> (image, histogram) of the recently shown slices
+        self._slice_cache: OrderedDict[int, tuple[np.ndarray, SliceHistogram]] = (
+            OrderedDict()
+        )
+        self._slice_cache_lock = threading.Lock()
+        # bumped when the slice cache is cleared, so that the slices read before that
+        # (e.g. with the old filter parameters) are not added to the cache
+        self._cache_generation = 0
         self._last_clim: tuple[float, float] | None = None
+        # range of the histogram bins, shared by all the slices of the array view
+        self._hist_range: tuple[float, float] | None = None
         self._canvas.native.setMinimumSize(200, 200)
         layout = QtW.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -208,6 +284,23 @@ class Q2DViewer(Q2DViewerBase):
         self._points = np.empty((0, 3), dtype=np.float32)
         self.redraw()
 
+    def _clear_slice_cache(self):
+        with self._slice_cache_lock:
+            self._slice_cache.clear()
+            self._cache_generation += 1
+        self._hist_range = None
+
+    def memory_usage(self) -> int:
+        with self._slice_cache_lock:
+            nbytes = sum(img.nbytes for img, _ in self._slice_cache.values())
+        if self._array_view is not None:
+            nbytes += self._array_view.nbytes()
+        return nbytes + self._image_nbytes()
+
+    def release_memory(self):
+        self._renew_cancel_token()
+        self.clear()
+
     @property
     def has_image(self) -> bool:
         return self._array_view is not None
@@ -225,6 +318,8 @@ class Q2DViewer(Q2DViewerBase):
             self._array_view = image
         else:
             raise TypeError("image must be a numpy array or ArrayFilteredView.")
+        self._renew_cancel_token()
+        self._clear_slice_cache()
         self._last_clim = clim
         num_slices = self._array_view.num_slices()
         with QtCore.QSignalBlocker(self._dims_slider):
@@ -264,14 +359,25 @@ class Q2DViewer(Q2DViewerBase):
         edge_color : (4,) or (N, 4) array-like
             The edge color of the points.
         """
+        points = np.asarray(points)
+        face_colors = _norm_color(face_color, len(points))
+        edge_colors = _norm_color(edge_color, len(points))
+        if points.ndim == 2 and points.shape[1] == 3:
+            # sort by z once so that each slice is a contiguous window
+            order = np.argsort(points[:, 0], kind="stable")
+            points = points[order]
+            face_colors = face_colors[order]
+            edge_colors = edge_colors[order]
         self._points = points
         self._out_of_slice = out_of_slice
-        self._face_colors = _norm_color(face_color, len(points))
-        self._edge_colors = _norm_color(edge_color, len(points))
+        self._face_colors = face_colors
+        self._edge_colors = edge_colors
         if size is not None:
             self._point_size = size
 
     def redraw(self):
+        self._renew_cancel_token()
+        self._clear_slice_cache()
         self._on_slider_changed(self._dims_slider.value(), force_sync=True)
 
     def _on_zpos_box_changed(self, value: int):
@@ -291,22 +397,45 @@ class Q2DViewer(Q2DViewerBase):
                 future.set_result(val)
                 self._on_calc_slice_done(future)
             else:
-                self._last_future = self._executor.submit(self._get_image_slice, value)
+                scheduler = get_scheduler()
+                self._last_future = scheduler.submit(
+                    self._get_image_slice,
+                    value,
+                    self._cache_generation,
+                    priority=Priority.INTERACTIVE,
+                    token=self._cancel_token,
+                )
                 self._last_future.add_done_callback(self._on_calc_slice_done)
+                self._prefetch_around(value)
         else:
             self._canvas.image = np.zeros((0, 0), dtype=np.float32)
             self._histogram_view.set_hist_for_array(
                 np.zeros((2, 2), dtype=np.float32), (0.0, 1.0)
             )
 
-    def _get_image_slice(self, slider_value: int) -> SliceResult | None:
-        try:
-            _sliced = self._array_view.get_slice(slider_value)
-        except Exception:
-            # This may happen if the image is being written in another thread so the
-            # header size and the actual data size are inconsistent.
-            return None
-        slice_image = np.asarray(_sliced)
+    def _get_image_slice(
+        self, slider_value: int, generation: int | None = None
+    ) -> SliceResult | None:
+        if generation is None:
+            generation = self._cache_generation
+        with self._slice_cache_lock:
+            if (cached := self._slice_cache.get(slider_value)) is not None:
+                self._slice_cache.move_to_end(slider_value)
+        if cached is None:
+            try:
+                _sliced = self._array_view.get_slice(slider_value)
+            except Exception:
+                # This may happen if the image is being written in another thread so
+                # the header size and the actual data size are inconsistent.
+                return None
+            slice_image = np.asarray(_sliced)
+            histogram = SliceHistogram.from_image(slice_image)
+            if not self._add_to_slice_cache(
+                slider_value, slice_image, histogram, generation
+            ):
+                return None  # redrawn while reading the slice
+        else:
+            slice_image, histogram = cached
         if self._last_clim is None:
             min_ = slice_image.min()
             max_ = slice_image.max()
@@ -315,12 +444,16 @@ class Q2DViewer(Q2DViewerBase):
             min_, max_ = self._last_clim
 
         point_size = self._point_size_normed()
-        if self._is_3d:
-            zs = self._points[:, 0]
+        if self._is_3d and self._points.shape[1] == 3:
+            # points are sorted by z, so only the points near the plane are visited
             thickness = point_size if self._out_of_slice else 0.01
-            zdiff = zs - slider_value
-            mask = np.abs(zdiff) < thickness / 2
-            sizes = np.sqrt(point_size**2 - (zdiff[mask] * 2) ** 2)
+            zs = self._points[:, 0]
+            start = np.searchsorted(zs, slider_value - thickness / 2, side="right")
+            stop = np.searchsorted(zs, slider_value + thickness / 2, side="left")
+            mask = slice(start, stop)
+            zdiff = np.abs(zs[mask] - slider_value)
+            table = _point_size_table(point_size, thickness)
+            sizes = table[(zdiff * _SIZE_TABLE_RESOLUTION).astype(np.int32)]
         else:
             mask = slice(None)
             sizes = point_size
@@ -331,8 +464,60 @@ class Q2DViewer(Q2DViewerBase):
             sizes=sizes,
             face_colors=self._face_colors[mask],
             edge_colors=self._edge_colors[mask],
+            histogram=histogram,
         )
 
+    def _prefetch_around(self, value: int):
+        """Read the neighboring slices into the slice cache in advance."""
+        scheduler = get_scheduler()
+        for dv in range(1, self._num_prefetch + 1):
+            for index in (value + dv, value - dv):
+                if not 0 <= index <= self._dims_slider.maximum():
+                    continue
+                with self._slice_cache_lock:
+                    if index in self._slice_cache:
+                        continue
+                scheduler.submit(
+                    self._prefetch_slice,
+                    self._array_view,
+                    index,
+                    self._cache_generation,
+                    priority=Priority.PREFETCH,
+                    token=self._cancel_token,
+                )
+
+    def _prefetch_slice(self, view: ArrayFilteredView, index: int, generation: int):
+        try:
+            slice_image = np.asarray(view.get_slice(index))
+        except Exception:
+            return
+        if view is self._array_view:
+            histogram = SliceHistogram.from_image(slice_image)
+            self._add_to_slice_cache(index, slice_image, histogram, generation)
+
+    def _renew_cancel_token(self):
+        """Cancel all the pending tasks of this viewer."""
+        self._cancel_token.cancel()
+        self._cancel_token = CancelToken()
+
+    def hideEvent(self, a0):
+        self._renew_cancel_token()
+        return super().hideEvent(a0)
+
+    def _add_to_slice_cache(
+        self, key: int, image: np.ndarray, hist: SliceHistogram, generation: int
+    ) -> bool:
+        """Add the slice to the cache unless the cache was cleared after reading it."""
+        with self._slice_cache_lock:
+            if generation != self._cache_generation:
+                return False
+            self._slice_cache[key] = (image, hist)
+            nbytes = sum(img.nbytes for img, _ in self._slice_cache.values())
+            while nbytes > self._slice_cache_bytes and len(self._slice_cache) > 1:
+                _, (old, _) = self._slice_cache.popitem(last=False)
+                nbytes -= old.nbytes
+        return True
+
     @ensure_main_thread
     def _on_calc_slice_done(self, future: Future[SliceResult | None]):
         self._last_future = None
@@ -341,7 +526,11 @@ class Q2DViewer(Q2DViewerBase):
         result = future.result()
         if result is None:
             return
-        self._histogram_view.set_hist_for_array(result.image, result.clim)
+        hmin, hmax = result.histogram.minmax
+        if self._hist_range is not None:
+            hmin, hmax = min(hmin, self._hist_range[0]), max(hmax, self._hist_range[1])
+        self._hist_range = (hmin, hmax)
+        result.histogram.set_to(self._histogram_view, result.clim, self._hist_range)
         self._canvas.image = result.image
         self._canvas.contrast_limits = result.clim
         self._last_clim = result.clim
@@ -481,6 +670,15 @@ class Q3DViewer(Q3DViewerBase):
     def has_image(self) -> bool:
         return self._has_image
 
+    def memory_usage(self) -> int:
+        if not self.has_image:
+            return 0
+        return _array_nbytes(self._canvas.image)
+
+    def release_memory(self):
+        if self.has_image:
+            self.set_image(None, update_now=False)
+
     def set_image(self, image: np.ndarray | None, update_now: bool = True):
         """Set the 3D image to be displayed."""
         had_image = self.has_image
@@ -700,6 +898,17 @@ class Q3DTomogramViewer(QViewer):
             self._canvas.markers_visual.visible = False
         self._canvas.update_canvas()
 
+    def memory_usage(self) -> int:
+        nbytes = _array_nbytes(self._canvas._current_image_slice)
+        if (view := self._canvas._array_view) is not None:
+            nbytes += view.nbytes()
+        return nbytes
+
+    def release_memory(self):
+        self.clear()
+        self._canvas._array_view = None
+        self._canvas._current_image_slice = None
+
     def set_motion_paths(self, motion, color=None):
         self._canvas.motion_visual.set_data(motion)
         self._canvas.motion_visual.visible = True
@@ -808,11 +1017,17 @@ class Q3DLocalResViewer(Q3DViewerBase):
             view_direction = self._canvas.camera.view_direction()
             self._surface.shading_filter.light_dir = -view_direction
 
+    def memory_usage(self) -> int:
+        return self._surface.nbytes()
+
+    def release_memory(self):
+        self._surface.clear()
+
     def auto_threshold(self, thresh: float | None = None, update_now: bool = True):
         """Automatically set the threshold based on the image data."""
         img = self._surface._data
         mask = self._surface._mask
-        if self._surface.visible:
+        if self._surface.visible and img is not None:
             if thresh is None:
                 if mask is not None:
                     sample_data = img[mask]
@@ -827,6 +1042,8 @@ class Q3DLocalResViewer(Q3DViewerBase):
     def auto_fit(self, update_now: bool = True):
         """Automatically fit the camera to the image."""
         img = self._surface._data
+        if img is None:
+            return
         self._canvas.camera.center = np.array(img.shape) / 2
         self._canvas.camera.scale_factor = max(img.shape)
         self._canvas.camera.update()
@@ -933,13 +1150,16 @@ class Q2DFilterWidget(QtW.QWidget):
         """Get the lowpass cutoff frequency from the input."""
         return float(self._lowpass_cutoff.text())
 
-    def apply(self, img: np.ndarray, index=None) -> np.ndarray:
-        """Apply the binning and lowpass filter to the input image."""
+    def apply(self, img: np.ndarray, index=None, binned: int = 1) -> np.ndarray:
+        """Apply the binning and lowpass filter to the input image.
+
+        `binned` is the factor by which the input image is already binned.
+        """
         # Binning
         factor = self.bin_factor()
         cutoff = self.lowpass_cutoff()
-        if factor > 1:
-            img = _utils.bin_image(img, factor)
+        if factor // binned > 1:
+            img = _utils.bin_image(img, factor // binned)
         if cutoff > 0.0:
             cutoff_rel = self._image_scale / cutoff * factor
             img = _utils.lowpass_filter(img, cutoff_rel)
@@ -956,6 +1176,18 @@ class Q2DFilterWidget(QtW.QWidget):
         self._spacer.setText(text)
 
 
+_SIZE_TABLE_RESOLUTION = 64  # number of table entries per pixel
+
+
+@lru_cache(maxsize=16)
+def _point_size_table(point_size: float, thickness: float) -> NDArray[np.float32]:
+    """Table of point sizes of out-of-slice points, indexed by the z distance."""
+    zdiff = np.arange(int(thickness / 2 * _SIZE_TABLE_RESOLUTION) + 1)
+    zdiff = zdiff / _SIZE_TABLE_RESOLUTION
+    sizes = np.sqrt(np.maximum(point_size**2 - (zdiff * 2) ** 2, 0))
+    return sizes.astype(np.float32)
+
+
 def _norm_color(color, num: int) -> NDArray[np.float32]:
     """Normalize color input to an array of RGBA colors."""
     carr = ColorArray(color)
@@ -968,6 +1200,13 @@ def _norm_color(color, num: int) -> NDArray[np.float32]:
     return carr.astype(np.float32, copy=False)
 
 
+def _array_nbytes(arr: np.ndarray | None) -> int:
+    """Bytes of the array in memory. Memory-mapped arrays are not counted."""
+    if arr is None or isinstance(arr, np.memmap):
+        return 0
+    return int(arr.nbytes)
+
+
 def _format_for_minmax(m0, m1):
     prec = np.log10(m1 - m0 + 1e-8)
     n_decimals = max(0, -int(np.floor(prec)) + 3)
@@ -1,6 +1,6 @@
 from ._viewer import Vispy2DViewer, Vispy3DViewer, Vispy3DTomogramViewer
 from .isosurface import IsoSurface
-from .motion import MotionPath
+from .motion import MotionPath, PackedPaths, set_paths_scale
 from ._mask_mesh import MaskMesh
 
 __all__ = [
@@ -9,5 +9,7 @@ __all__ = [
     "Vispy3DTomogramViewer",
     "IsoSurface",
     "MotionPath",
+    "PackedPaths",
+    "set_paths_scale",
     "MaskMesh",
 ]
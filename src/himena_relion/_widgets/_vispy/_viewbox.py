@@ -40,8 +40,11 @@
 
 from __future__ import annotations
 from functools import lru_cache
+import logging
+import math
 import sys
 from timeit import default_timer
+from typing import Callable, NamedTuple
 import numpy as np
 from numpy.typing import NDArray
 from qtpy import QtWidgets as QtW, QtCore, QtGui
@@ -52,7 +55,9 @@ from vispy.util import keys as VispyKeys
 from vispy.util.quaternion import Quaternion
 from psygnal import Signal
 from scipy.spatial.transform import Rotation
-from himena.qt import QViewBox
+from himena.qt import QViewBox, ndarray_to_qimage
+
+_LOGGER = logging.getLogger(__name__)
 
 
 @lru_cache(maxsize=1)
@@ -67,6 +72,133 @@ def get_qt_app():
     return app
 
 
+class RenderStats(NamedTuple):
+    """Statistics of the offscreen rendering."""
+
+    fps: float
+    render_time: float
+    scale: float
+
+
+class QRenderScheduler(QtCore.QObject):
+    """Coalesce render requests into at most one render per display frame.
+
+    Parameters
+    ----------
+    render : callable
+        Function that renders the scene. It is called with the scale factor relative
+        to the full resolution.
+    frame_interval : float
+        Minimum interval between two renders in seconds.
+    settle_interval : float
+        Interaction is considered to be finished if no interactive request is made
+        for this interval in seconds.
+    min_scale : float
+        Minimum scale factor used during interaction.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[float], None],
+        parent: QtCore.QObject | None = None,
+        *,
+        frame_interval: float = 1 / 60,
+        settle_interval: float = 0.15,
+        min_scale: float = 0.25,
+    ):
+        super().__init__(parent)
+        self._render = render
+        self._frame_interval = frame_interval
+        self._min_scale = min_scale
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._on_frame)
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(int(settle_interval * 1000))
+        self._settle_timer.timeout.connect(self.end_interaction)
+        self._pending = False
+        self._interacting = False
+        self._last_render_start = -math.inf
+        self._last_scale = 1.0
+        self._full_render_time = 0.0
+        self._render_time = 0.0
+        self._fps = 0.0
+
+    def request(self, interactive: bool = False):
+        """Request a render in the next display frame."""
+        if interactive:
+            self._interacting = True
+            self._settle_timer.start()
+        self._pending = True
+        if not self._frame_timer.isActive():
+            wait = self._last_render_start + self._frame_interval - default_timer()
+            self._frame_timer.start(int(max(wait, 0.0) * 1000))
+
+    def end_interaction(self):
+        """Finish the interaction and render at full resolution if needed."""
+        self._settle_timer.stop()
+        if self._interacting:
+            self._interacting = False
+            if self._last_scale < 1.0:
+                self.request()
+
+    def flush(self):
+        """Render at full resolution immediately."""
+        self._frame_timer.stop()
+        self._pending = False
+        self._run(1.0)
+
+    def cancel(self):
+        """Cancel the pending render."""
+        self._frame_timer.stop()
+        self._settle_timer.stop()
+        self._pending = False
+
+    def is_pending(self) -> bool:
+        """True if a render is scheduled but not yet done."""
+        return self._pending
+
+    def stats(self) -> RenderStats:
+        """Return the achieved FPS and the time spent for the last render."""
+        return RenderStats(self._fps, self._render_time, self._last_scale)
+
+    def interactive_scale(self) -> float:
+        """Scale factor to keep the render time within one frame."""
+        if self._full_render_time <= self._frame_interval:
+            return 1.0
+        # render time is proportional to the number of pixels
+        scale = math.sqrt(self._frame_interval / self._full_render_time)
+        return max(self._min_scale, scale)
+
+    def _on_frame(self):
+        if not self._pending:
+            return
+        self._pending = False
+        scale = self.interactive_scale() if self._interacting else 1.0
+        self._run(scale)
+
+    def _run(self, scale: float):
+        t0 = default_timer()
+        self._render(scale)
+        t1 = default_timer()
+        interval = t0 - self._last_render_start
+        if interval < 1.0:
+            fps = 1 / max(interval, 1e-6)
+            self._fps = fps if self._fps == 0 else 0.8 * self._fps + 0.2 * fps
+        else:
+            self._fps = 0.0  # not a continuous rendering
+        self._last_render_start = t0
+        self._last_scale = scale
+        self._render_time = t1 - t0
+        if scale >= 1.0:
+            self._full_render_time = self._render_time
+        _LOGGER.debug(
+            "Rendered at scale %.2f in %.3f seconds (%.1f FPS)",
+            scale, self._render_time, self._fps,
+        )  # fmt: skip
+
+
 class QOffScreenViewBox(QViewBox):
     """Vispy viewer widget using offscreen rendering to a QPixmap.
 
@@ -89,11 +221,16 @@ class QOffScreenViewBox(QViewBox):
             "last_mouse_press": None,
         }
         self._last_time = 0.0
+        self._render_scheduler = QRenderScheduler(self._render_scaled, self)
 
     @property
     def native(self) -> QtW.QWidget:
         return self
 
+    def render_stats(self) -> RenderStats:
+        """Return the statistics of the offscreen rendering."""
+        return self._render_scheduler.stats()
+
     def make_scene(self):
         return scene.SceneCanvas(
             keys="interactive",
@@ -114,8 +251,31 @@ class QOffScreenViewBox(QViewBox):
         self._store_qpixmap(size)
         self.update()
 
+    def _render_scaled(self, scale: float):
+        if scale >= 1.0:
+            return self._update_pixmap()
+        # render into a smaller buffer and upscale the pixmap
+        width, height = self._scene.size
+        size = (max(int(width * scale), 1), max(int(height * scale), 1))
+        try:
+            self._arr = self._scene.render(size=size)
+        except Exception:
+            return self._update_pixmap()
+        pixmap = QtGui.QPixmap.fromImage(ndarray_to_qimage(self._arr))
+        self._next_qpixmap = pixmap.scaled(
+            width,
+            height,
+            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+            QtCore.Qt.TransformationMode.FastTransformation,
+        )
+        self._next_qpixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.update()
+
+    def _request_render(self, interactive: bool = True):
+        self._render_scheduler.request(interactive=interactive)
+
     def update_canvas(self):
-        self._update_pixmap()
+        self._render_scheduler.flush()
 
     def resizeEvent(self, a0: QtGui.QResizeEvent):
         ratio = self.devicePixelRatioF()
@@ -129,6 +289,7 @@ class QOffScreenViewBox(QViewBox):
         return super().resizeEvent(a0)
 
     def closeEvent(self, event):
+        self._render_scheduler.cancel()
         self._scene.close()
         return super().closeEvent(event)
 
@@ -141,7 +302,7 @@ class QOffScreenViewBox(QViewBox):
         )
         if not vispy_event.handled:
             ev.ignore()
-        self._update_pixmap()
+        self._request_render()
 
     def mouseReleaseEvent(self, ev: QtGui.QMouseEvent):
         vispy_event = self._vispy_mouse_release(
@@ -152,7 +313,8 @@ class QOffScreenViewBox(QViewBox):
         )
         if not vispy_event.handled:
             ev.ignore()
-        self._update_pixmap()
+        self._request_render(interactive=False)
+        self._render_scheduler.end_interaction()
 
     def mouseDoubleClickEvent(self, ev: QtGui.QMouseEvent):
         vispy_event = self._vispy_mouse_double_click(
@@ -163,7 +325,7 @@ class QOffScreenViewBox(QViewBox):
         )
         if not vispy_event.handled:
             ev.ignore()
-        self._update_pixmap()
+        self._request_render(interactive=False)
 
     def mouseMoveEvent(self, ev: QtGui.QMouseEvent):
         # NB ignores events, returns None for events in quick succession
@@ -174,7 +336,8 @@ class QOffScreenViewBox(QViewBox):
         )
         if vispy_event is None or not vispy_event.handled:
             ev.ignore()
-        self._update_pixmap()
+        is_dragging = ev.buttons() != QtCore.Qt.MouseButton.NoButton
+        self._request_render(interactive=is_dragging)
 
     def wheelEvent(self, ev: QtGui.QWheelEvent):
         # Get scrolling
@@ -189,7 +352,7 @@ class QOffScreenViewBox(QViewBox):
         )
         if not vispy_event.handled:
             ev.ignore()
-        self._update_pixmap()
+        self._request_render()
         ev.accept()
 
     def _modifiers(self, event: QtGui.QInputEvent):
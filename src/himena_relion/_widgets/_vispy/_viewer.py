@@ -340,6 +340,8 @@ class _Vispy3DTomogramBase(_Vispy3DBase):
         return self._motion_visual
 
     def set_plane_position(self, zpos: int):
+        if self._array_view is None:
+            return
         zpos = max(0, min(self._array_view_nz - 1, zpos))
         arr_2d = self._array_view.get_slice(zpos)
         self._current_image_slice = arr_2d
@@ -162,6 +162,37 @@ class IsosurfaceVisual(MeshVisual):
         self._recompute = False
         self._recolor = False
 
+    def nbytes(self) -> int:
+        """Bytes of the arrays and the mesh held by this visual."""
+        arrays = [
+            self._data,
+            self._mask,
+            self._color_array,
+            self._vertices_cache,
+            self._faces_cache,
+            self._face_colors_cache,
+            self._vertex_colors,
+        ]
+        return sum(
+            int(arr.nbytes)
+            for arr in arrays
+            if isinstance(arr, np.ndarray) and not isinstance(arr, np.memmap)
+        )
+
+    def clear(self):
+        """Release all the arrays and the mesh."""
+        self._data = None
+        self._mask = None
+        self._color_array = None
+        self._vertices_cache = None
+        self._faces_cache = None
+        self._face_colors_cache = None
+        self._vertex_colors = None
+        self._recompute = True
+        self._recolor = True
+        MeshVisual.set_data(self)
+        self.update()
+
     def _map_colors(self, values: np.ndarray) -> np.ndarray:
         """Map scalar values to colors using the colormap and clim."""
         normed = _norm_values(values, self._clim)
@@ -1,9 +1,44 @@
+from __future__ import annotations
+
+from typing import NamedTuple
 import numpy as np
 from numpy.typing import NDArray
 from vispy.visuals import LineVisual
+from vispy.visuals.transforms import STTransform
 from vispy.scene.visuals import create_visual_node
 
 
+class PackedPaths(NamedTuple):
+    """Paths packed into a single vertex buffer.
+
+    `connect[i]` is True if the i-th vertex is connected to the (i + 1)-th vertex.
+    """
+
+    vertices: NDArray[np.float32]
+    connect: NDArray[np.bool_]
+
+    @classmethod
+    def from_array(cls, paths: NDArray[np.float32]) -> PackedPaths:
+        """Pack (N, F, D) array of N paths with F points each."""
+        npaths, npoints, ndim = paths.shape
+        connect = np.ones((npaths, npoints), dtype=np.bool_)
+        connect[:, -1] = False
+        return cls(
+            np.ascontiguousarray(paths, dtype=np.float32).reshape(-1, ndim),
+            connect.ravel(),
+        )
+
+    @classmethod
+    def from_list(cls, paths: list[NDArray[np.float32]]) -> PackedPaths:
+        """Pack list of (F_i, D) arrays."""
+        if len(paths) == 0:
+            return cls(np.empty((0, 3), dtype=np.float32), np.empty(0, np.bool_))
+        vertices = np.concatenate(paths, axis=0).astype(np.float32, copy=False)
+        connect = np.ones(vertices.shape[0], dtype=np.bool_)
+        connect[np.cumsum([arr.shape[0] for arr in paths]) - 1] = False
+        return cls(vertices, connect)
+
+
 class PathsVisual(LineVisual):
     """Visual for rendering paths as lines."""
 
@@ -23,7 +58,7 @@ class PathsVisual(LineVisual):
 
     def set_data(
         self,
-        points: list[NDArray[np.float32]],
+        points: list[NDArray[np.float32]] | PackedPaths,
         color=None,
         width=None,
     ):
@@ -31,25 +66,13 @@ class PathsVisual(LineVisual):
 
         Parameters
         ----------
-        points : list of (N, 3)
-            The 3D points representing the motion paths.
+        points : list of (N, 3) or PackedPaths
+            The 3D points representing the motion paths, or the packed paths.
         """
-        if points:
-            data = np.concatenate(points, axis=0)
-            to_connect_list = []
-            offset = 0
-            for arr in points:
-                length = arr.shape[0]
-                to_connect = np.stack(
-                    [
-                        np.arange(offset, offset + length - 1, dtype=np.uint32),
-                        np.arange(offset + 1, offset + length, dtype=np.uint32),
-                    ],
-                    axis=1,
-                )
-                to_connect_list.append(to_connect)
-                offset += length
-            connect = np.concatenate(to_connect_list, axis=0)
+        if not isinstance(points, PackedPaths):
+            points = PackedPaths.from_list(points)
+        if points.vertices.shape[0] > 0:
+            data, connect = points
         else:
             data = np.empty((0, 3), dtype=np.float32)
             connect = "segments"
@@ -57,3 +80,11 @@ class PathsVisual(LineVisual):
 
 
 MotionPath = create_visual_node(PathsVisual)
+
+
+def set_paths_scale(node, scale: float):
+    """Scale the paths without updating the vertex buffer."""
+    if isinstance(tr := node.transform, STTransform):
+        tr.scale = (scale, scale, 1.0)
+    else:
+        node.transform = STTransform(scale=(scale, scale, 1.0))
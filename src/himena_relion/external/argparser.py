@@ -9,6 +9,7 @@ import inspect
 from himena_relion.consts import FileNames
 from himena_relion._job_dir import ExternalJobDirectory
 from himena_relion.external.job_class import pick_job_class
+from himena_relion.external.work_units import WorkUnitAborted
 
 
 class RelionExternalArgParser(argparse.ArgumentParser):
@@ -85,6 +86,7 @@ def run_function(argv: list[str] | None = None) -> None:
 
     job_dir = ExternalJobDirectory(o_dir)
     job = job_cls(job_dir)
+    job._nr_threads = max(int(args.get("j") or 1), 1)
     func_args = job._parse_args(args)
 
     # check if undefined arguments remain
@@ -114,18 +116,29 @@ def run_function(argv: list[str] | None = None) -> None:
                 next(iterator)
             except StopIteration:
                 break
+            except WorkUnitAborted:
+                _mark_aborted(o_dir)
+                raise
             except Exception:
                 o_dir.joinpath(FileNames.EXIT_FAILURE).touch()
                 raise
-            if (abort_now := o_dir.joinpath(FileNames.ABORT_NOW)).exists():
-                o_dir.joinpath(FileNames.EXIT_ABORTED).touch()
-                abort_now.unlink()
+            if o_dir.joinpath(FileNames.ABORT_NOW).exists():
+                iterator.close()
+                _mark_aborted(o_dir)
                 raise RuntimeError("Job aborted by user.")
     else:
         try:
             job.run(**func_args)
+        except WorkUnitAborted:
+            _mark_aborted(o_dir)
+            raise
         except Exception:
             o_dir.joinpath(FileNames.EXIT_FAILURE).touch()
             raise
     if o_dir.exists():
         o_dir.joinpath(FileNames.EXIT_SUCCESS).touch()
+
+
+def _mark_aborted(o_dir: Path):
+    o_dir.joinpath(FileNames.EXIT_ABORTED).touch()
+    o_dir.joinpath(FileNames.ABORT_NOW).unlink(missing_ok=True)
@@ -1,15 +1,16 @@
 from abc import abstractmethod
 import inspect
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Callable, Generator, Iterable, TypeVar
 from rich.console import Console
 from importlib import import_module
 from runpy import run_path
 
 from himena_relion import _job_dir
 from himena_relion._job_class import RelionJob
-from himena_relion.consts import ARG_NAME_REMAP
+from himena_relion.consts import ARG_NAME_REMAP, FileNames
 from himena_relion.external.writers import prep_job_star_external
+from himena_relion.external.work_units import run_work_units, WorkUnitAborted
 from himena_relion.schemas import JobStarModel
 
 
@@ -36,6 +37,9 @@ def pick_job_class(class_id: str) -> "type[RelionExternalJob] | None":
     return job_cls
 
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 # _SINGLE_FILE_JOB_CLASSES is needed for the case when the job class is defined in a
 # single .py file, which cannot be imported as a module.
 _SINGLE_FILE_JOB_CLASSES: "dict[str, type[RelionExternalJob]]" = {}
@@ -50,6 +54,7 @@ class RelionExternalJob(RelionJob):
     def __init__(self, output_job_dir: _job_dir.ExternalJobDirectory):
         super().__init__(output_job_dir)
         self._console = Console(record=True)
+        self._nr_threads = 1
         cls = type(self)
         if pick_job_class(self.import_path()) is not cls:
             raise ValueError(
@@ -66,6 +71,11 @@ class RelionExternalJob(RelionJob):
         """Get the output job directory object."""
         return self._output_job_dir
 
+    @property
+    def nr_threads(self) -> int:
+        """Number of threads given by the `--j` argument."""
+        return self._nr_threads
+
     @classmethod
     def command_palette_title_prefix(cls) -> str:
         return "RELION External:"
@@ -147,6 +157,55 @@ class RelionExternalJob(RelionJob):
     def run(self, *args, **kwargs) -> Generator[None, None, None]:
         """Run this job."""
 
+    def run_items(
+        self,
+        items: Iterable[_T],
+        func: Callable[[_T], _R],
+        *,
+        name: str = "items",
+        key: Callable[[_T], str] = str,
+        use_processes: bool = False,
+    ) -> Generator[None, None, list[_R]]:
+        """Run `func` for each item in parallel using `nr_threads` workers.
+
+        Finished items are recorded in the job directory and skipped when the job is
+        run again. Progress is logged as "Progress (<name>): <done>/<total>".
+
+        Examples
+        --------
+        ```python
+        def run(self, in_mics: IN_TILT):
+            tomo_names = ...
+            results = yield from self.run_items(tomo_names, process_one, name="tomo")
+        ```
+        """
+        return (
+            yield from run_work_units(
+                items,
+                func,
+                job_dir=self.output_job_dir.path,
+                name=name,
+                key=key,
+                nr_threads=self.nr_threads,
+                use_processes=use_processes,
+                console=self.console,
+                should_abort=self.abort_requested,
+            )
+        )
+
+    def abort_requested(self) -> bool:
+        """Return True if the user requested to abort this job."""
+        return self.output_job_dir.path.joinpath(FileNames.ABORT_NOW).exists()
+
+    def check_abort(self):
+        """Raise `WorkUnitAborted` if the user requested to abort this job.
+
+        Call this in the loop of a work unit function passed to `run_items`, so that
+        the job is aborted without waiting for the running items to finish.
+        """
+        if self.abort_requested():
+            raise WorkUnitAborted("Job aborted by user.")
+
     @classmethod
     def command_id(cls) -> str:
         """Get the command ID for this job."""
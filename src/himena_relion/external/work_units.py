@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from functools import partial
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+_PROGRESS_PATTERN = re.compile(
+    r"Progress \((?P<name>[^)]+)\): (?P<done>\d+)/(?P<total>\d+)"
+)
+
+
+class WorkUnitAborted(Exception):
+    """Raised when the job is aborted while running the work units."""
+
+
+def run_work_units(
+    items: Iterable[_T],
+    func: Callable[[_T], _R],
+    *,
+    job_dir: Path,
+    name: str = "items",
+    key: Callable[[_T], str] = str,
+    nr_threads: int = 1,
+    use_processes: bool = False,
+    console: Console | None = None,
+    should_abort: Callable[[], bool] | None = None,
+) -> Generator[None, None, list[_R]]:
+    """Run `func` for each item, skipping the items finished in previous runs.
+
+    This is a generator that yields every time an item is finished, so that the job
+    can be aborted in between. The return value is the list of results in the same
+    order as `items`. Results must be JSON serializable, as they are recorded in the
+    job directory for resuming.
+
+    Parameters
+    ----------
+    items : iterable
+        Work units to process, such as tomograms or micrographs.
+    func : callable
+        Function called for each item. Must be picklable if `use_processes` is True.
+    job_dir : Path
+        Job directory where the completion records are saved.
+    name : str, default "items"
+        Name of this set of work units, used for the record file and progress log.
+    key : callable, default str
+        Function that returns a unique string identifier of an item.
+    nr_threads : int, default 1
+        Number of parallel workers. If 1, items are processed in the current thread.
+    use_processes : bool, default False
+        If True, use a process pool instead of a thread pool.
+    console : Console, optional
+        Console to which the progress is logged.
+    should_abort : callable, optional
+        Function that returns True if the job is aborted. It is checked before each
+        item is started, and `WorkUnitAborted` is raised if True. Long-running `func`
+        should also check it, so that the running items stop early.
+    """
+    items = list(items)
+    keys = [key(item) for item in items]
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"Work unit keys of {name!r} are not unique.")
+    record_path = work_unit_record_path(job_dir, name)
+    finished = read_work_unit_records(record_path)
+    results: dict[str, Any] = {k: finished[k] for k in keys if k in finished}
+    todo = [(k, item) for k, item in zip(keys, items) if k not in results]
+    total = len(items)
+
+    def _log_progress():
+        if console is not None:
+            console.log(f"Progress ({name}): {len(results)}/{total}")
+
+    if results:
+        _log_progress()
+    with open(record_path, "a", encoding="utf-8") as record:
+
+        def _finish(k: str, result: Any):
+            record.write(json.dumps({"key": k, "result": result}) + "\n")
+            record.flush()
+            results[k] = result
+            _log_progress()
+
+        if should_abort is not None:
+            func = partial(_run_unless_aborted, func, should_abort)
+        if nr_threads <= 1 or len(todo) <= 1:
+            for k, item in todo:
+                _finish(k, func(item))
+                yield
+        else:
+            pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor: Executor = pool_cls(max_workers=min(nr_threads, len(todo)))
+            try:
+                futures: dict[Future, str] = {
+                    executor.submit(func, item): k for k, item in todo
+                }
+                for future in as_completed(futures):
+                    _finish(futures[future], future.result())
+                    yield
+            finally:
+                # Also called on failure or abort (GeneratorExit). Pending items are
+                # cancelled, and the running items stop at their next abort check.
+                executor.shutdown(wait=True, cancel_futures=True)
+    return [results[k] for k in keys]
+
+
+def _run_unless_aborted(
+    func: Callable[[_T], _R], should_abort: Callable[[], bool], item: _T
+) -> _R:
+    if should_abort():
+        raise WorkUnitAborted("Job aborted by user.")
+    return func(item)
+
+
+def work_unit_record_path(job_dir: Path, name: str) -> Path:
+    """Path to the file that records the finished work units."""
+    return Path(job_dir) / f".work_units_{name}.jsonl"
+
+
+def read_work_unit_records(path: Path) -> dict[str, Any]:
+    """Read the finished work units and their results from the record file."""
+    out: dict[str, Any] = {}
+    if not path.exists():
+        return out
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # interrupted while writing
+            out[record["key"]] = record["result"]
+    return out
+
+
+def parse_progress(line: str) -> tuple[str, int, int] | None:
+    """Parse a progress line written by `run_work_units`.
+
+    Returns the (name, done, total) tuple, or None if the line is not a progress line.
+    """
+    if match := _PROGRESS_PATTERN.search(line):
+        return match["name"], int(match["done"]), int(match["total"])
+    return None
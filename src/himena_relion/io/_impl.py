@@ -13,7 +13,7 @@ from himena_relion._configs import get_relion_pipeliner_exe
 from himena_relion._utils import (
     normalize_job_id,
     open_with_lock,
-    update_default_pipeline,
+    PipelineWriter,
 )
 from himena_relion.schemas._pipeline import RelionPipelineModel
 
@@ -85,6 +85,7 @@ def harsh_clean_relion_job(ui: MainWindow, job_dir: JobDirectory):
 
 def abort_relion_job(ui: MainWindow, job_dir: JobDirectory):
     """Abort this RELION job."""
+    job_dir.refresh()
     if job_dir.state() == RelionJobState.EXIT_SUCCESS:
         raise RuntimeError("Cannot abort a finished job.")
     if ui.exec_choose_one_dialog(
@@ -138,22 +139,21 @@ def set_job_alias(ui: MainWindow, job_dir: JobDirectory):
     """Set alias for this RELION job."""
     from himena_relion._widgets._main import QRelionJobWidget
 
-    with open_with_lock(job_dir.relion_project_dir / "default_pipeline.star") as f:
-        pipeline = RelionPipelineModel.validate_text(f.read())
-        # look for current alias
-        _matched = pipeline.processes.process_name == job_dir.job_normal_id()
-        matched = pipeline.processes.alias.filter(_matched)
-        if len(matched) == 1:
-            current_alias = matched[0]
-            if current_alias == "None":
-                current_alias = ""
-            elif "/" in current_alias:
-                # alias is something like "Extract/extract_bin4/"
-                current_alias = current_alias.split("/")[1]
-        else:
+    rln_dir = job_dir.relion_project_dir
+    pipeline = RelionPipelineModel.validate_file(rln_dir / "default_pipeline.star")
+    # look for current alias
+    _matched = pipeline.processes.process_name == job_dir.job_normal_id()
+    matched = pipeline.processes.alias.filter(_matched)
+    if len(matched) == 1:
+        current_alias = matched[0]
+        if current_alias == "None":
             current_alias = ""
+        elif "/" in current_alias:
+            # alias is something like "Extract/extract_bin4/"
+            current_alias = current_alias.split("/")[1]
+    else:
+        current_alias = ""
 
-    # This part waits for the user input, so temporarily exit from the lock context.
     res = ui.exec_user_string_input_dialog(
         message="Give alias here ...",
         choices=["Press 'Enter' to set job alias"],
@@ -174,19 +174,18 @@ def set_job_alias(ui: MainWindow, job_dir: JobDirectory):
     if (job_dir.path.parent / alias).exists():
         raise FileExistsError(f"Alias '{alias}' already exists.")
 
-    with open_with_lock(job_dir.relion_project_dir / "default_pipeline.star") as f:
-        new_path = job_dir.path.parent / alias
-        for other_job in job_dir.path.parent.iterdir():
-            if other_job.is_symlink() and other_job.resolve() == job_dir.path:
-                # this is the old alias for this job
-                other_job.rename(new_path)
-                break
-        else:
-            # no existing alias, create a new one
-            new_path.symlink_to(job_dir.path, target_is_directory=True)
-        update_default_pipeline(
-            f,
-            job_dir.path.relative_to(job_dir.relion_project_dir),
+    new_path = job_dir.path.parent / alias
+    for other_job in job_dir.path.parent.iterdir():
+        if other_job.is_symlink() and other_job.resolve() == job_dir.path:
+            # this is the old alias for this job
+            other_job.rename(new_path)
+            break
+    else:
+        # no existing alias, create a new one
+        new_path.symlink_to(job_dir.path, target_is_directory=True)
+    with PipelineWriter(rln_dir / "default_pipeline.star") as writer:
+        writer.set_alias(
+            job_dir.path.relative_to(rln_dir).as_posix(),
             alias=normalize_job_id(new_path),
         )
     # update the job widget title
@@ -204,111 +203,82 @@ def trash_job(ui: MainWindow, job_dir: JobDirectory):
 
     rln_dir = job_dir.relion_project_dir
 
-    with open_with_lock(rln_dir / "default_pipeline.star") as f:
-        pipeline = RelionPipelineModel.validate_text(f.read())
-        input_indices_to_remove: list[bool] = []
-        # to_trash is all the relative paths to be moved to trash
-        to_trash = [job_dir.path.relative_to(rln_dir)]
-        for from_, to_ in zip(
-            pipeline.input_edges.from_node, pipeline.input_edges.process
+    # The pipeline is read without the lock, because the user is asked to confirm.
+    # PipelineWriter takes care of the changes by others in the meantime.
+    pipeline = RelionPipelineModel.validate_file(rln_dir / "default_pipeline.star")
+    # to_trash is all the relative paths to be moved to trash
+    to_trash = [job_dir.path.relative_to(rln_dir)]
+    for from_, to_ in zip(pipeline.input_edges.from_node, pipeline.input_edges.process):
+        job_spec = Path(to_)
+        if (
+            (Path(from_).parent in to_trash or job_spec in to_trash)
+            and not job_spec.is_absolute()
+            and len(job_spec.parts) == 2
+            and job_spec not in to_trash[::-1]  # faster to search backwards
         ):
-            job_spec = Path(to_)
-            if Path(from_).parent in to_trash or job_spec in to_trash:
-                if (
-                    not job_spec.is_absolute()
-                    and len(job_spec.parts) == 2
-                    and job_spec not in to_trash[::-1]  # faster to search backwards
-                ):
-                    to_trash.append(job_spec)
-                input_indices_to_remove.append(True)
-            else:
-                input_indices_to_remove.append(False)
-
-        input_indices_to_remove = pl.Series(input_indices_to_remove)
-        output_edges_to_remove = pl.Series(
-            [Path(from_) in to_trash for from_ in pipeline.output_edges.process]
-        )
+            to_trash.append(job_spec)
 
-        resp = ui.exec_choose_one_dialog(
-            title="Trash job?",
-            message=_html_list("Following jobs would be moved to trash:", to_trash),
-            choices=[("Yes, move to trash", True), ("Cancel", False)],
-        )
-        if resp is None or not resp:
-            raise Cancelled
-
-        # determine other fields to remove
-        process_name_to_remove = pl.Series(
-            [Path(name) in to_trash for name in pipeline.processes.process_name]
-        )
-
-        # pipeline.nodes.name is e.g. Extract/job010/particles.star
-        process_nodes_to_remove = pl.Series(
-            [Path(name).parent in to_trash for name in pipeline.nodes.name]
-        )
-
-        output_edges_trashed = pipeline.output_edges.dataframe.filter(
-            output_edges_to_remove
-        )
-        nodes_trashed = pipeline.nodes.dataframe.filter(process_nodes_to_remove)
-
-        pipeline.processes = pipeline.processes.dataframe.filter(
-            ~process_name_to_remove
-        )
-        pipeline.nodes = pipeline.nodes.dataframe.filter(~process_nodes_to_remove)
-        pipeline.input_edges = pipeline.input_edges.dataframe.filter(
-            ~input_indices_to_remove
-        )
-        pipeline.output_edges = pipeline.output_edges.dataframe.filter(
-            ~output_edges_to_remove
-        )
-
-        # close all the tabs with trashed jobs
-        try:
-            tabs_to_close: list[int] = []
-            for i_tab, tab in ui.tabs.enumerate():
-                if (
-                    len(tab) > 0
-                    and isinstance(_job_dir := tab[0].value, JobDirectory)
-                    and _job_dir.path.relative_to(rln_dir) in to_trash
-                ):
-                    tabs_to_close.append(i_tab)
-            for i_tab in reversed(tabs_to_close):
-                del ui.tabs[i_tab]
-        except Exception:
-            _LOGGER.warning("Failed to close tabs for trashed jobs.", exc_info=True)
+    resp = ui.exec_choose_one_dialog(
+        title="Trash job?",
+        message=_html_list("Following jobs would be moved to trash:", to_trash),
+        choices=[("Yes, move to trash", True), ("Cancel", False)],
+    )
+    if resp is None or not resp:
+        raise Cancelled
 
-        f.seek(0)
-        f.truncate(0)
-        f.write(pipeline.to_string())
+    # pipeline.nodes.name is e.g. Extract/job010/particles.star
+    output_edges_trashed = pipeline.output_edges.dataframe.filter(
+        pl.Series([Path(from_) in to_trash for from_ in pipeline.output_edges.process])
+    )
+    nodes_trashed = pipeline.nodes.dataframe.filter(
+        pl.Series([Path(name).parent in to_trash for name in pipeline.nodes.name])
+    )
 
-        # move the job to trash
-        trash_dir = _trash_dir(rln_dir)
-        trash_dir.mkdir(exist_ok=True)
-        for p in to_trash:
-            src = rln_dir / p
-            if not src.exists():
-                _LOGGER.warning(f"Source {src} does not exist. Skipping.")
-                continue
-            dest = trash_dir / p
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            if dest.exists():
-                _LOGGER.warning(f"Destination {dest} already exists. Overwriting.")
-                _remove_dir_or_file(dest)
-            src.rename(dest)
-
-        # remove nodes from directories like .Nodes/DensityMap/Reconstruct/job060
-        node_to_type_map = _make_node_to_type_map(nodes_trashed)
-        to_node_list = output_edges_trashed["rlnPipeLineEdgeToNode"]
-        for to_node in to_node_list:
-            if type_label := node_to_type_map.get(to_node):
-                file_in_node = rln_dir.joinpath(".Nodes", type_label, to_node)
-                if file_in_node.exists():
-                    file_in_node.unlink()
-                # remove directory if empty
-                node_dir = file_in_node.parent
-                if node_dir.exists() and not any(node_dir.iterdir()):
-                    node_dir.rmdir()
+    # close all the tabs with trashed jobs
+    try:
+        tabs_to_close: list[int] = []
+        for i_tab, tab in ui.tabs.enumerate():
+            if (
+                len(tab) > 0
+                and isinstance(_job_dir := tab[0].value, JobDirectory)
+                and _job_dir.path.relative_to(rln_dir) in to_trash
+            ):
+                tabs_to_close.append(i_tab)
+        for i_tab in reversed(tabs_to_close):
+            del ui.tabs[i_tab]
+    except Exception:
+        _LOGGER.warning("Failed to close tabs for trashed jobs.", exc_info=True)
+
+    with PipelineWriter(rln_dir / "default_pipeline.star") as writer:
+        writer.remove_jobs(p.as_posix() for p in to_trash)
+
+    # move the job to trash
+    trash_dir = _trash_dir(rln_dir)
+    trash_dir.mkdir(exist_ok=True)
+    for p in to_trash:
+        src = rln_dir / p
+        if not src.exists():
+            _LOGGER.warning(f"Source {src} does not exist. Skipping.")
+            continue
+        dest = trash_dir / p
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            _LOGGER.warning(f"Destination {dest} already exists. Overwriting.")
+            _remove_dir_or_file(dest)
+        src.rename(dest)
+
+    # remove nodes from directories like .Nodes/DensityMap/Reconstruct/job060
+    node_to_type_map = _make_node_to_type_map(nodes_trashed)
+    to_node_list = output_edges_trashed["rlnPipeLineEdgeToNode"]
+    for to_node in to_node_list:
+        if type_label := node_to_type_map.get(to_node):
+            file_in_node = rln_dir.joinpath(".Nodes", type_label, to_node)
+            if file_in_node.exists():
+                file_in_node.unlink()
+            # remove directory if empty
+            node_dir = file_in_node.parent
+            if node_dir.exists() and not any(node_dir.iterdir()):
+                node_dir.rmdir()
 
     rln_dir.joinpath("default_pipeline.star").touch()
 
@@ -417,32 +387,32 @@ def new_job(ui: MainWindow, ignore_cancelled: bool = False):
 
 def mark_as_finished(job_dir: JobDirectory):
     """Mark this RELION job as finished."""
-    with open_with_lock(job_dir.relion_project_dir / "default_pipeline.star") as f:
-        update_default_pipeline(f, normalize_job_id(job_dir.path), state="Succeeded")
-        job_dir.path.joinpath(FileNames.EXIT_SUCCESS).touch(exist_ok=True)
-        for fname in [
-            FileNames.EXIT_ABORTED,
-            FileNames.EXIT_FAILURE,
-            FileNames.ABORT_NOW,
-        ]:
-            path = job_dir.path / fname
-            if path.exists():
-                path.unlink()
+    with PipelineWriter(job_dir.relion_project_dir / "default_pipeline.star") as writer:
+        writer.set_state(normalize_job_id(job_dir.path), "Succeeded")
+    job_dir.path.joinpath(FileNames.EXIT_SUCCESS).touch(exist_ok=True)
+    for fname in [
+        FileNames.EXIT_ABORTED,
+        FileNames.EXIT_FAILURE,
+        FileNames.ABORT_NOW,
+    ]:
+        path = job_dir.path / fname
+        if path.exists():
+            path.unlink()
 
 
 def mark_as_failed(job_dir: JobDirectory):
     """Mark this RELION job as failed."""
-    with open_with_lock(job_dir.relion_project_dir / "default_pipeline.star") as f:
-        update_default_pipeline(f, normalize_job_id(job_dir.path), state="Failed")
-        job_dir.path.joinpath(FileNames.EXIT_FAILURE).touch(exist_ok=True)
-        for fname in [
-            FileNames.EXIT_ABORTED,
-            FileNames.EXIT_SUCCESS,
-            FileNames.ABORT_NOW,
-        ]:
-            path = job_dir.path / fname
-            if path.exists():
-                path.unlink()
+    with PipelineWriter(job_dir.relion_project_dir / "default_pipeline.star") as writer:
+        writer.set_state(normalize_job_id(job_dir.path), "Failed")
+    job_dir.path.joinpath(FileNames.EXIT_FAILURE).touch(exist_ok=True)
+    for fname in [
+        FileNames.EXIT_ABORTED,
+        FileNames.EXIT_SUCCESS,
+        FileNames.ABORT_NOW,
+    ]:
+        path = job_dir.path / fname
+        if path.exists():
+            path.unlink()
 
 
 def _trash_dir(relion_job_dir: Path) -> Path:
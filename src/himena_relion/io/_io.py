@@ -8,13 +8,12 @@ from himena import StandardType, WidgetDataModel, create_image_model
 from himena.standards.model_meta import DimAxis
 from himena.plugins import register_reader_plugin
 from himena_relion.consts import Type
+from himena_relion._configs import get_lazy_read_threshold
 
 
 @register_reader_plugin(priority=0, module="himena_relion.io")
 def read_density_map(path: Path) -> WidgetDataModel:
-    with mrcfile.open(path) as mrc:
-        arr = np.asarray(mrc.data)
-        voxel_size = mrc.voxel_size
+    arr, voxel_size = _read_mrc_array(path)
     axes = [
         DimAxis(name="z", scale=voxel_size.z, unit="Å"),
         DimAxis(name="y", scale=voxel_size.y, unit="Å"),
@@ -36,9 +35,7 @@ def _(path: Path):
 
 @register_reader_plugin(priority=10, module="himena_relion.io")
 def read_mrcs(path: Path) -> WidgetDataModel:
-    with mrcfile.open(path) as mrc:
-        arr = np.asarray(mrc.data)
-        voxel_size = mrc.voxel_size
+    arr, voxel_size = _read_mrc_array(path)
     return create_image_model(
         arr,
         axes=_prep_3d_axes(voxel_size),
@@ -61,9 +58,7 @@ def read_mrc(path: Path) -> WidgetDataModel:
         # Likely a 3D map
         return read_density_map(path)
 
-    with mrcfile.open(path) as mrc:
-        arr = np.asarray(mrc.data)
-        voxel_size = mrc.voxel_size
+    arr, voxel_size = _read_mrc_array(path)
     if arr.ndim == 4:
         axes = [DimAxis(name="t")] + _prep_3d_axes(voxel_size)
     elif arr.ndim == 3:
@@ -171,3 +166,30 @@ def _prep_3d_axes(voxel_size: np.recarray) -> list[DimAxis]:
         DimAxis(name="y", scale=voxel_size.y, unit="Å"),
         DimAxis(name="x", scale=voxel_size.x, unit="Å"),
     ]
+
+
+def _read_mrc_array(path: Path) -> tuple[np.ndarray, np.recarray]:
+    """Read the MRC data, memory-mapped if the file is larger than the threshold."""
+    path = Path(path)
+    if path.suffix != ".gz" and path.stat().st_size > get_lazy_read_threshold():
+        return read_mrc_lazy(path)
+    with mrcfile.open(path) as mrc:
+        arr = np.asarray(mrc.data)
+        voxel_size = mrc.voxel_size
+    return arr, voxel_size
+
+
+def read_mrc_lazy(path: Path) -> tuple[np.memmap, np.recarray]:
+    """Read an MRC file as a memory-mapped array.
+
+    Only the header is read here. Shape, dtype and voxel size are determined from the
+    header, and the data is loaded from the disk when the array is sliced.
+    """
+    with mrcfile.open(path, header_only=True) as mrc:
+        header = mrc.header
+        dtype = mrcfile.utils.data_dtype_from_header(header)
+        shape = mrcfile.utils.data_shape_from_header(header)
+        offset = header.nbytes + int(header.nsymbt)
+        voxel_size = mrc.voxel_size
+    arr = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    return arr, voxel_size
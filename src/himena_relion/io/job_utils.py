@@ -217,6 +217,46 @@ def open_trash_directory(ui: MainWindow):
         ui.show_notification("No RELION project is currently open.")
 
 
+@register_function(
+    menus=[MenuId.RELION],
+    title="Job Widget Memory Usage",
+    command_id="himena-relion:job-widget-memory-usage",
+)
+def show_job_widget_memory_usage(ui: MainWindow):
+    """Show the memory used by the images and meshes of the opened job widgets."""
+    from himena_relion._widgets._memory import QMemoryBudgetPanel
+
+    for dock in ui.dock_widgets:
+        if isinstance(panel := dock.widget, QMemoryBudgetPanel):
+            panel.refresh()
+            dock.show()
+            return
+    ui.add_dock_widget(QMemoryBudgetPanel(), title="Job Memory Usage", area="right")
+
+
+@register_function(
+    menus=[MenuId.RELION],
+    title="Clear Image Cache",
+    command_id="himena-relion:clear-image-cache",
+)
+def clear_image_cache(ui: MainWindow):
+    """Remove all the cached volumes in the cache directory."""
+    from himena_relion._image_readers._cache import clear_cache_dir
+    from himena_relion._configs import get_cache_dir
+
+    if not (cache_dir := get_cache_dir()):
+        raise ValueError("Cache directory is not set.")
+    answer = ui.exec_choose_one_dialog(
+        title="Clear image cache",
+        message=f"Remove all the cached volumes in {cache_dir}?",
+        choices=["Remove", "Cancel"],
+    )
+    if answer != "Remove":
+        return
+    removed = clear_cache_dir()
+    ui.show_notification(f"Removed {removed / 1024**2:.1f} MB of cache files.")
+
+
 def assert_job(model: WidgetDataModel) -> JobDirectory:
     from himena_relion._job_dir import JobDirectory
 
@@ -10,7 +10,7 @@ from qtpy import QtGui, QtWidgets as QtW, QtCore
 from cmap import Color
 from superqt import QElidingLabel
 from superqt.utils import thread_worker, GeneratorWorker
-from watchfiles import watch, Change
+from watchfiles import Change
 
 from himena import MainWindow, WidgetDataModel
 from himena.plugins import validate_protocol
@@ -320,7 +320,7 @@ class QRelionPipelineFlowChart(QtW.QWidget):
     @thread_worker(start_thread=True)
     def _watch_default_pipeline_star(self, path: Path):
         """Watch the job directory for changes."""
-        for changes in watch(path, rust_timeout=400, yield_on_timeout=True):
+        for changes in _utils.watch_file(path, rust_timeout=400, yield_on_timeout=True):
             if self._watcher is None:
                 _LOGGER.info("Pipeline watcher stopped.")
                 return  # stopped
@@ -711,8 +711,8 @@ class QRelionPipelineFlowChart(QtW.QWidget):
 
         path = self._relion_project_dir / "default_pipeline.star"
         job_id = _utils.normalize_job_id(job_id)
-        with _utils.open_with_lock(path) as f:
-            _utils.replace_input_edges(f, job_id)
+        with _utils.PipelineWriter(path) as writer:
+            writer.replace_input_edges(job_id)
         execute_job(job_id, cwd=self._relion_project_dir)
 
 
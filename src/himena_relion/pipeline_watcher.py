@@ -10,8 +10,8 @@ import subprocess
 import logging
 import time
 import warnings
-from watchfiles import watch, Change
-from himena_relion._utils import normalize_job_id, wait_for_file
+from watchfiles import Change
+from himena_relion._utils import normalize_job_id, wait_for_file, watch_file
 from himena_relion._configs import get_relion_pipeliner_exe
 from himena_relion import _job_dir
 
@@ -40,7 +40,7 @@ class RelionPipelineWatcher:
         with self._acquire_lock():
             pipeline = RelionDefaultPipeline.from_pipeline_star(path)
             self._on_job_state_changed(pipeline)
-            for changes in watch(path, rust_timeout=400, yield_on_timeout=True):
+            for changes in watch_file(path, rust_timeout=400, yield_on_timeout=True):
                 if not self._lock_file_path().exists():
                     break
                 for change, fp in changes:
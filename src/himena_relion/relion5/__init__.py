@@ -1,4 +1,5 @@
-from himena_relion.relion5 import widgets, _builtins, _connections, _continues
+from himena_relion import _impl_objects
+from himena_relion.relion5 import _builtins, _connections, _continues
 from himena_relion.relion5.extensions import (
     SymmetryExpansionJob,
     HelicalSymmetryExpansionJob,
@@ -7,7 +8,12 @@ from himena_relion.relion5.extensions import (
     ManualMaskCreation,
 )
 
-del widgets, _builtins, _connections, _continues
+if not _impl_objects.IS_HEADLESS:
+    from himena_relion.relion5 import widgets
+
+    del widgets
+
+del _impl_objects, _builtins, _connections, _continues
 
 __all__ = [
     "SymmetryExpansionJob",
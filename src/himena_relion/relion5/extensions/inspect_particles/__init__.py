@@ -1,4 +1,12 @@
 from .jobs import InspectParticlesSPA
-from .widgets import InspectParticlesSPAWidget
 
 __all__ = ["InspectParticlesSPA", "InspectParticlesSPAWidget"]
+
+
+def __getattr__(name: str):
+    # widgets are imported on demand so that jobs can run without Qt
+    if name == "InspectParticlesSPAWidget":
+        from .widgets import InspectParticlesSPAWidget
+
+        return InspectParticlesSPAWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
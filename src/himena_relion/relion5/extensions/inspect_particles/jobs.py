@@ -1,9 +1,6 @@
 from himena_relion.consts import MenuId
 from himena_relion.external import RelionExternalJob
 from himena_relion._annotated.io import IN_PARTICLES, IN_MICROGRAPHS
-from himena_relion.relion5.extensions.inspect_particles.widgets import (
-    InspectParticlesSPAWidget,
-)
 
 
 class InspectParticlesSPA(RelionExternalJob):
@@ -39,4 +36,6 @@ class InspectParticlesSPA(RelionExternalJob):
         out_parts.write_bytes(out_job_dir.resolve_path(in_parts).read_bytes())
 
     def provide_widget(self, job_dir):
+        from .widgets import InspectParticlesSPAWidget
+
         return InspectParticlesSPAWidget(job_dir)
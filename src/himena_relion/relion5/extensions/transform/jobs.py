@@ -1,13 +1,13 @@
-import subprocess
 from typing import Annotated
 import mrcfile
 import numpy as np
+from starfile_rs import read_star
 
 from himena_relion._job_class import connect_jobs
+from himena_relion._transform import center_of_mass, shift_origins
 from himena_relion.consts import MenuId
 from himena_relion.external import RelionExternalJob
 from himena_relion._annotated.io import IN_PARTICLES, MAP_TYPE, IN_MASK
-from himena_relion.relion5.extensions.transform import widgets as _wdg
 from himena_relion.relion5._builtins import Refine3DJob
 from . import _const as _c
 from scipy import ndimage as ndi
@@ -109,7 +109,9 @@ class ShiftMapJob(RelionExternalJob):
             )
 
     def provide_widget(self, job_dir):
-        return _wdg.QShiftMapViewer(job_dir)
+        from .widgets import QShiftMapViewer
+
+        return QShiftMapViewer(job_dir)
 
     @classmethod
     def setup_widgets(cls, widgets):
@@ -125,9 +127,9 @@ def _center_by_com(
     path,
 ) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
     img, img_scale = _read_image(path)
-    com = _img_center_of_mass(img)
-    center = tuple((s - 1) / 2 for s in img.shape)
-    out_pix = tuple(float(cm - c) for c, cm in zip(center, com))
+    com_zyx = center_of_mass(img)
+    center_zyx = tuple((s - 1) / 2 for s in img.shape)
+    out_pix = tuple(float(cm - c) for c, cm in zip(center_zyx, com_zyx))[::-1]
     out_angst = tuple(d * img_scale for d in out_pix)
     return out_pix, out_angst
 
@@ -145,44 +147,16 @@ def _shift_image(path_in, path_out, shift_pix):
 
 
 def _shift_star(path_in, path_out, shift_ang):
-    """Use relion_star_handler to shift the particle coordinates.
+    """Shift the particle origins so that the particles are centered at `shift_ang`.
 
-    Note that relion_star_handler uses the optics block in the input star file to
-    determine the pixel size, but this causes confusion when the scale of particle
-    images and the input map are different. Therefore, we set the pixel size to 1 and
-    directly specify the shift in angstroms, along with the `--ignore_optics` option to
-    ignore the optics block.
+    This is equivalent to `relion_star_handler --center`, with the shift specified in
+    angstroms. The optics block is not used, because the scale of particle images and
+    the input map may differ.
     """
-    args_star = [
-        _c.RELION_STAR_HANDLER,
-        "--i",
-        str(path_in),
-        "--o",
-        str(path_out),
-        "--center",
-        "--center_X",
-        str(-shift_ang[0]),
-        "--center_Y",
-        str(-shift_ang[1]),
-        "--center_Z",
-        str(-shift_ang[2]),
-        "--angpix",
-        "1",
-        "--ignore_optics",
-    ]
-    subprocess.run(args_star, check=True)
-
-
-def _img_center_of_mass(img: np.ndarray) -> tuple[float, float, float]:
-    """Calculate the center of mass (X, Y, Z) of the image."""
-    total = img.sum()
-    if total == 0:
-        return (0.0, 0.0, 0.0)
-    z, y, x = np.indices(img.shape)
-    com_z = (z * img).sum() / total
-    com_y = (y * img).sum() / total
-    com_x = (x * img).sum() / total
-    return (float(com_x), float(com_y), float(com_z))
+    star = read_star(path_in)
+    particles = star["particles"].trust_loop().to_polars()
+    star.with_loop_block("particles", shift_origins(particles, shift_ang))
+    star.write(path_out)
 
 
 def _read_image(path) -> tuple[np.ndarray, float]:
@@ -8,13 +8,12 @@ from typing import Annotated
 import mrcfile
 import numpy as np
 
-from himena.qt.magicgui import ToggleButtons
 from himena_relion._job_class import connect_jobs
 from himena_relion.consts import MenuId
 from himena_relion.external import RelionExternalJob
 from himena_relion._utils import relion_python_executable
 from himena_relion._annotated.io import MAP_TYPE
-from himena_relion.relion5.extensions.volume_tools.widgets import QMaskCreateViewer
+from himena_relion._annotated._widget_types import ToggleButtons
 from himena_relion.relion5._connections import mask_create_search_halfmap
 from himena_relion.relion5 import _builtins as _spa
 
@@ -100,16 +99,10 @@ class ManualMaskCreation(RelionExternalJob):
             },
         ] = 0.5,
     ):
-        from scipy import ndimage as ndi
-
         out_job_dir = self.output_job_dir
         mask_path = out_job_dir.path / "mask.mrc"
         mask_base_path = out_job_dir.path / "mask_base.mrc"
-        if blur_method == "Cosine":
-            fn_blur = _blur_cos
-        elif blur_method == "Gaussian":
-            fn_blur = _blur_gaussian
-        else:
+        if blur_method not in _BLUR_FUNCS:
             raise ValueError(f"Unknown blur method: {blur_method}")
 
         input_path = out_job_dir.resolve_path(in_3dref).as_posix()
@@ -155,19 +148,12 @@ class ManualMaskCreation(RelionExternalJob):
             with mrcfile.open(mask_base_path) as mrc:
                 mask_data = mrc.data
                 scale = mrc.voxel_size.x
-            mask_data = mask_data > threshold
-            if dilate_pixels > 0:
-                mask_data = ndi.binary_dilation(
-                    mask_data, _make_footprint(dilate_pixels)
-                )
-            elif dilate_pixels < 0:
-                mask_data = ndi.binary_erosion(
-                    mask_data, _make_footprint(-dilate_pixels)
-                )
-            dist = ndi.distance_transform_edt(~mask_data)
-            dist_scaled = dist / (soft_edge / scale)
-
-            blurred_mask = fn_blur(dist_scaled)
+            blurred_mask = soft_edge_mask(
+                mask_data > threshold,
+                dilate_pixels=dilate_pixels,
+                edge_pixels=soft_edge / scale,
+                method=blur_method,
+            )
             with mrcfile.new(mask_path, overwrite=True) as mrc:
                 mrc.set_data(blurred_mask)
                 mrc.voxel_size = (scale, scale, scale)
@@ -178,28 +164,86 @@ class ManualMaskCreation(RelionExternalJob):
             )
 
     def provide_widget(self, job_dir):
+        from .widgets import QMaskCreateViewer
+
         return QMaskCreateViewer(job_dir)
 
 
-def _make_footprint(radius: float):
-    size = int(np.ceil(radius) * 2) + 1
-    zz, yy, xx = np.indices((size, size, size), dtype=np.float32)
-    center = size // 2
-    distances = np.sqrt((zz - center) ** 2 + (yy - center) ** 2 + (xx - center) ** 2)
-    return distances <= radius
+def soft_edge_mask(
+    mask: np.ndarray,
+    dilate_pixels: int = 0,
+    edge_pixels: float = 1.0,
+    method: str = "Cosine",
+) -> np.ndarray:
+    """Dilate (or erode) the binary mask and add a soft edge to it.
 
+    The mask density is 0.5 at `edge_pixels` from the (dilated) mask boundary. All
+    the calculation is done in the bounding box of the mask extended by the dilation
+    and the edge width, because the mask density is zero outside of it.
+    """
+    from scipy import ndimage as ndi
 
-def _blur_cos(dist_scaled):
-    return (
-        np.cos(np.clip(dist_scaled * np.pi / 2, 0, np.pi)).astype(np.float32) + 1
-    ) / 2
+    blur_func, extent = _BLUR_FUNCS[method]
+    out = np.zeros(mask.shape, dtype=np.float32)
+    margin = max(dilate_pixels, 0) + int(np.ceil(extent * edge_pixels)) + 1
+    if (sl := _bounding_box(mask, margin)) is None:
+        return out
+    crop = mask[sl]
+    # Dilation/erosion by a ball is a threshold of the distance transform, which is
+    # separable and much faster than the dilation by a spherical footprint.
+    if dilate_pixels > 0:
+        crop = ndi.distance_transform_edt(~crop) <= dilate_pixels
+    elif dilate_pixels < 0:
+        # pad to regard the outside of the image as background
+        dist = ndi.distance_transform_edt(np.pad(crop, 1))
+        crop = dist[(slice(1, -1),) * crop.ndim] > -dilate_pixels
+        if not crop.any():
+            return out
+    dist = ndi.distance_transform_edt(~crop).astype(np.float32)
+    dist /= edge_pixels
+    out[sl] = blur_func(dist)
+    return out
 
 
-def _blur_gaussian(dist_scaled):
+def _bounding_box(mask: np.ndarray, margin: int) -> tuple[slice, ...] | None:
+    """Bounding box of the True region extended by `margin`, or None if empty."""
+    slices: list[slice] = []
+    for axis in range(mask.ndim):
+        other_axes = tuple(i for i in range(mask.ndim) if i != axis)
+        indices = np.flatnonzero(np.any(mask, axis=other_axes))
+        if indices.size == 0:
+            return None
+        start = max(int(indices[0]) - margin, 0)
+        stop = min(int(indices[-1]) + margin + 1, mask.shape[axis])
+        slices.append(slice(start, stop))
+    return tuple(slices)
+
+
+def _blur_cos(dist_scaled: np.ndarray) -> np.ndarray:
+    """Raised cosine edge, calculated in place."""
+    dist_scaled *= np.pi / 2
+    np.clip(dist_scaled, 0, np.pi, out=dist_scaled)
+    np.cos(dist_scaled, out=dist_scaled)
+    dist_scaled += 1
+    dist_scaled /= 2
+    return dist_scaled
+
+
+def _blur_gaussian(dist_scaled: np.ndarray) -> np.ndarray:
+    """Gaussian edge, calculated in place."""
     sigma = 1.0 / np.sqrt(2 * np.log(2))
-    return np.exp(-(dist_scaled**2) / (2 * sigma**2), dtype=np.float32).astype(
-        np.float32
-    )
+    dist_scaled *= dist_scaled
+    dist_scaled *= -1 / (2 * sigma**2)
+    np.exp(dist_scaled, out=dist_scaled)
+    return dist_scaled
+
+
+# blur function and the scaled distance beyond which the mask density is zero in
+# float32 (exp(-x) underflows for x > 104)
+_BLUR_FUNCS = {
+    "Cosine": (_blur_cos, 2.0),
+    "Gaussian": (_blur_gaussian, 12.5),
+}
 
 
 def _find_chimera_exec() -> str | None:
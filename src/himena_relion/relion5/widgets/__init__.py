@@ -1,39 +1,47 @@
-from himena_relion.relion5.widgets import (
-    _frames,
-    _import_others,
-    _mask_create,
-    _pick,
-    _postprocess,
-    _select,
-    _subtract,
-    _ctf,
-    _class2d,
-    _extract,
-    _initial_model,
-    _refine,
-    _class3d,
-    _localres,
-    _polish,
-    _join,
-    _modelangelo,
-)
+from himena_relion._widgets import register_job_lazy
 
-del (
-    _import_others,
-    _mask_create,
-    _postprocess,
-    _select,
-    _subtract,
-    _frames,
-    _ctf,
-    _pick,
-    _class2d,
-    _extract,
-    _initial_model,
-    _refine,
-    _class3d,
-    _localres,
-    _polish,
-    _join,
-    _modelangelo,
+# Viewer modules are imported when a job of the type is opened for the first time.
+register_job_lazy(
+    {
+        "relion.import.movies": f"{__name__}._frames",
+        "relion.motioncorr": f"{__name__}._frames",
+        "relion.extract": f"{__name__}._extract",
+        "relion.extract.reextract": f"{__name__}._extract",
+        "relion.polish.train": f"{__name__}._polish",
+        "relion.polish": f"{__name__}._polish",
+        "modelangelo": f"{__name__}._modelangelo",
+        "relion.select.removeduplicates": f"{__name__}._select",
+        "relion.select.interactive": f"{__name__}._select",
+        "relion.select.class2dauto": f"{__name__}._select",
+        "relion.select.discard": f"{__name__}._select",
+        "relion.select.split": f"{__name__}._select",
+        "relion.select.onvalue": f"{__name__}._select",
+        "relion.manualpick": f"{__name__}._pick",
+        "relion.autopick": f"{__name__}._pick",
+        "relion.autopick.ref2d": f"{__name__}._pick",
+        "relion.autopick.ref3d": f"{__name__}._pick",
+        "relion.autopick.log": f"{__name__}._pick",
+        "relion.autopick.topaz.pick": f"{__name__}._pick",
+        "relion.autopick.topaz.train": f"{__name__}._pick",
+        "relion.ctffind.ctffind4": f"{__name__}._ctf",
+        "relion.ctfrefine.anisomag": f"{__name__}._ctf",
+        "relion.ctfrefine": f"{__name__}._ctf",
+        "relion.localres": f"{__name__}._localres",
+        "relion.refine3d": f"{__name__}._refine",
+        "relion.subtract": f"{__name__}._subtract",
+        "relion.maskcreate": f"{__name__}._mask_create",
+        "relion.import.other": f"{__name__}._import_others",
+        "relion.initialmodel": f"{__name__}._initial_model",
+        "relion.joinstar": f"{__name__}._join",
+        "relion.postprocess": f"{__name__}._postprocess",
+        "relion.class2d": f"{__name__}._class2d",
+    }
+)
+register_job_lazy(
+    {
+        "relion.class3d": f"{__name__}._class3d",
+        "relion.refine3d.tomo": f"{__name__}._refine",
+        "relion.initialmodel.tomo": f"{__name__}._initial_model",
+    },
+    is_tomo=True,
 )
@@ -162,7 +162,9 @@ class QMotionCorrViewer(QJobScrollArea):
         movie_view = ArrayFilteredView.from_mrc(mic_path)
         self._filter_widget.set_image_scale(movie_view.get_scale())
         self._viewer.set_array_view(
-            movie_view.with_filter(self._filter_widget.apply),
+            movie_view.with_filter(
+                self._filter_widget.apply, self._filter_widget.bin_factor
+            ),
             clim=self._viewer._last_clim,
         )
         self._viewer._auto_contrast()
@@ -3,16 +3,19 @@ from pathlib import Path
 import logging
 import numpy as np
 from qtpy import QtWidgets as QtW
-import mrcfile
 from himena_relion._widgets import (
     QJobScrollArea,
     Q3DLocalResViewer,
     register_job,
 )
 from himena_relion import _job_dir, _utils
+from himena_relion._image_readers._cache import DerivedArrayCache, cache_key
 from himena_relion._widgets._shared.resizer import QResizer
+from himena_relion.io._io import read_mrc_lazy
 
 _LOGGER = logging.getLogger(__name__)
+# maps saved in the cache directory are kept as memory maps, others up to 512 MB
+_FILTERED_MAP_CACHE = DerivedArrayCache(maxsize=4, maxbytes=512 * 1024**2)
 
 
 @register_job("relion.localres")
@@ -38,30 +41,46 @@ class QLocalResViewer(QJobScrollArea):
         """Initialize the viewer with the job directory."""
         if not (job_dir.path / "relion_locres.mrc").exists():
             return
-        map_data, locres_data, mask_data, scale = _read_files(job_dir)
-        cutoff_angst = np.min(locres_data[locres_data > 0.001])
+        map_paths, locres_data, mask_data, scale = _read_files(job_dir)
+        cutoff_angst = float(np.min(locres_data[locres_data > 0.001]))
         cutoff_rel = scale / cutoff_angst
-        map_filtered = _utils.lowpass_filter(map_data, cutoff_rel)
+        # the averaged and filtered map only depends on the input maps and the
+        # cutoff, so it can be reused when the tab is reopened
+        map_filtered = _FILTERED_MAP_CACHE.get(
+            cache_key(map_paths, round(cutoff_rel, 6)),
+            lambda: _average_and_filter(map_paths, cutoff_rel),
+            voxel_size=scale,
+        )
         self._viewer.set_images(
-            map_filtered, locres_data, mask_data > 0.2, update_now=False
+            np.asarray(map_filtered, dtype=np.float32),
+            locres_data,
+            mask_data > 0.2 if mask_data is not None else None,
+            update_now=False,
         )
         self._viewer.auto_fit()
 
 
-def _read_mrc(path: Path) -> tuple[np.ndarray, float]:
-    with mrcfile.open(path) as mrc:
-        data = mrc.data.copy()
-        scale = mrc.voxel_size.x
-    return data, float(scale)
+def _read_mrc(path: Path) -> tuple[np.memmap, float]:
+    data, voxel_size = read_mrc_lazy(path)
+    return data, float(voxel_size.x)
+
+
+def _average_and_filter(map_paths: list[Path], cutoff: float) -> np.ndarray:
+    map_data = _read_mrc(map_paths[0])[0].astype(np.float32)
+    for path in map_paths[1:]:
+        map_data += _read_mrc(path)[0]
+    map_data /= len(map_paths)
+    return _utils.lowpass_filter_3d(map_data, cutoff)
 
 
 def _read_files(
     job_dir: _job_dir.JobDirectory,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray | None, float]:
+) -> tuple[list[Path], np.ndarray, np.ndarray | None, float]:
     locres_path = job_dir.path / "relion_locres.mrc"
     params = job_dir.get_job_params_as_dict()
     map_path = job_dir.resolve_path(params["fn_in"])
-    map_data, scale = _read_mrc(map_path)
+    map_paths = [map_path]
+    _, scale = _read_mrc(map_path)
     if "half1" in map_path.stem:
         index = map_path.stem.rfind("half1")
         alt_map_path = map_path.with_name(
@@ -71,12 +90,11 @@ def _read_files(
             + map_path.suffix
         )
         if alt_map_path.exists():
-            alt_map_data, _ = _read_mrc(alt_map_path)
-            map_data = (map_data + alt_map_data) / 2
+            map_paths.append(alt_map_path)
     locres_data, _ = _read_mrc(locres_path)
     if mask_path_rel := params.get("fn_mask", ""):
         mask_path = job_dir.resolve_path(mask_path_rel)
         mask_data, _ = _read_mrc(mask_path)
     else:
         mask_data = None
-    return map_data, locres_data, mask_data, scale
+    return map_paths, locres_data, mask_data, scale
@@ -127,7 +127,9 @@ class QManualPickViewer(QJobScrollArea):
         image_scale = movie_view.get_scale()
         self._filter_widget.set_image_scale(image_scale)
         self._viewer.set_array_view(
-            movie_view.with_filter(self._filter_widget.apply),
+            movie_view.with_filter(
+                self._filter_widget.apply, self._filter_widget.bin_factor
+            ),
             clim=self._viewer._last_clim,
         )
         self._reload_coords(_coords_path)
@@ -18,7 +18,7 @@ from himena_relion._widgets import (
     Q2DFilterWidget,
 )
 from himena_relion._widgets._shared.resizer import QResizer
-from himena_relion._widgets._vispy import MotionPath
+from himena_relion._widgets._vispy import MotionPath, PackedPaths, set_paths_scale
 from himena_relion import _job_dir
 from himena_relion.schemas import MicrographsStarModel, CoordsModel
 from himena_relion._image_readers import ArrayFilteredView
@@ -31,6 +31,7 @@ _LOGGER = logging.getLogger(__name__)
 class QPolishTrainViewer(QJobScrollArea):
     def __init__(self, job_dir: _job_dir.JobDirectory):
         super().__init__()
+        self._job_dir = job_dir
         self._text_edit = QtW.QTextEdit()
         self._text_edit.setReadOnly(True)
         self._text_edit.setFixedSize(300, 200)
@@ -98,6 +99,8 @@ class QPolishViewer(QJobScrollArea):
             antialias=True, parent=self._viewer._canvas._viewbox.scene
         )
         self._motion_visual.set_gl_state(depth_test=False)
+        self._motion_data: PackedPaths | None = None
+        self._tracks_cache: tuple[tuple, PackedPaths, NDArray[np.float32]] | None = None
 
     def on_job_updated(self, job_dir: _job_dir.JobDirectory, path: str):
         """Handle changes to the job directory."""
@@ -125,24 +128,36 @@ class QPolishViewer(QJobScrollArea):
         bin_factor = self._filter_widget.bin_factor()
         zoom = 8
         scale = movie_view.get_scale()
-        yield self._update_micrograph, movie_view.with_filter(self._filter_widget.apply)
-
-        star_track = read_star(track_path)
-        motions = [t.to_polars().to_numpy() for t in star_track.values()]
-        motions = motions[1:]  # first one is data_general
-        model_shiny = CoordsModel.validate_file(shiny_path)
-        if len(motions) != model_shiny.x.len():
-            _LOGGER.warning(
-                "Number of motion tracks does not match number of particles"
+        yield (
+            self._update_micrograph,
+            movie_view.with_filter(
+                self._filter_widget.apply, self._filter_widget.bin_factor
+            ),
+        )
+
+        track_key = (track_path, shiny_path, _mtime(track_path), _mtime(shiny_path))
+        if self._tracks_cache is not None and self._tracks_cache[0] == track_key:
+            _, tracks, pos_shiny = self._tracks_cache
+        else:
+            star_track = read_star(track_path)
+            blocks = list(star_track.values())[1:]  # first one is data_general
+            model_shiny = CoordsModel.validate_file(shiny_path)
+            if len(blocks) != model_shiny.x.len():
+                _LOGGER.warning(
+                    "Number of motion tracks does not match number of particles"
+                )
+                return
+            pos_shiny = np.stack([model_shiny.y, model_shiny.x], axis=1)
+            if blocks:
+                motions = np.stack([t.to_polars().to_numpy() for t in blocks])
+            else:
+                motions = np.empty((0, 1, 2), dtype=np.float32)
+            # tracks in unbinned pixels. Binning is applied by the visual transform.
+            tracks = PackedPaths.from_array(
+                (motions * (zoom / scale) + pos_shiny[:, np.newaxis])[..., ::-1]
             )
-            return
-        pos_shiny = np.stack([model_shiny.y, model_shiny.x], axis=1) / bin_factor
-        motion_scale = 1 / scale / bin_factor * zoom
-        tracks = [
-            (motions[i] * motion_scale + pos_shiny[i][np.newaxis])[:, ::-1]
-            for i in range(len(motions))
-        ]
-        yield self._update_tracks, (tracks, pos_shiny)
+            self._tracks_cache = (track_key, tracks, pos_shiny)
+        yield self._update_tracks, (tracks, pos_shiny / bin_factor, bin_factor)
         if (bfactor_star := self._job_dir.path / "bfactors.star").exists():
             star_bfactor = read_star(bfactor_star).first().to_polars()
             yield self._update_plots, star_bfactor
@@ -151,13 +166,14 @@ class QPolishViewer(QJobScrollArea):
         self._viewer.set_array_view(mic_view, clim=self._viewer._last_clim)
         self._viewer._auto_contrast()
 
-    def _update_tracks(
-        self, data: tuple[list[NDArray[np.float32]], NDArray[np.float32]]
-    ):
-        motion, points = data
+    def _update_tracks(self, data: tuple[PackedPaths, NDArray[np.float32], int]):
+        motion, points, bin_factor = data
         self._viewer.set_points(points, size=10)
         self._viewer.redraw()
-        self._motion_visual.set_data(motion)
+        if motion is not self._motion_data:
+            self._motion_visual.set_data(motion)
+            self._motion_data = motion
+        set_paths_scale(self._motion_visual, 1 / bin_factor)
 
     def _update_plots(self, star: pl.DataFrame):
         x = star["rlnMovieFrameNumber"]
@@ -213,3 +229,7 @@ class QPolishViewer(QJobScrollArea):
         self._mic_list.set_choices(choices)
         if len(choices) == 0:
             self._viewer.clear()
+
+
+def _mtime(path: Path) -> int:
+    return path.stat().st_mtime_ns
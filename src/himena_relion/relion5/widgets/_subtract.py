@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import TYPE_CHECKING
 import uuid
-import mrcfile
-import mrcfile.mrcmemmap
 import polars as pl
 import numpy as np
 from qtpy import QtWidgets as QtW, QtCore
@@ -19,6 +17,10 @@ from himena_relion._widgets import (
     register_job,
     QImageViewTextEdit,
 )
+from himena_relion.io._io import read_mrc_lazy
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -113,32 +115,31 @@ class QSubtractViewer(QJobScrollArea):
     def plot_extracts(self, start_index: int, session: uuid.UUID):
         end_index = min(start_index + self._num_page, self._image_orig.len() + 1)
         sl = slice(start_index, end_index)
-        first = True
 
         try:
             cutoff_a = float(self._lowpass_cutoff.text())
         except ValueError:
             return
-        for (mrc_orig, img_orig), (_, img_sub), ith in zip(
-            read_mrc_slices(self._image_orig[sl], self._job_dir),
-            read_mrc_slices(self._image_sub[sl], self._job_dir),
-            range(start_index + 1, end_index + 1),
-            strict=False,
-        ):
-            if first:
-                angst = mrc_orig.voxel_size.x
-                size = mrc_orig.header.nx
-                msg = f"Image size: {size} pix ({size * angst:.1f} A)\nBefore --> After subtraction"
-                cutoff_rel = angst / cutoff_a
-                first = False
-                yield self._on_text_ready, (msg + "\n\n", session)
-
-            img_str_ori = self._text_edit.image_to_base64(
-                img_orig, f"{ith}", cutoff_rel
-            )
+        if self._image_orig[sl].len() == 0:
+            return
+        imgs_orig, angst = read_mrc_page(self._image_orig[sl], self._job_dir)
+        imgs_sub, _ = read_mrc_page(self._image_sub[sl], self._job_dir)
+        size = imgs_orig.shape[-1]
+        msg = f"Image size: {size} pix ({size * angst:.1f} A)\nBefore --> After subtraction"
+        cutoff_rel = angst / cutoff_a
+        yield self._on_text_ready, (msg + "\n\n", session)
+
+        # render each column in one pass. Subtracted particles may be re-boxed, so
+        # the two columns are not always of the same shape.
+        num = min(imgs_orig.shape[0], imgs_sub.shape[0])
+        texts = [f"{ith}" for ith in range(start_index + 1, start_index + num + 1)]
+        strs_orig = self._text_edit.images_to_base64(imgs_orig[:num], texts, cutoff_rel)
+        strs_sub = self._text_edit.images_to_base64(
+            imgs_sub[:num], [""] * num, cutoff_rel
+        )
+        for img_str_ori, img_str_sub in zip(strs_orig, strs_sub):
             yield self._on_string_ready, (img_str_ori, session)
             yield self._on_text_ready, (" -> ", session)
-            img_str_sub = self._text_edit.image_to_base64(img_sub, "", cutoff_rel)
             yield self._on_string_ready, (img_str_sub, session)
             yield self._on_text_ready, ("\n", session)
 
@@ -159,16 +160,32 @@ class QSubtractViewer(QJobScrollArea):
         return super().showEvent(a0)
 
 
-def read_mrc_slices(
-    entries: Iterable[str],
+def read_mrc_page(
+    entries: pl.Series,
     jobdir: _job_dir.JobDirectory,
-) -> Iterator[tuple[mrcfile.mrcmemmap.MrcMemmap, np.ndarray]]:
-    last_path = ""
-    mrc = None
-    for line in entries:
-        ith, path = line.split("@")
-        ith = int(ith)
-        if path != last_path or mrc is None:
-            last_path = path
-            mrc = mrcfile.mmap(jobdir.resolve_path(path))
-        yield mrc, np.asarray(mrc.data[ith - 1], dtype=np.float32)
+) -> tuple[NDArray[np.float32], float]:
+    """Read the images of "index@path" entries as a stack.
+
+    Entries are grouped by the stack file, and each group is read from the
+    memory-mapped stack at once. Returns the image stack and the pixel size.
+    """
+    parts = entries.str.split_exact("@", 1).struct.unnest()
+    indices = parts[:, 0].cast(pl.Int64).to_numpy() - 1
+    paths = parts[:, 1].to_numpy()
+    out = np.empty((0, 0, 0), dtype=np.float32)
+    voxel_size = 1.0
+    for i, path in enumerate(dict.fromkeys(paths)):
+        is_path = paths == path
+        stack, vs = read_mrc_lazy(jobdir.resolve_path(path))
+        if stack.ndim == 2:
+            stack = stack[np.newaxis]
+        if i == 0:
+            out = np.empty((len(paths), *stack.shape[-2:]), dtype=np.float32)
+            voxel_size = float(vs.x)
+        idx = indices[is_path]
+        if np.all(np.diff(idx) == 1):
+            # particles are usually ordered, so reading a contiguous block is fast
+            out[is_path] = stack[idx[0] : idx[-1] + 1]
+        else:
+            out[is_path] = stack[idx]
+    return out, voxel_size
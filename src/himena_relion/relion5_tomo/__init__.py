@@ -1,4 +1,5 @@
-from himena_relion.relion5_tomo import widgets, _builtins, _connections, _continues
+from himena_relion import _impl_objects
+from himena_relion.relion5_tomo import _builtins, _connections, _continues
 from himena_relion.relion5_tomo.extensions import (
     FindBeads3D,
     EraseGold,
@@ -9,7 +10,12 @@ from himena_relion.relion5_tomo.extensions import (
     ReconstructHalfTomoIMOD,
 )
 
-del widgets, _builtins, _connections, _continues
+if not _impl_objects.IS_HEADLESS:
+    from himena_relion.relion5_tomo import widgets
+
+    del widgets
+
+del _impl_objects, _builtins, _connections, _continues
 
 __all__ = [
     "FindBeads3D",
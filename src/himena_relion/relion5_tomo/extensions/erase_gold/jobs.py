@@ -1,3 +1,4 @@
+from functools import partial
 from pathlib import Path
 from typing import Annotated
 
@@ -14,10 +15,6 @@ from himena_relion.relion5_tomo._builtins import (
     ReconstructTomoByAreTomo2,
 )
 from himena_relion._annotated.io import IN_TILT
-from himena_relion.relion5_tomo.extensions.erase_gold.widgets import (
-    QFindBeads3DViewer,
-    QEraseGoldViewer,
-)
 from himena_relion.relion5_tomo.extensions.erase_gold import _impl
 from himena_relion.relion5_tomo._tomo_utils import project_fiducials
 from himena_relion.consts import MenuId
@@ -94,7 +91,9 @@ class FindBeads3D(RelionExternalJob):
             f"findbeads3d jobs finished successfully, output saved to {output_node_path}"
         )
 
-    def provide_widget(self, job_dir) -> QFindBeads3DViewer:
+    def provide_widget(self, job_dir):
+        from .widgets import QFindBeads3DViewer
+
         return QFindBeads3DViewer(job_dir)
 
 
@@ -135,79 +134,18 @@ class EraseGold(RelionExternalJob):
         rln_dir = out_job_dir.relion_project_dir
 
         output_node_path = out_job_dir.path.joinpath("tilt_series.star")
-        for row in df_tomo.iter_rows(named=True):
-            info = _job_dir.TomogramInfo.from_dict(row)
-            model_path = rln_dir / str(row["TomoBeadModel"])
-            edf_path = rln_dir / str(row[ETOMO_FILE])
-            gold_nm = row["TomoBeadSize"]
-            star_path = out_job_dir.resolve_path(info.tomo_tilt_series_star_file)
-            tilt_star_df = read_star(star_path).first().trust_loop().to_polars()
-            tomo_center = (np.array(info.tomo_shape, dtype=np.float32) - 1) / 2
-            rng = np.random.default_rng(seed)
-            tilt_center = _tilt_center(rln_dir, tilt_star_df)
-            if model_path.exists():
-                fid = (
-                    read_mod(model_path)
-                    .select("z", "y", "x")
-                    .to_numpy()
-                    .astype(np.float32)
-                )
-            else:
-                self.console.log(
-                    f"Model file {model_path} not found for tomogram {info.tomo_name}, "
-                    "defaulting to no fiducials."
-                )
-                fid = np.empty((0, 3), dtype=np.float32)
-            fid = fid * info.tomogram_binning
-            deg = tilt_star_df[TILT_ANGLE].cast(pl.Float32).to_numpy()
-            xf = _impl.xf_to_array(edf_path.with_suffix(".xf"))
-            self.console.log(
-                f"{fid.shape[0]} fiducials found for tomogram {info.tomo_name}"
-            )
-            fid_tr = project_fiducials(fid, tomo_center, deg, xf, tilt_center)
-            yield
-            if process_halves:
-                col_list = [MIC_NAME, MIC_ODD, MIC_EVEN]
-            else:
-                col_list = [MIC_NAME]
-            new_cols: list[pl.Expr] = []
-            for col in col_list:
-                if col not in tilt_star_df.columns:
-                    self.console.log(
-                        f"Column {col} not found in {info.tomo_name}, skipping."
-                    )
-                _to_update: list[str] = []
-                mic_paths = [rln_dir / p for p in tilt_star_df[col]]
-                for ith, mic_path in enumerate(mic_paths):
-                    mic_path = Path(mic_path)
-                    with mrcfile.open(mic_path, mode="r") as mrc:
-                        img = mrc.data
-                        voxel_size = mrc.voxel_size
-                    z_matches = abs(fid_tr[:, 0] - ith) < 0.01
-                    yield
-                    img_erased = _impl.erase_gold(
-                        img,
-                        pos=fid_tr[z_matches, 1:],
-                        rng=rng,
-                        gold_px=gold_nm / voxel_size.x * 10 * mask_expand_factor,
-                    )
-                    yield
-                    save_path = (
-                        frame_save_dir.relative_to(rln_dir)
-                        / f"{mic_path.stem}_erased{mic_path.suffix}"
-                    )
-                    _to_update.append(str(save_path))
-                    with mrcfile.new(rln_dir / save_path, overwrite=True) as mrc_out:
-                        mrc_out.set_data(img_erased)
-                        mrc_out.voxel_size = voxel_size
-                    yield
-                new_cols.append(pl.Series(col, _to_update))
-
-            tilt_star_df = tilt_star_df.with_columns(new_cols)
-            star_save_path = tilt_save_dir / info.tomo_tilt_series_star_file.name
-            as_star({info.tomo_name: tilt_star_df}).write(star_save_path)
-            self.console.log(f"Erased tilt series starfile saved to {star_save_path}")
-            yield
+        rows = list(df_tomo.iter_rows(named=True))
+        yield from self.run_items(
+            rows,
+            partial(
+                self._erase_tomogram,
+                seed=seed,
+                mask_expand_factor=mask_expand_factor,
+                process_halves=process_halves,
+            ),
+            name="tomograms",
+            key=lambda row: _job_dir.TomogramInfo.from_dict(row).tomo_name,
+        )
 
         new_columns = [
             tilt_save_dir.relative_to(rln_dir)
@@ -221,7 +159,88 @@ class EraseGold(RelionExternalJob):
             f"EraseGold jobs finished successfully, output saved to {output_node_path}"
         )
 
+    def _erase_tomogram(
+        self,
+        row: dict,
+        seed: int,
+        mask_expand_factor: float,
+        process_halves: bool,
+    ) -> str:
+        """Erase gold fiducials from the tilt series of one tomogram."""
+        out_job_dir = self.output_job_dir
+        rln_dir = out_job_dir.relion_project_dir
+        tilt_save_dir = out_job_dir.path / "tilt_series"
+        frame_save_dir = out_job_dir.path / "frames"
+        info = _job_dir.TomogramInfo.from_dict(row)
+        model_path = rln_dir / str(row["TomoBeadModel"])
+        edf_path = rln_dir / str(row[ETOMO_FILE])
+        gold_nm = row["TomoBeadSize"]
+        star_path = out_job_dir.resolve_path(info.tomo_tilt_series_star_file)
+        tilt_star_df = read_star(star_path).first().trust_loop().to_polars()
+        tomo_center = (np.array(info.tomo_shape, dtype=np.float32) - 1) / 2
+        rng = np.random.default_rng(seed)
+        tilt_center = _tilt_center(rln_dir, tilt_star_df)
+        if model_path.exists():
+            fid = (
+                read_mod(model_path).select("z", "y", "x").to_numpy().astype(np.float32)
+            )
+        else:
+            self.console.log(
+                f"Model file {model_path} not found for tomogram {info.tomo_name}, "
+                "defaulting to no fiducials."
+            )
+            fid = np.empty((0, 3), dtype=np.float32)
+        fid = fid * info.tomogram_binning
+        deg = tilt_star_df[TILT_ANGLE].cast(pl.Float32).to_numpy()
+        xf = _impl.xf_to_array(edf_path.with_suffix(".xf"))
+        self.console.log(
+            f"{fid.shape[0]} fiducials found for tomogram {info.tomo_name}"
+        )
+        fid_tr = project_fiducials(fid, tomo_center, deg, xf, tilt_center)
+        if process_halves:
+            col_list = [MIC_NAME, MIC_ODD, MIC_EVEN]
+        else:
+            col_list = [MIC_NAME]
+        new_cols: list[pl.Expr] = []
+        for col in col_list:
+            if col not in tilt_star_df.columns:
+                self.console.log(
+                    f"Column {col} not found in {info.tomo_name}, skipping."
+                )
+            _to_update: list[str] = []
+            mic_paths = [rln_dir / p for p in tilt_star_df[col]]
+            for ith, mic_path in enumerate(mic_paths):
+                self.check_abort()
+                mic_path = Path(mic_path)
+                with mrcfile.open(mic_path, mode="r") as mrc:
+                    img = mrc.data
+                    voxel_size = mrc.voxel_size
+                z_matches = abs(fid_tr[:, 0] - ith) < 0.01
+                img_erased = _impl.erase_gold(
+                    img,
+                    pos=fid_tr[z_matches, 1:],
+                    rng=rng,
+                    gold_px=gold_nm / voxel_size.x * 10 * mask_expand_factor,
+                )
+                save_path = (
+                    frame_save_dir.relative_to(rln_dir)
+                    / f"{mic_path.stem}_erased{mic_path.suffix}"
+                )
+                _to_update.append(str(save_path))
+                with mrcfile.new(rln_dir / save_path, overwrite=True) as mrc_out:
+                    mrc_out.set_data(img_erased)
+                    mrc_out.voxel_size = voxel_size
+            new_cols.append(pl.Series(col, _to_update))
+
+        tilt_star_df = tilt_star_df.with_columns(new_cols)
+        star_save_path = tilt_save_dir / info.tomo_tilt_series_star_file.name
+        as_star({info.tomo_name: tilt_star_df}).write(star_save_path)
+        self.console.log(f"Erased tilt series starfile saved to {star_save_path}")
+        return str(star_save_path)
+
     def provide_widget(self, job_dir):
+        from .widgets import QEraseGoldViewer
+
         return QEraseGoldViewer(job_dir)
 
     @classmethod
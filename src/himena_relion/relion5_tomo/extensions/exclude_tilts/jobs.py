@@ -15,7 +15,6 @@ from himena_relion.relion5_tomo._builtins import (
     AlignTiltSeriesAreTomo2,
 )
 from himena_relion._annotated.io import IN_TILT
-from .widgets import QAutoExcludeTiltsViewer
 
 OUTPUT_FILE_NAME = "selected_tilt_series.star"
 
@@ -165,6 +164,8 @@ class AutoExcludeTiltImages(RelionExternalJob):
         )
 
     def provide_widget(self, job_dir):
+        from .widgets import QAutoExcludeTiltsViewer
+
         return QAutoExcludeTiltsViewer(job_dir)
 
 
@@ -9,8 +9,12 @@ from himena_relion.consts import MenuId
 from himena_relion.external import RelionExternalJob
 from himena_relion.schemas import TomogramsGroupModel, TSModel, ParticleMetaModel
 from himena_relion._annotated.io import IN_TILT, IN_PARTICLES
-from himena_relion.relion5_tomo.extensions.hybridize.widgets import (
-    TakeZeroTiltMicrographsWidget,
+from himena_relion._transform import ORIGIN_COLUMNS, particle_matrix, apply
+
+_SUBTOMO_EULER_COLUMNS = (
+    "rlnTomoSubtomogramRot",
+    "rlnTomoSubtomogramTilt",
+    "rlnTomoSubtomogramPsi",
 )
 
 
@@ -143,74 +147,51 @@ class TakeZeroTiltMicrographs(RelionExternalJob):
             .replace_strict(tomo_name_to_optics_group_map, return_dtype=pl.Int32)
             .alias("rlnOpticsGroup"),
         )
-        subs: list[pl.DataFrame] = []
-        for (tomo_name,), sub in df_parts.group_by("rlnTomoName"):
-            mtx = tomo_name_to_mtx_map[tomo_name]
-            scale = tomo_name_to_scale_map[tomo_name]
-            xyz = _get_xyz(sub, scale)
-            xyz_transformed = (mtx @ np.hstack((xyz, np.ones((xyz.shape[0], 1)))).T).T
-            sub = sub.with_columns(
-                pl.Series("rlnCoordinateX", xyz_transformed[:, 0]),
-                pl.Series("rlnCoordinateY", xyz_transformed[:, 1]),
-            )
-            tilt_xy_shape = tomo_name_to_tilt_shape_map[tomo_name]
-            subs.append(
-                sub.filter(
-                    pl.col("rlnCoordinateX").is_between(0, tilt_xy_shape[0]),
-                    pl.col("rlnCoordinateY").is_between(0, tilt_xy_shape[1]),
-                )
-            )
-        df_parts = pl.concat(subs, how="vertical_relaxed")
+        # project all the particles to the zero-tilt micrographs at once
+        tomo_names = list(tomo_name_to_mtx_map.keys())
+        tomo_index = (
+            df_parts["rlnTomoName"]
+            .replace_strict({name: i for i, name in enumerate(tomo_names)})
+            .to_numpy()
+        )
+        mtx = np.stack([tomo_name_to_mtx_map[name] for name in tomo_names])[:, :2]
+        scale = np.array([tomo_name_to_scale_map[name] for name in tomo_names])
+        tilt_shape = np.array([tomo_name_to_tilt_shape_map[n] for n in tomo_names])
+        xyz = _get_xyz(df_parts, scale[tomo_index])
+        xy_transformed = mtx[tomo_index, :, 3]
+        for i in range(3):
+            xy_transformed += mtx[tomo_index, :, i] * xyz[:, i : i + 1]
+        is_inside = np.all(
+            (xy_transformed >= 0) & (xy_transformed <= tilt_shape[tomo_index]), axis=1
+        )
+        df_parts = df_parts.with_columns(
+            pl.Series("rlnCoordinateX", xy_transformed[:, 0]),
+            pl.Series("rlnCoordinateY", xy_transformed[:, 1]),
+        ).filter(is_inside)
         part_star_spa = as_star({"optics": df_optics, "particles": df_parts})
         part_star_spa.write(self.output_job_dir.path / "hybrid_data.star")
 
     def provide_widget(self, job_dir):
+        from .widgets import TakeZeroTiltMicrographsWidget
+
         return TakeZeroTiltMicrographsWidget(job_dir)
 
 
 # Adapted from
 # https://github.com/3dem/relion/blob/master/src/tomography_python_programs/view/particles.py
-def _get_xyz(particle_df: pl.DataFrame, scale: float) -> np.ndarray:
-    from scipy.spatial.transform import Rotation as R
-
-    zyx = particle_df.select(
-        "rlnCoordinateZ", "rlnCoordinateY", "rlnCoordinateX"
+def _get_xyz(particle_df: pl.DataFrame, scale: float | np.ndarray) -> np.ndarray:
+    xyz = particle_df.select(
+        "rlnCoordinateX", "rlnCoordinateY", "rlnCoordinateZ"
     ).to_numpy()
 
     # get particle shifts if present
-    origin_headings = ["rlnOriginZAngst", "rlnOriginYAngst", "rlnOriginXAngst"]
-    if all(heading in particle_df.columns for heading in origin_headings):
-        origin_zyx = particle_df.select(origin_headings).to_numpy()
-        origin_in_dataframe = True
-    else:
-        origin_in_dataframe = False
-
-    # get the subtomogram orientation within the tomogram, if present
-    subtomogram_orientation_headings = [
-        "rlnTomoSubtomogramRot",
-        "rlnTomoSubtomogramTilt",
-        "rlnTomoSubtomogramPsi",
-    ]
-    if all(
-        heading in particle_df.columns for heading in subtomogram_orientation_headings
-    ):
-        eulers = particle_df.select(subtomogram_orientation_headings).to_numpy()
-        subtomogram_rotation = R.from_euler(
-            seq="ZYZ", angles=eulers, degrees=True
-        ).inv()
-        subtomogram_orientation_in_dataframe = True
-    else:
-        subtomogram_orientation_in_dataframe = False
-
-    # rotate the shifts if necessary
-    if subtomogram_orientation_in_dataframe and origin_in_dataframe:
-        origin_xyz = origin_zyx[:, ::-1]
-        origin_xyz = subtomogram_rotation.apply(origin_xyz)
-        origin_zyx = origin_xyz[:, ::-1]
-
-    if origin_in_dataframe:
-        zyx -= origin_zyx / scale
-        # zyx -= origin_zyx / particle_df["rlnImagePixelSize"].to_numpy()
+    if all(heading in particle_df.columns for heading in ORIGIN_COLUMNS):
+        origin = [particle_df[heading].to_numpy() for heading in ORIGIN_COLUMNS]
+        # rotate the shifts by the subtomogram orientation within the tomogram
+        if all(heading in particle_df.columns for heading in _SUBTOMO_EULER_COLUMNS):
+            mat = particle_matrix(particle_df, _SUBTOMO_EULER_COLUMNS)
+            origin = apply(mat, origin)
+        xyz = xyz - np.stack(origin, axis=1) / np.reshape(scale, (-1, 1))
 
     # TODO: also apply "rlnAngleRot" etc?
-    return zyx[:, ::-1]
+    return xyz
@@ -18,7 +18,6 @@ from himena_relion.relion5_tomo._builtins import (
 )
 from himena_relion._annotated.io import IN_TILT, IN_PARTICLES
 from himena_relion.schemas import OptimisationSetModel
-from .widgets import QInspectViewer
 
 
 class InspectParticles(RelionExternalJob):
@@ -44,7 +43,9 @@ class InspectParticles(RelionExternalJob):
     def menu_id(cls):
         return MenuId.RELION_PICK_JOB
 
-    def provide_widget(self, job_dir) -> QInspectViewer:
+    def provide_widget(self, job_dir):
+        from .widgets import QInspectViewer
+
         return QInspectViewer(job_dir)
 
     def run(
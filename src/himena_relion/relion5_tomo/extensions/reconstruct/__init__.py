@@ -1,5 +1,4 @@
 from .jobs import ReconstructTomoIMOD, ReconstructHalfTomoIMOD
-from .widgets import QIMODTomogramViewer, QIMODTomogramHalvesViewer
 
 __all__ = [
     "ReconstructTomoIMOD",
@@ -7,3 +6,12 @@ __all__ = [
     "QIMODTomogramViewer",
     "QIMODTomogramHalvesViewer",
 ]
+
+
+def __getattr__(name: str):
+    # widgets are imported on demand so that jobs can run without Qt
+    if name in ("QIMODTomogramViewer", "QIMODTomogramHalvesViewer"):
+        from . import widgets
+
+        return getattr(widgets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -97,7 +97,7 @@ class QIMODTomogramViewer(_QTomogramViewerBase):
     ) -> ArrayFilteredView | None:
         mrc_path = job_dir.path / "tomograms" / f"rec_{text}.mrc"
         if mrc_path.exists():
-            return ArrayFilteredView.from_mrc(mrc_path)
+            return ArrayFilteredView.from_mrc(mrc_path, use_local_cache=True)
 
     def _prep_item(self, p: Path) -> tuple[str, str]:
         return p.stem[4:], "full tomogram"
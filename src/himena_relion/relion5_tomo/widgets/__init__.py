@@ -1,23 +1,27 @@
+from himena_relion._widgets import register_job_lazy
 from himena_relion.relion5 import widgets  # install SPA widgets
-from himena_relion.relion5_tomo.widgets import (
-    _aligntilt,
-    _ctf,
-    _import,
-    _extract,
-    _tilt_series,
-    _tomogram,
-    _reconstruct,
-    _polish,
-)
 
-del (
-    widgets,
-    _aligntilt,
-    _ctf,
-    _tomogram,
-    _import,
-    _extract,
-    _reconstruct,
-    _tilt_series,
-    _polish,
+# Viewer modules are imported when a job of the type is opened for the first time.
+register_job_lazy(
+    {
+        "relion.framealigntomo": f"{__name__}._polish",
+    }
+)
+register_job_lazy(
+    {
+        "relion.pseudosubtomo": f"{__name__}._extract",
+        "relion.ctffind.ctffind4": f"{__name__}._ctf",
+        "relion.ctfrefinetomo": f"{__name__}._ctf",
+        "relion.aligntiltseries": f"{__name__}._aligntilt",
+        "relion.motioncorr": f"{__name__}._tilt_series",
+        "relion.excludetilts": f"{__name__}._tilt_series",
+        "relion.importtomo": f"{__name__}._import",
+        "relion.reconstructtomograms": f"{__name__}._tomogram",
+        "relion.denoisetomo": f"{__name__}._tomogram",
+        "relion.picktomo": f"{__name__}._tomogram",
+        "relion.reconstructparticletomo": f"{__name__}._reconstruct",
+    },
+    is_tomo=True,
 )
+
+del widgets
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
 import logging
+import threading
 import time
+from typing import Iterable
 import uuid
 import numpy as np
 import mrcfile
+from scipy import ndimage as ndi
 from qtpy import QtWidgets as QtW, QtCore
 from superqt.utils import thread_worker
 from himena_relion._widgets import (
@@ -16,6 +20,12 @@ from himena_relion._widgets import (
     QMicrographListWidget,
 )
 from himena_relion import _job_dir
+from himena_relion._image_readers._cache import cache_key, cached_file_path
+from himena_relion._image_readers._scheduler import (
+    CancelToken,
+    Priority,
+    get_scheduler,
+)
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,6 +50,12 @@ class QExtractJobViewer(QJobScrollArea):
 
         self._subtomo_label = QtW.QLabel("")
         self._subtomo_paths: list[str] = []
+        # tomogram name -> subtomogram file names, updated by file-watch events. This
+        # is only accessed in the main thread; workers get a snapshot of it.
+        self._subtomo_listing: dict[str, dict[str, None]] = {}
+        self._thumbnail_stores: dict[str, _ThumbnailStore] = {}
+        self._filling_store: _ThumbnailStore | None = None
+        self._fill_token = CancelToken()
         self._layout.addWidget(self._subtomo_label)
         hlayout = QtW.QHBoxLayout()
         hlayout.setContentsMargins(0, 0, 0, 0)
@@ -58,6 +74,14 @@ class QExtractJobViewer(QJobScrollArea):
         fp = Path(path)
         is_subtomo_update = fp.name.endswith(("_stack2d.mrcs", "_data.mrc"))
         if fp.name.startswith("RELION_JOB_") or is_subtomo_update:
+            if (
+                is_subtomo_update
+                and (listing := self._subtomo_listing.get(fp.parent.name)) is not None
+            ):
+                if fp.exists():
+                    listing[fp.name] = None
+                else:
+                    listing.pop(fp.name, None)
             self.initialize(job_dir)
             if is_subtomo_update:
                 self._last_updated_dir = fp.parent.name
@@ -101,7 +125,10 @@ class QExtractJobViewer(QJobScrollArea):
         tomo_name = value[0]
 
         self.window_closed_callback()
-        self._worker = self.scan_subtomos(tomo_name)
+        if (listing := self._subtomo_listing.get(tomo_name)) is not None:
+            self._worker = self.scan_subtomos(tomo_name, tuple(listing))
+        else:
+            self._worker = self.scan_subtomos(tomo_name)
         self._start_worker()
 
     def _end_index(self, start: int) -> int:
@@ -122,41 +149,67 @@ class QExtractJobViewer(QJobScrollArea):
             self._start_worker()
 
     @thread_worker
-    def scan_subtomos(self, tomo_name: str):
-        self._subtomo_paths = _list_subtomo_names(self._job_dir, tomo_name)
-        yield self._on_scanned, self._subtomo_paths
+    def scan_subtomos(self, tomo_name: str, names: tuple[str, ...] | None = None):
+        if names is None:
+            names = tuple(_list_subtomo_names(self._job_dir, tomo_name))
+        yield self._on_scanned, (tomo_name, names)
 
     @thread_worker
     def plot_extracts(self, start_index: int, session: uuid.UUID):
         subtomo_dir = self._job_dir.resolve_path(self._tomo_list.current_text(1))
+        store = self._get_thumbnail_store(subtomo_dir)
+        subtomo_paths = self._subtomo_paths
+        names = subtomo_paths[start_index : self._end_index(start_index)]
         yield self._clear_text, session
-        for ith in range(start_index + 1, self._end_index(start_index) + 1):
-            mrc_path = subtomo_dir / self._subtomo_paths[ith - 1]
-            if not mrc_path.exists():
-                img_str = self._text_edit.image_to_base64(
-                    np.zeros((2, 2), dtype=np.float32), f"{ith}"
-                )
-                yield self._on_string_ready, (img_str, session)
-                continue
-            with mrcfile.mmap(mrc_path) as mrc:
-                if ith == start_index + 1:  # first
-                    angst = mrc.voxel_size.x
-                    size = mrc.header.nx
-                    msg = f"Image size: {size} pix ({size * angst:.1f} A)"
-                    cutoff_rel = angst / 15.0  # 15 A cutoff
-                    yield self._on_text_ready, (msg + "\n\n", session)
-                if mrc.data.ndim != 3:
-                    # this may happen if the subtomogram is being written right now
-                    img_2d = mrc.data
-                elif self._subtomo_paths[0].endswith("_stack2d.mrcs"):
-                    img_2d = mrc.data[(mrc.data.shape[0] - 1) // 2, :, :]
-                else:
-                    img_2d = np.max(np.asarray(mrc.data), axis=0)
-                img_2d = np.asarray(img_2d, dtype=np.float32)
-                img_str = self._text_edit.image_to_base64(img_2d, f"{ith}", cutoff_rel)
-                yield self._on_string_ready, (img_str, session)
-        if self._plot_session_id == session:
-            self._worker = None
+        for name in store.outdated(names):
+            store.update(name)
+            yield
+        if not names:
+            return
+        thumbs = store.get_many(names)
+        if store.box_size > 0:
+            size, angst = store.box_size, store.pixel_size
+            msg = f"Image size: {size} pix ({size * angst:.1f} A)"
+            yield self._on_text_ready, (msg + "\n\n", session)
+        cutoff_rel = store.pixel_size / 15.0  # 15 A cutoff
+        texts = [
+            f"{ith}" for ith in range(start_index + 1, start_index + len(names) + 1)
+        ]
+        for img_str in self._text_edit.images_to_base64(thumbs, texts, cutoff_rel):
+            yield self._on_string_ready, (img_str, session)
+        yield self._on_page_plotted, (store, subtomo_paths, session)
+
+    def _on_page_plotted(self, value: tuple[_ThumbnailStore, list[str], uuid.UUID]):
+        store, subtomo_paths, session = value
+        if session != self._plot_session_id:
+            return
+        self._worker = None
+        # fill the thumbnails of the other subtomograms in the background
+        if self._filling_store is store:
+            return
+        self._fill_token.cancel()
+        self._fill_token = token = CancelToken()
+        self._filling_store = store
+
+        def _fill():
+            try:
+                _fill_thumbnails(store, subtomo_paths, token)
+            finally:
+                if self._filling_store is store:
+                    self._filling_store = None
+
+        get_scheduler().submit(_fill, priority=Priority.BACKGROUND, token=token)
+
+    def _get_thumbnail_store(self, subtomo_dir: Path) -> _ThumbnailStore:
+        key = subtomo_dir.as_posix()
+        if (store := self._thumbnail_stores.get(key)) is None:
+            store = _ThumbnailStore(
+                subtomo_dir,
+                size=self._text_edit._image_size_pixel,
+                is_2d=_is_2d(self._job_dir),
+            )
+            self._thumbnail_stores[key] = store
+        return store
 
     def _clear_text(self, value: uuid.UUID):
         if value == self._plot_session_id:
@@ -174,27 +227,50 @@ class QExtractJobViewer(QJobScrollArea):
             return
         self._text_edit.insert_base64_image(img_str)
 
-    def _on_scanned(self, subtomo_paths: list[str]):
+    def _on_scanned(self, value: tuple[str, tuple[str, ...]]):
+        tomo_name, names = value
+        listing = self._subtomo_listing.setdefault(tomo_name, dict.fromkeys(names))
+        self._subtomo_paths = list(listing)
         current_pos = self._slider.value()
-        max_num = len(subtomo_paths)
+        max_num = len(self._subtomo_paths)
         self._slider.setRange(0, max_num // self._num_page)
         current_pos = min(current_pos, self._slider.maximum())
         self._slider_value_changed(current_pos, udpate_slider=True)
 
     def showEvent(self, a0):
+        # files may have been deleted while hidden
+        self._subtomo_listing.clear()
         self._on_tomo_changed(self._tomo_list.current_row_texts())
         return super().showEvent(a0)
 
+    def closeEvent(self, a0):
+        self._fill_token.cancel()
+        return super().closeEvent(a0)
+
+
+def _fill_thumbnails(store: _ThumbnailStore, names: list[str], token: CancelToken):
+    """Create all the outdated thumbnails, saving them every 100 files."""
+    for ith, name in enumerate(store.outdated(names)):
+        if token.cancelled:
+            break
+        store.update(name)
+        if ith % 100 == 99:
+            store.save()
+    store.save()
+
 
 def _list_subtomo_names(job_dir: _job_dir.JobDirectory, tomoname: str) -> list[str]:
     tomo_dir = job_dir.path / "Subtomograms" / tomoname
-    if _is_2d(job_dir):
-        suffix = "_stack2d.mrcs"
-    else:
-        suffix = "_data.mrc"
+    suffix = _subtomo_suffix(job_dir)
     return [p for p in os.listdir(tomo_dir) if p.endswith(suffix)]
 
 
+def _subtomo_suffix(job_dir: _job_dir.JobDirectory) -> str:
+    if _is_2d(job_dir):
+        return "_stack2d.mrcs"
+    return "_data.mrc"
+
+
 def _is_2d(job_dir: _job_dir.JobDirectory) -> bool:
     """Return whether the extraction is 2D stack or 3D subtomogram."""
     params = job_dir.get_job_params_as_dict()
@@ -203,3 +279,124 @@ def _is_2d(job_dir: _job_dir.JobDirectory) -> bool:
     elif "subtomo_format" in params:
         return params["subtomo_format"] == "2D stacks"
     return True
+
+
+class _ThumbnailStore:
+    """Thumbnails of the subtomograms in a directory, packed in one array.
+
+    Thumbnails are the max projections (or the central slices for 2D stacks) resized
+    to the display size. If the cache directory is configured, the packed array and
+    its index are saved there and reused when the job is opened again.
+    """
+
+    def __init__(self, directory: Path, size: int, is_2d: bool):
+        self._directory = directory
+        self._size = size
+        self._is_2d = is_2d
+        self._index: dict[str, tuple[int, int]] = {}  # name -> (row, mtime_ns)
+        self._data = np.zeros((0, size, size), dtype=np.float16)
+        self._num_rows = 0
+        self.box_size = 0
+        self.pixel_size = 1.0
+        self._lock = threading.Lock()
+        self._key = cache_key([], directory.resolve().as_posix(), size, is_2d)
+        self._load()
+
+    def outdated(self, names: Iterable[str]) -> list[str]:
+        """Return names whose thumbnails are not created or older than the file."""
+        out = []
+        for name in names:
+            try:
+                mtime = (self._directory / name).stat().st_mtime_ns
+            except OSError:
+                continue
+            if (rec := self._index.get(name)) is None or rec[1] != mtime:
+                out.append(name)
+        return out
+
+    def get_many(self, names: list[str]) -> np.ndarray:
+        """Return the thumbnails as a float32 stack (zeros if not available)."""
+        out = np.zeros((len(names), self._size, self._size), dtype=np.float32)
+        with self._lock:
+            for i, name in enumerate(names):
+                if (rec := self._index.get(name)) is not None:
+                    out[i] = self._data[rec[0]]
+        return out
+
+    def update(self, name: str):
+        """Create the thumbnail of the subtomogram file."""
+        path = self._directory / name
+        try:
+            mtime = path.stat().st_mtime_ns
+            with mrcfile.mmap(path, mode="r") as mrc:
+                if mrc.data.ndim != 3:
+                    # this may happen if the subtomogram is being written right now.
+                    # The thumbnail is updated again when the file is modified.
+                    img_2d = mrc.data
+                elif self._is_2d:
+                    img_2d = mrc.data[(mrc.data.shape[0] - 1) // 2, :, :]
+                else:
+                    img_2d = np.max(np.asarray(mrc.data), axis=0)
+                box_size, pixel_size = int(mrc.header.nx), float(mrc.voxel_size.x)
+        except (OSError, ValueError):
+            return
+        img_2d = np.asarray(img_2d, dtype=np.float32)
+        zoom = (self._size / img_2d.shape[0], self._size / img_2d.shape[1])
+        thumb = ndi.zoom(img_2d, zoom, order=1, prefilter=False)
+        with self._lock:
+            self.box_size, self.pixel_size = box_size, pixel_size
+            if (rec := self._index.get(name)) is not None:
+                row = rec[0]
+            else:
+                row = self._num_rows
+                if row >= self._data.shape[0]:
+                    new_data = np.zeros(
+                        (max(row * 2, 64), self._size, self._size), dtype=np.float16
+                    )
+                    new_data[:row] = self._data[:row]
+                    self._data = new_data
+                self._num_rows += 1
+            self._data[row] = thumb
+            self._index[name] = (row, mtime)
+
+    def save(self):
+        """Save the packed thumbnails and the index to the cache directory."""
+        npy_path = cached_file_path(self._key, ".thumbs.npy")
+        if npy_path is None or not self._index:
+            return
+        with self._lock:
+            data = self._data[: self._num_rows].copy()
+            meta = {
+                "box_size": self.box_size,
+                "pixel_size": self.pixel_size,
+                "index": self._index,
+            }
+        json_path = npy_path.with_suffix(".json")
+        try:
+            npy_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(npy_path.with_suffix(".tmp"), "wb") as f:
+                np.save(f, data)
+            os.replace(npy_path.with_suffix(".tmp"), npy_path)
+            json_path.write_text(json.dumps(meta))
+        except OSError:
+            _LOGGER.warning("Failed to save thumbnails to %s", npy_path, exc_info=True)
+
+    def _load(self):
+        npy_path = cached_file_path(self._key, ".thumbs.npy")
+        if npy_path is None or not npy_path.exists():
+            return
+        try:
+            meta = json.loads(npy_path.with_suffix(".json").read_text())
+            data = np.load(npy_path)
+        except (OSError, ValueError):
+            return
+        index = {name: tuple(rec) for name, rec in meta["index"].items()}
+        if data.shape[1:] != (self._size, self._size) or any(
+            rec[0] >= data.shape[0] for rec in index.values()
+        ):
+            return
+        self._data = data.astype(np.float16, copy=True)
+        self._num_rows = data.shape[0]
+        self._index = index
+        self.box_size = meta["box_size"]
+        self.pixel_size = meta["pixel_size"]
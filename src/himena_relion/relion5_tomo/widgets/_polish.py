@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from pathlib import Path
+import threading
 from typing import Iterator
 from numpy.typing import NDArray
 import logging
 import numpy as np
+import polars as pl
 from qtpy import QtWidgets as QtW
-from starfile_rs import read_star
+from starfile_rs import read_star, read_star_text
 from superqt.utils import thread_worker
 from himena_relion._widgets import (
     QJobScrollArea,
@@ -33,6 +35,8 @@ class QFrameAlignTomoViewer(QJobScrollArea):
         self._resizer = QResizer(self._viewer)
         self._worker = None
         self._current_info: _job_dir.TomogramInfo | None = None
+        self._index: _FrameAlignIndex | None = None
+        self._index_lock = threading.Lock()
         self._tomo_list = QMicrographListWidget(["Tomogram"])
         self._tomo_list.current_changed.connect(self._on_tomo_changed)
         self._layout.setSpacing(2)
@@ -118,20 +122,29 @@ class QFrameAlignTomoViewer(QJobScrollArea):
             for fp in temp_dir.glob(f"*{suffix}.star"):
                 yield fp.stem[: -len(suffix)]
 
+    def _get_index(self) -> _FrameAlignIndex:
+        """Get the index of the job outputs, rebuilt if any source file is updated.
+
+        This method is called in the worker thread."""
+        with self._index_lock:
+            sources = _FrameAlignIndex.source_files(self._job_dir)
+            if self._index is None or self._index.is_outdated(sources):
+                self._index = _FrameAlignIndex.build(sources)
+            return self._index
+
     def _get_motions_for_tomo(
         self,
         tomo_name: str,
         scale: float,
         zoom: float = 1.0,
     ) -> list[np.ndarray]:
-        motions = []
-        motion_star = self._job_dir.path / "motion.star"
         temp_motion_star = self._job_dir.path / "temp" / f"{tomo_name}_motion.star"
         if temp_motion_star.exists():
-            motion_star = temp_motion_star
-        elif not motion_star.exists():
-            return motions  # nothing available
-        for key, block in read_star(motion_star).items():
+            blocks = read_star(temp_motion_star).items()
+        else:
+            blocks = self._get_index().motion_blocks(tomo_name)
+        motions = []
+        for key, block in blocks:
             # motion data blocks are named as "<tomo_name>/number"
             if key.split("/")[0] != tomo_name:
                 continue
@@ -141,7 +154,6 @@ class QFrameAlignTomoViewer(QJobScrollArea):
         return motions
 
     def _get_particles_for_tomo(self, tomo_name: str) -> NDArray[np.float32]:
-        particles_star = self._job_dir.path / "particles.star"
         temp_particles_star = (
             self._job_dir.path / "temp" / f"{tomo_name}_particles.star"
         )
@@ -151,33 +163,124 @@ class QFrameAlignTomoViewer(QJobScrollArea):
             z = part.centered_z
             y = part.centered_y
             x = part.centered_x
-        elif particles_star.exists():
-            model = ParticleMetaModel.validate_file(particles_star)
-            part = model.particles
-            mask = part.tomo_name == tomo_name
-            z = part.centered_z.filter(mask)
-            y = part.centered_y.filter(mask)
-            x = part.centered_x.filter(mask)
-        else:
-            return np.empty((0, 3), dtype=np.float32)  # nothing available
-        return np.stack([z, y, x], axis=1).astype(np.float32, copy=False)
+            return np.stack([z, y, x], axis=1).astype(np.float32, copy=False)
+        return self._get_index().particles(tomo_name)
 
     def _get_tomo_view_for_tomo(self, tomo_name: str) -> ArrayFilteredView | None:
-        params = self._job_dir.get_job_params_as_dict()
+        if path := self._get_index().tomogram_paths.get(tomo_name):
+            return ArrayFilteredView.from_mrc(path)
+        return None
+
+
+class _FrameAlignIndex:
+    """Prepared index of the outputs of a frame alignment job.
+
+    Selecting a tomogram only needs dictionary lookups and reading the motion.star
+    blocks of that tomogram, instead of parsing the whole STAR files.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, Path | None],
+        mtimes: dict[str, int | None],
+        motion_offsets: dict[str, list[tuple[int, int]]],
+        particles: dict[str, NDArray[np.float32]],
+        tomogram_paths: dict[str, str],
+    ):
+        self._sources = sources
+        self._mtimes = mtimes
+        self._motion_offsets = motion_offsets
+        self._particles = particles
+        self.tomogram_paths = tomogram_paths
+
+    @staticmethod
+    def source_files(job_dir: _job_dir.JobDirectory) -> dict[str, Path | None]:
+        """Files that the index is built from."""
+        params = job_dir.get_job_params_as_dict()
+        tomo_star = None
         if in_opt := params.get("in_optimisation", ""):
-            opt_model = OptimisationSetModel.validate_file(in_opt)
-            df_tomo = read_star(opt_model.tomogram_star).first().to_polars()
+            if Path(in_opt).exists():
+                tomo_star = OptimisationSetModel.validate_file(in_opt).tomogram_star
         elif in_tomo := params.get("in_tomograms", ""):
-            df_tomo = read_star(in_tomo).first().to_polars()
-        else:
-            return None
-        if "rlnTomoName" not in df_tomo.columns:
-            return None
-        sl = df_tomo["rlnTomoName"] == tomo_name
-        if "rlnTomoReconstructedTomogramDenoised" in df_tomo.columns:
-            path = df_tomo["rlnTomoReconstructedTomogramDenoised"].filter(sl).item()
-        elif "rlnTomoReconstructedTomogram" in df_tomo.columns:
-            path = df_tomo["rlnTomoReconstructedTomogram"].filter(sl).item()
-        else:
-            return None
-        return ArrayFilteredView.from_mrc(path)
+            tomo_star = in_tomo
+        return {
+            "motion": job_dir.path / "motion.star",
+            "particles": job_dir.path / "particles.star",
+            "tomograms": Path(tomo_star) if tomo_star else None,
+        }
+
+    @classmethod
+    def build(cls, sources: dict[str, Path | None]) -> _FrameAlignIndex:
+        mtimes = _mtimes(sources)
+        motion_offsets: dict[str, list[tuple[int, int]]] = {}
+        if mtimes["motion"] is not None:
+            motion_offsets = _scan_block_offsets(sources["motion"])
+        particles: dict[str, NDArray[np.float32]] = {}
+        if mtimes["particles"] is not None:
+            part = ParticleMetaModel.validate_file(sources["particles"]).particles
+            df = pl.DataFrame(
+                {
+                    "tomo": part.tomo_name,
+                    "z": part.centered_z,
+                    "y": part.centered_y,
+                    "x": part.centered_x,
+                }
+            )
+            for (tomo_name,), sub in df.partition_by("tomo", as_dict=True).items():
+                zyx = sub.select("z", "y", "x").to_numpy()
+                particles[tomo_name] = zyx.astype(np.float32, copy=False)
+        tomogram_paths: dict[str, str] = {}
+        if mtimes["tomograms"] is not None:
+            df_tomo = read_star(sources["tomograms"]).first().to_polars()
+            for col in [
+                "rlnTomoReconstructedTomogramDenoised",
+                "rlnTomoReconstructedTomogram",
+            ]:
+                if "rlnTomoName" in df_tomo.columns and col in df_tomo.columns:
+                    tomogram_paths = dict(zip(df_tomo["rlnTomoName"], df_tomo[col]))
+                    break
+        return cls(sources, mtimes, motion_offsets, particles, tomogram_paths)
+
+    def is_outdated(self, sources: dict[str, Path | None]) -> bool:
+        return sources != self._sources or _mtimes(sources) != self._mtimes
+
+    def motion_blocks(self, tomo_name: str):
+        """Iterate over the (name, block) pairs of motion.star for the tomogram."""
+        if not (offsets := self._motion_offsets.get(tomo_name)):
+            return
+        with open(self._sources["motion"], "rb") as f:
+            for start, end in offsets:
+                f.seek(start)
+                text = f.read(end - start).decode()
+                yield from read_star_text(text).items()
+
+    def particles(self, tomo_name: str) -> NDArray[np.float32]:
+        if (zyx := self._particles.get(tomo_name)) is None:
+            return np.empty((0, 3), dtype=np.float32)
+        return zyx
+
+
+def _mtimes(sources: dict[str, Path | None]) -> dict[str, int | None]:
+    out = {}
+    for key, path in sources.items():
+        try:
+            out[key] = path.stat().st_mtime_ns if path else None
+        except OSError:
+            out[key] = None
+    return out
+
+
+def _scan_block_offsets(path: Path) -> dict[str, list[tuple[int, int]]]:
+    """Map tomogram name to the byte ranges of its "data_<tomo_name>/<n>" blocks."""
+    starts: list[tuple[str, int]] = []
+    with open(path, "rb") as f:
+        pos = 0
+        for line in f:
+            if line.startswith(b"data_"):
+                starts.append((line[5:].strip().decode(), pos))
+            pos += len(line)
+    offsets: dict[str, list[tuple[int, int]]] = {}
+    ends = [start for _, start in starts[1:]] + [pos]
+    for (name, start), end in zip(starts, ends):
+        offsets.setdefault(name.split("/")[0], []).append((start, end))
+    return offsets
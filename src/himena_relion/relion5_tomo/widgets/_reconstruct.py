@@ -56,6 +56,7 @@ class QReconstructViewer(QJobScrollArea):
 
         self._img_raw = None
         self._img_raw_scale = 1.0
+        self._job_dir = job_dir
 
     def on_job_updated(self, job_dir: _job_dir.JobDirectory, path: str):
         """Handle changes to the job directory."""
@@ -187,6 +188,16 @@ class QReconstructViewer(QJobScrollArea):
     def _on_lowpass_changed(self):
         self._viewer.set_image(self._get_image_filtered(), update_now=True)
 
+    def memory_usage(self) -> int:
+        nbytes = super().memory_usage()
+        if self._img_raw is not None:
+            nbytes += self._img_raw.nbytes
+        return nbytes
+
+    def release_memory(self):
+        super().release_memory()
+        self._img_raw = None
+
     def _clear_image(self):
         self._img_raw = None
         self._viewer.set_image(None, update_now=False)
@@ -96,7 +96,7 @@ class QTomogramViewer(QJobScrollArea):
             ok = mrc_path1.exists() or mrc_path2.exists()
         else:
             mrc_path = job_dir.path / "tomograms" / f"rec_{text}.mrc"
-            tomo_view = ArrayFilteredView.from_mrc(mrc_path)
+            tomo_view = ArrayFilteredView.from_mrc(mrc_path, use_local_cache=True)
             ok = mrc_path.exists()
         if ok:
             tomo_view.try_memmap()
@@ -123,6 +123,7 @@ _MODEL_GZ = "denoising_model.tar.gz"
 class QDenoiseTrainViewer(QJobScrollArea):
     def __init__(self, job_dir: _job_dir.JobDirectory):
         super().__init__()
+        self._job_dir = job_dir
         layout = self._layout
         self._canvas_loss = QPlotCanvas(self)
         self._canvas_mae = QPlotCanvas(self)
@@ -210,7 +211,7 @@ class QDenoiseTomogramViewer(QJobScrollArea):
         text = texts[0]
         mrc_path = job_dir.path / "tomograms" / f"rec_{text}.mrc"
         if mrc_path.exists():
-            tomo_view = ArrayFilteredView.from_mrc(mrc_path)
+            tomo_view = ArrayFilteredView.from_mrc(mrc_path, use_local_cache=True)
             self._viewer.set_array_view(tomo_view, self._viewer._last_clim)
         else:
             _LOGGER.info("Denoised tomogram file not found: %s", mrc_path)
@@ -1,15 +1,23 @@
 """Useful startup function to use himena with RELION."""
 
+from collections import Counter
+import logging
 from typing import TYPE_CHECKING
 
 from pathlib import Path
 import psutil
 from himena_relion._job_class import scheduler_widget
+from himena_relion._job_dir import JobDirectory
 from himena_relion._utils import get_pipeline_widgets
 from himena_relion.pipeline_watcher import _WATCHER_FILE_NAME, read_pid_from_lock
 
+from himena_relion.schemas._pipeline import RelionPipelineModel
+
 if TYPE_CHECKING:
     from himena.widgets import MainWindow
+    from himena_relion._job_class import RelionJob
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def on_himena_startup(ui: "MainWindow"):
@@ -20,6 +28,10 @@ def on_himena_startup(ui: "MainWindow"):
             ui.read_file(starpath, plugin="himena_relion.io.read_relion_pipeline")
         scheduler = scheduler_widget(ui)
         scheduler.clear_content()
+        try:
+            scheduler.prewarm_forms(frequent_job_classes(cwd))
+        except Exception:
+            _LOGGER.warning("Failed to find frequently used jobs.", exc_info=True)
         ui.size = max(ui.size.width, 1260), ui.size.height
 
         # if pipeline-watcher lock exists, check if the process is actually running.
@@ -44,3 +56,25 @@ def on_himena_startup(ui: "MainWindow"):
                         f"Pipeline watcher lock file {_WATCHER_FILE_NAME} found, but "
                         "the process seems not running. This lock is removed."
                     )
+
+
+def frequent_job_classes(rln_dir: Path, num: int = 8) -> list[type["RelionJob"]]:
+    """Job classes most frequently used in the project, in descending order."""
+    pipeline = RelionPipelineModel.validate_file(rln_dir / "default_pipeline.star")
+    counts = Counter[str]()
+    latest_job: dict[str, str] = {}
+    for name, type_label in zip(
+        pipeline.processes.process_name, pipeline.processes.type_label
+    ):
+        counts[type_label] += 1
+        latest_job[type_label] = name
+    out: list[type[RelionJob]] = []
+    for type_label, _ in counts.most_common(num):
+        job_star = rln_dir / latest_job[type_label] / "job.star"
+        try:
+            job_cls = JobDirectory.from_job_star(job_star)._to_job_class()
+        except Exception:
+            continue
+        if job_cls is not None and job_cls not in out:
+            out.append(job_cls)
+    return out
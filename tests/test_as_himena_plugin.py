@@ -11,3 +11,34 @@ def test_startup(make_himena_ui: Callable[[], MainWindow], tmpdir):
     )
     ui = make_himena_ui("qt")
     on_himena_startup(ui)
+
+def test_plugin_import_is_lazy():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, time\n"
+        "t0 = time.perf_counter()\n"
+        "import himena_relion.relion5, himena_relion.relion5_tomo\n"
+        "print(time.perf_counter() - t0)\n"
+        "print(','.join(m for m in sys.modules if m.startswith(\n"
+        "    ('himena_relion.relion5.widgets._', 'himena_relion.relion5_tomo.widgets._',\n"
+        "     'matplotlib')\n"
+        ")))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    print(f"plugin import time: {float(out[0]):.3f} s")
+    assert out[1] == ""
+    # loose bound to catch heavy modules imported at startup again
+    # (see benchmarks/bench_import.py for the actual numbers)
+    assert float(out[0]) < 10.0
+
+def test_lazy_viewer_registry():
+    from himena_relion._widgets._main import RelionJobViewRegistry
+
+    reg = RelionJobViewRegistry.instance()
+    assert "relion.class2d" in reg.registered_job_types()
+    assert "relion.picktomo" in reg.registered_job_types(is_tomo=True)
+    assert "relion.picktomo" not in reg.registered_job_types()
@@ -110,3 +110,185 @@ def test_path_input(himena_ui: MainWindow, qtbot: QtBot, monkeypatch: pytest.Mon
     qwidget._open_path()
     widget.set_value("*.py")
     qwidget._glob_paths()
+
+def test_render_scheduler(qtbot: QtBot):
+    from himena_relion._widgets._vispy._viewbox import QRenderScheduler
+
+    scales: list[float] = []
+    scheduler = QRenderScheduler(scales.append, frame_interval=0.01)
+    scheduler._full_render_time = 0.04  # pretend full render is slow
+    for _ in range(10):
+        scheduler.request(interactive=True)
+    qtbot.waitUntil(lambda: not scheduler.is_pending())
+    assert len(scales) == 1  # coalesced
+    assert scales[0] == pytest.approx(0.5)
+    scheduler.end_interaction()
+    qtbot.waitUntil(lambda: not scheduler.is_pending())
+    assert scales[-1] == 1.0
+    assert scheduler.stats().scale == 1.0
+    scheduler.flush()
+    assert len(scales) == 3
+
+def test_packed_paths():
+    import numpy as np
+    from himena_relion._widgets._vispy import MotionPath, PackedPaths, set_paths_scale
+
+    paths = np.arange(24, dtype=np.float32).reshape(4, 3, 2)
+    packed = PackedPaths.from_array(paths)
+    assert packed.vertices.shape == (12, 2)
+    assert packed.connect.tolist() == [True, True, False] * 4
+    packed_list = PackedPaths.from_list([p for p in paths])
+    np.testing.assert_array_equal(packed_list.vertices, packed.vertices)
+    np.testing.assert_array_equal(packed_list.connect, packed.connect)
+
+    visual = MotionPath()
+    visual.set_data(packed)
+    visual.set_data([])
+    set_paths_scale(visual, 0.5)
+    set_paths_scale(visual, 0.25)
+    assert tuple(visual.transform.scale[:2]) == (0.25, 0.25)
+
+def test_point_slicing(qtbot: QtBot):
+    import numpy as np
+    from himena_relion._widgets._view_nd import Q2DViewer
+
+    viewer = Q2DViewer()
+    qtbot.addWidget(viewer)
+    viewer.set_array_view(np.zeros((20, 16, 16), dtype=np.float32))
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 20, size=(500, 3)).astype(np.float32)
+    points[:10, 0] = 7.0
+    colors = rng.random((500, 4)).astype(np.float32)
+    viewer.set_points(points, size=6.0, edge_color=colors)
+    assert np.all(np.diff(viewer._points[:, 0]) >= 0)
+    point_size = viewer._point_size_normed()
+    for z in [0, 7, 13]:
+        result = viewer._get_image_slice(z)
+        zdiff = points[:, 0] - z
+        mask = np.abs(zdiff) < point_size / 2
+        order = np.lexsort((points[mask, 2], points[mask, 1]))
+        order_out = np.lexsort((result.points[:, 2], result.points[:, 1]))
+        np.testing.assert_array_equal(result.points[order_out], points[mask][order])
+        np.testing.assert_array_equal(result.edge_colors[order_out], colors[mask][order])
+        expected_sizes = np.sqrt(point_size**2 - (zdiff[mask] * 2) ** 2)
+        np.testing.assert_allclose(result.sizes[order_out], expected_sizes[order], atol=0.5)
+
+def test_slice_histogram(qtbot: QtBot):
+    import numpy as np
+    from himena_relion._widgets._view_nd import Q2DViewer, SliceHistogram
+
+    img = np.random.default_rng(0).normal(size=(1200, 1000)).astype(np.float32)
+    hist = SliceHistogram.from_image(img, max_samples=10000)
+    assert 0 < hist.sample.size < img.size // 100
+
+    viewer = Q2DViewer()
+    qtbot.addWidget(viewer)
+    stack = np.stack([img[:100, :100] * (i + 1) for i in range(5)])
+    viewer.set_array_view(stack)
+    viewer._dims_slider.setValue(1)
+    viewer._dims_slider.setValue(3)
+    assert list(viewer._slice_cache) == [2, 1, 3]
+    result = viewer._get_image_slice(1)
+    assert result.image is viewer._slice_cache[1][0]
+    # bins of all the slices span the same range
+    viewer._dims_slider.setValue(1)
+    assert viewer._hist_range == (stack[3].min(), stack[3].max())
+    assert viewer._histogram_view._minmax == pytest.approx(viewer._hist_range)
+
+    viewer = Q2DViewer()
+    qtbot.addWidget(viewer)
+    viewer.set_array_view(np.arange(50, dtype=np.uint16).reshape(2, 5, 5))
+    assert viewer._histogram_view._minmax == (0, 65535)
+
+def test_stale_slices_not_cached(qtbot: QtBot):
+    import numpy as np
+    from himena_relion._widgets._view_nd import Q2DViewer
+
+    viewer = Q2DViewer()
+    qtbot.addWidget(viewer)
+    viewer.set_array_view(np.ones((5, 8, 8), dtype=np.float32))
+    view = viewer._array_view
+    generation = viewer._cache_generation
+    token = viewer._cancel_token
+    viewer.redraw()  # e.g. the filter parameters changed
+    assert token.cancelled
+    viewer._prefetch_slice(view, 0, generation)
+    assert 0 not in viewer._slice_cache
+    assert viewer._get_image_slice(0, generation) is None
+    viewer._prefetch_slice(view, 0, viewer._cache_generation)
+    assert 0 in viewer._slice_cache
+
+def test_memory_budget(qtbot: QtBot, tmpdir):
+    import numpy as np
+    from himena_relion._widgets import QJobScrollArea, Q2DSimpleViewer
+    from himena_relion._widgets._memory import MemoryBudget, QMemoryBudgetPanel, get_memory_budget
+
+    class QImageJob(QJobScrollArea):
+        def __init__(self, job_dir):
+            super().__init__()
+            self._viewer = Q2DSimpleViewer()
+            self._layout.addWidget(self._viewer)
+            self._job_dir = job_dir
+            self.num_initialized = 0
+
+        def initialize(self, job_dir):
+            self._viewer.set_image(np.zeros((1024, 1024), dtype=np.float32))
+            self.num_initialized += 1
+
+    job_dir = JobDirectory(Path(tmpdir))
+    tab = QtW.QTabWidget()
+    qtbot.addWidget(tab)
+    jobs = [QImageJob(job_dir) for _ in range(3)]
+    budget = MemoryBudget(budget=9 * 1024**2)
+    for job in jobs:
+        get_memory_budget().unregister(job)
+        budget.register(job)
+        job.initialize(job_dir)
+        tab.addTab(job, "job")
+    tab.show()
+    for i in [1, 2, 0]:
+        tab.setCurrentIndex(i)
+        budget.mark_visible(jobs[i])
+    assert budget.total() == 12 * 1024**2
+
+    # jobs[1] is the least recently visible one
+    assert budget.enforce() == 4 * 1024**2
+    assert budget.total() == 8 * 1024**2
+    assert jobs[1].memory_usage() == 0 and jobs[1]._memory_released
+    assert [usage.released for usage in budget.usages()] == [False, False, True]
+
+    # reloaded when shown
+    tab.setCurrentIndex(1)
+    assert jobs[1].num_initialized == 2
+    assert jobs[1].memory_usage() == 4 * 1024**2
+    # stopping the worker does not unregister the widget
+    other = QImageJob(job_dir)
+    qtbot.addWidget(other)
+    other.window_closed_callback()
+    assert id(other) in get_memory_budget()._areas
+    other.close()
+    assert id(other) not in get_memory_budget()._areas
+    assert budget.release_hidden() == 8 * 1024**2
+
+    panel = QMemoryBudgetPanel(budget)
+    qtbot.addWidget(panel)
+    assert panel._table.rowCount() == 3
+
+def test_start_worker_in_scheduler(qtbot: QtBot, monkeypatch: pytest.MonkeyPatch):
+    from superqt.utils import thread_worker
+    from himena_relion import _impl_objects
+    from himena_relion._image_readers._scheduler import Priority, get_scheduler
+
+    @thread_worker
+    def _gen():
+        for i in range(3):
+            yield i
+
+    monkeypatch.setattr(_impl_objects, "IS_TESTING", False)
+    yielded = []
+    worker = _gen()
+    worker.yielded.connect(yielded.append)
+    num_completed = get_scheduler().stats().num_completed
+    _impl_objects.start_worker(worker, priority=Priority.THUMBNAIL)
+    qtbot.waitUntil(lambda: yielded == [0, 1, 2])
+    assert get_scheduler().stats().num_completed > num_completed
@@ -3,12 +3,14 @@ from typing import Callable
 from pathlib import Path
 
 import threading
+import pytest
 import mrcfile
 import numpy as np
 import polars as pl
 from starfile_rs import as_star, read_star
 from himena_relion._job_dir import JobDirectory
 from himena_relion.testing import ExternalJobTester
+from ._utils import JOB_PIPELINES_DIR
 from himena_relion.schemas import (
     TSGroupModel,
     TSModel,
@@ -42,6 +44,47 @@ def test_shift_map(qtbot, tmpdir):
     tester.prep_job_star(ext_dir, in_3dref=str(img_path), center_by="map-com")
     tester.prep_job_star(ext_dir, in_3dref=str(img_path), in_mask=str(mask_path), center_by="map-com")
 
+def test_shift_map_particles(tmpdir):
+    from himena_relion.relion5.extensions.transform.jobs import _shift_star
+
+    tmpdir = Path(tmpdir)
+    star = as_star({
+        "optics": pl.DataFrame({"rlnOpticsGroup": [1], "rlnImagePixelSize": [2.0]}),
+        "particles": pl.DataFrame({
+            "rlnAngleRot": [0.0, 90.0],
+            "rlnAngleTilt": [0.0, 0.0],
+            "rlnAnglePsi": [0.0, 0.0],
+            "rlnOriginXAngst": [0.0, 1.0],
+            "rlnOriginYAngst": [0.0, 0.0],
+        }),
+    })
+    star.write(tmpdir / "in.star")
+    _shift_star(tmpdir / "in.star", tmpdir / "out.star", (2.0, 0.0, 5.0))
+    out = read_star(tmpdir / "out.star")
+    assert out["optics"].trust_loop().to_polars()["rlnImagePixelSize"][0] == 2.0
+    df = out["particles"].trust_loop().to_polars()
+    assert df["rlnOriginXAngst"].to_list() == pytest.approx([2.0, 1.0])
+    assert df["rlnOriginYAngst"].to_list() == pytest.approx([0.0, -2.0])
+
+def test_symmetry_expansion_job_uses_relion(tmpdir, monkeypatch: pytest.MonkeyPatch):
+    from himena_relion.relion5.extensions.symmetry_expansion import jobs
+
+    tmpdir = Path(tmpdir)
+    ext_dir = tmpdir / "External/job010"
+    ext_dir.mkdir(parents=True, exist_ok=True)
+    calls = []
+
+    def _run(args, check):
+        calls.append(args)
+        Path(args[args.index("--o") + 1]).write_text("")
+
+    monkeypatch.setattr(jobs.subprocess, "run", _run)
+    tester = ExternalJobTester(jobs.SymmetryExpansionJob)
+    tester.prep_job_star(ext_dir, in_parts="particles.star", symmetry="O")
+    tester.test_run(ext_dir)
+    assert calls[0][0] == "relion_particle_symmetry_expand"
+    assert calls[0][calls[0].index("--sym") + 1] == "O"
+
 def test_inspect_particles_spa(qtbot, tmpdir):
     from himena_relion.relion5.extensions.inspect_particles import InspectParticlesSPA, InspectParticlesSPAWidget
 
@@ -381,3 +424,121 @@ def test_manually_create_mask(
     tester.test_run(ext_dir, widget=widget)
     assert (ext_dir / "mask.mrc").exists()
     assert (ext_dir / "mask_base.mrc").exists()
+
+@pytest.mark.parametrize("dilate", [0, 2, -1])
+@pytest.mark.parametrize("method", ["Cosine", "Gaussian"])
+def test_soft_edge_mask(dilate: int, method: str):
+    from scipy import ndimage as ndi
+    from himena_relion.relion5.extensions.volume_tools.jobs import soft_edge_mask
+
+    mask = np.zeros((40, 32, 36), dtype=bool)
+    mask[10:18, 3:12, 0:9] = True
+    mask[14:20, 8:10, 5:7] = True
+
+    # reference: dilate by a spherical footprint and blur in the full box
+    zz, yy, xx = np.indices((2 * abs(dilate) + 1,) * 3) - abs(dilate)
+    footprint = np.sqrt(zz**2 + yy**2 + xx**2) <= abs(dilate)
+    ref = mask
+    if dilate > 0:
+        ref = ndi.binary_dilation(mask, footprint)
+    elif dilate < 0:
+        ref = ndi.binary_erosion(mask, footprint)
+    dist = ndi.distance_transform_edt(~ref) / 1.5
+    if method == "Cosine":
+        expected = (np.cos(np.clip(dist * np.pi / 2, 0, np.pi)) + 1) / 2
+    else:
+        expected = np.exp(-(dist**2) * np.log(2))
+    out = soft_edge_mask(mask, dilate_pixels=dilate, edge_pixels=1.5, method=method)
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out, expected, atol=1e-6)
+    assert not soft_edge_mask(np.zeros((5, 5, 5), dtype=bool), 1, 2.0).any()
+
+def test_external_job_cli_imports(tmpdir):
+    import subprocess
+    import sys
+
+    tmpdir = Path(tmpdir)
+    ext_dir = tmpdir / "External/job010"
+    ext_dir.mkdir(parents=True, exist_ok=True)
+    with mrcfile.new(ext_dir / "in_3dref.mrc") as mrc:
+        mrc.set_data(np.random.normal(size=(8, 8, 8)).astype(np.float32))
+    ext_dir.joinpath("job_pipeline.star").write_text(
+        JOB_PIPELINES_DIR.joinpath("refine3d.star").read_text()
+    )
+    # run the job in the same process as the entry point does, and check that no GUI
+    # modules are imported.
+    code = (
+        "import sys\n"
+        "from himena_relion.__main__ import main\n"
+        "sys.argv = ['himena-relion', 'himena_relion.relion5:ShiftMapJob', '--o',\n"
+        "    'External/job010/', '--in_3dref', 'External/job010/in_3dref.mrc',\n"
+        "    '--center_by', 'map-com']\n"
+        "main()\n"
+        "gui = ('qtpy', 'superqt', 'vispy', 'matplotlib', 'himena_relion._widgets')\n"
+        "print(','.join(m for m in sys.modules if m.startswith(gui)))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=tmpdir
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.splitlines()[-1] == ""
+    assert ext_dir.joinpath("RELION_JOB_EXIT_SUCCESS").exists()
+
+def test_run_work_units(tmpdir):
+    from himena_relion.external.work_units import run_work_units, parse_progress
+
+    calls = []
+
+    def _func(x: int) -> int:
+        calls.append(x)
+        if x == 3 and len(calls) < 5:
+            raise ValueError("fail once")
+        return x * 2
+
+    def _run(nr_threads: int):
+        gen = run_work_units(
+            range(5), _func, job_dir=Path(tmpdir), name="test", nr_threads=nr_threads
+        )
+        while True:
+            try:
+                next(gen)
+            except StopIteration as e:
+                return e.value
+
+    try:
+        _run(1)
+    except ValueError:
+        pass
+    assert calls == [0, 1, 2, 3]
+    # finished items are not processed again
+    assert _run(2) == [0, 2, 4, 6, 8]
+    assert sorted(calls[4:]) == [3, 4]
+    assert _run(2) == [0, 2, 4, 6, 8]
+    assert len(calls) == 6
+    assert parse_progress("[12:00:00] Progress (test): 3/5") == ("test", 3, 5)
+    assert parse_progress("some message") is None
+
+def test_run_work_units_abort(tmpdir):
+    from himena_relion.external.work_units import run_work_units, WorkUnitAborted
+
+    aborted = threading.Event()
+    started = []
+
+    def _func(x: int) -> int:
+        started.append(x)
+        aborted.set()
+        for _ in range(100):  # per-item loop checking the abort flag
+            if aborted.is_set():
+                raise WorkUnitAborted
+            time.sleep(0.05)
+        return x
+
+    gen = run_work_units(
+        range(20), _func, job_dir=Path(tmpdir), name="abort", nr_threads=2,
+        should_abort=aborted.is_set,
+    )
+    t0 = time.perf_counter()
+    with pytest.raises(WorkUnitAborted):
+        list(gen)
+    assert time.perf_counter() - t0 < 2
+    assert len(started) <= 2
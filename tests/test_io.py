@@ -29,3 +29,203 @@ def test_read_mrc_file(himena_ui: MainWindow, tmpdir):
     win = himena_ui.read_file(mrc_path)
     assert win.model_type() == StandardType.IMAGE
     assert not isinstance(win.widget, Q3DViewer)
+
+def test_read_mrc_file_lazy(himena_ui: MainWindow, tmpdir, monkeypatch):
+    from himena_relion.io import _io
+
+    tmpdir = Path(tmpdir)
+    rng = np.random.default_rng(402)
+    data = rng.standard_normal((12, 20, 16), dtype=np.float32)
+    with mrcfile.new(mrc_path := tmpdir.joinpath("test.mrcs")) as mrc:
+        mrc.set_data(data)
+        mrc.voxel_size = (1.4, 1.4, 1.4)
+        mrc.set_extended_header(np.zeros(8, dtype=np.int32))
+    arr, voxel_size = _io.read_mrc_lazy(mrc_path)
+    assert isinstance(arr, np.memmap)
+    assert voxel_size.x == np.float32(1.4)
+    np.testing.assert_array_equal(arr[3], data[3])
+
+    monkeypatch.setattr(_io, "get_lazy_read_threshold", lambda: 0)
+    win = himena_ui.read_file(mrc_path)
+    assert isinstance(win.to_model().value, np.memmap)
+
+
+def test_mrc_splits_sum_cache(tmpdir, monkeypatch):
+    from himena_relion._image_readers import _cache
+    from himena_relion._image_readers._array import ArrayFromMrcSplits
+
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(Path(tmpdir) / "cache"))
+    writers = []  # run the caching tasks manually
+    monkeypatch.setattr(_cache, "start_caching", lambda key, func: writers.append(func))
+    paths = [Path(tmpdir) / "rec_half1.mrc", Path(tmpdir) / "rec_half2.mrc"]
+    halves = [np.random.random((6, 8, 8)).astype(np.float32) for _ in paths]
+    for path, half in zip(paths, halves):
+        with mrcfile.new(path) as mrc:
+            mrc.set_data(half)
+    view = ArrayFromMrcSplits(paths)
+    np.testing.assert_allclose(view.get_slice(2), halves[0][2] + halves[1][2])
+    assert 2 in view._slice_cache
+    assert len(writers) == 1
+    writers.pop()()
+    sl = view.get_slice(3)
+    assert isinstance(view._sum, np.memmap) and view._sum.dtype == np.float16
+    np.testing.assert_allclose(sl, halves[0][3] + halves[1][3], rtol=1e-2)
+
+    view = ArrayFromMrcSplits(paths)
+    sl = view.get_slice(3)
+    assert view._sum is not None and writers == []
+    np.testing.assert_allclose(sl, halves[0][3] + halves[1][3], rtol=1e-2)
+
+    # the key is computed once, and the files are reopened when modified
+    num_keys = []
+    monkeypatch.setattr(_cache, "cache_key", lambda *a: num_keys.append(0) or "key")
+    view._stat_interval = 0.0
+    for i in range(6):
+        view.get_slice(i)
+    assert num_keys == []
+    halves[0] = halves[0] * 2
+    with mrcfile.new(paths[0], overwrite=True) as mrc:
+        mrc.set_data(halves[0])
+    np.testing.assert_allclose(view.get_slice(1), halves[0][1] + halves[1][1])
+    assert len(num_keys) == 1 and view._sum is None
+    assert len(writers) == 1
+
+
+def test_tomogram_local_copy(tmpdir, monkeypatch):
+    from himena_relion._image_readers import _array, _cache
+    from himena_relion._image_readers._array import ArrayFromMrc
+
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(Path(tmpdir) / "cache"))
+    monkeypatch.setattr(_cache, "start_caching", lambda key, func: func())
+    monkeypatch.setattr(_array, "get_lazy_read_threshold", lambda: 0)
+    data = np.random.random((20, 30, 25)).astype(np.float32)
+    mrc_path = Path(tmpdir) / "tomo.mrc"
+    with mrcfile.new(mrc_path) as mrc:
+        mrc.set_data(data)
+    view = ArrayFromMrc(mrc_path, use_local_cache=True)
+    np.testing.assert_allclose(view.get_slice(5), data[5], rtol=1e-3)
+    assert view._local is not None and view._local.dtype == np.float16
+    view = ArrayFromMrc(mrc_path, use_local_cache=True)
+    sl = view.get_slice(6)
+    assert isinstance(view._local, np.memmap) and sl.dtype == np.float32
+    np.testing.assert_allclose(sl, data[6], rtol=1e-3)
+
+    # values out of the float16 range are copied as float32
+    for scale in [1e6, 1e-6]:
+        mrc_path = Path(tmpdir) / f"tomo_{scale}.mrc"
+        with mrcfile.new(mrc_path) as mrc:
+            mrc.set_data(data * scale)
+        view = ArrayFromMrc(mrc_path, use_local_cache=True)
+        np.testing.assert_allclose(view.get_slice(5), data[5] * scale, rtol=1e-6)
+        assert view._local.dtype == np.float32
+
+    # small files are not copied
+    monkeypatch.setattr(_array, "get_lazy_read_threshold", lambda: 1024**2)
+    view = ArrayFromMrc(mrc_path, use_local_cache=True)
+    np.testing.assert_allclose(view.get_slice(5), data[5] * scale)
+    assert view._local is None
+
+
+def test_micrograph_pyramid(tmpdir, monkeypatch):
+    from himena_relion._image_readers import _cache, ArrayFilteredView
+    from himena_relion._image_readers._pyramid import pyramid_factor_for
+    from himena_relion._utils import bin_image
+
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(Path(tmpdir) / "cache"))
+    monkeypatch.setattr(_cache, "start_caching", lambda key, func: func())
+    assert [pyramid_factor_for(b) for b in (1, 2, 3, 6, 8, 16)] == [1, 2, 1, 2, 8, 8]
+    mic = np.random.random((100, 130)).astype(np.float32)
+    mic_path = Path(tmpdir) / "mic.mrc"
+    with mrcfile.new(mic_path) as mrc:
+        mrc.set_data(mic)
+
+    def _filter(img, index, binned=1):
+        return bin_image(img, 4 // binned) if binned < 4 else img
+
+    view = ArrayFilteredView.from_mrc(mic_path).with_filter(_filter, lambda: 4)
+    expected = bin_image(mic, 4)
+    np.testing.assert_allclose(view.get_slice(0), expected, rtol=1e-5)  # creates pyramid
+    np.testing.assert_allclose(view.get_slice(0), expected, rtol=1e-2)  # from pyramid
+    assert len(list(Path(tmpdir).joinpath("cache").rglob("*.mrc"))) == 3
+
+
+def test_cache_dir_trim(tmpdir, monkeypatch):
+    import os
+    from himena_relion._image_readers import _cache
+
+    cache_dir = Path(tmpdir) / "cache"
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(cache_dir))
+    monkeypatch.setattr(_cache, "get_cache_size_limit", lambda: 10**9)
+    data = np.zeros((4, 16, 16), dtype=np.float32)  # 2 kB in float16
+    keys = [_cache.cache_key([], f"vol-{i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        assert _cache.write_cached_volume(key, data, 1.0)
+        os.utime(_cache.cached_file_path(key), (i, i))
+    assert _cache.read_cached_volume(keys[0]) is not None  # most recently used
+    _cache.trim_cache_dir(max_bytes=7000)
+    assert _cache.cached_file_path(keys[0]).exists()
+    assert not _cache.cached_file_path(keys[1]).exists()
+    assert _cache.cached_file_path(keys[2]).exists()
+    assert _cache.clear_cache_dir() > 0
+    assert not any(_cache.cached_file_path(key).exists() for key in keys)
+
+    arr_cache = _cache.DerivedArrayCache(maxsize=4, maxbytes=data.nbytes * 2)
+    for i in range(3):
+        arr_cache.get(f"arr-{i}", lambda: data.copy(), persist=False)
+    assert list(arr_cache._cache) == ["arr-1", "arr-2"]
+    out = arr_cache.get("arr-3", lambda: data.copy(), persist=True)
+    assert isinstance(out, np.memmap)
+
+
+def test_task_scheduler():
+    import threading
+    import time
+    from himena_relion._image_readers._scheduler import (
+        TaskScheduler, Priority, CancelToken,
+    )
+
+    scheduler = TaskScheduler(max_workers=1)
+    gate = threading.Event()
+    order = []
+    blocker = scheduler.submit(gate.wait, priority=Priority.INTERACTIVE)
+    while not blocker.running():
+        time.sleep(0.01)
+    token = CancelToken()
+    futures = [
+        scheduler.submit(order.append, "bg", priority=Priority.BACKGROUND),
+        scheduler.submit(order.append, "thumb", priority=Priority.THUMBNAIL),
+        scheduler.submit(order.append, "cancelled", priority=Priority.PREFETCH, token=token),
+        scheduler.submit(order.append, "slice", priority=Priority.INTERACTIVE),
+    ]
+    token.cancel()
+    stats = scheduler.stats()
+    assert stats.queue_depth[Priority.BACKGROUND] == 1
+    assert sum(stats.queue_depth.values()) == 4
+    gate.set()
+    blocker.result(timeout=5)
+    for future in futures[:2]:
+        future.result(timeout=5)
+    assert futures[2].cancelled()
+    assert order == ["slice", "thumb", "bg"]
+    stats = scheduler.stats()
+    assert stats.num_completed == 4
+    assert stats.num_cancelled == 1
+    assert stats.max_wait > 0
+
+def test_task_scheduler_reserved_worker():
+    import threading
+    from himena_relion._image_readers._scheduler import TaskScheduler, Priority
+
+    scheduler = TaskScheduler(max_workers=2)
+    gate = threading.Event()
+    # long-lived thumbnail and background tasks cannot take the last worker
+    blockers = [
+        scheduler.submit(gate.wait, priority=Priority.THUMBNAIL),
+        scheduler.submit(gate.wait, priority=Priority.BACKGROUND),
+    ]
+    assert scheduler.submit(lambda: "slice", priority=Priority.INTERACTIVE).result(timeout=5) == "slice"
+    assert scheduler.submit(lambda: "next", priority=Priority.PREFETCH).result(timeout=5) == "next"
+    assert scheduler.stats().queue_depth[Priority.BACKGROUND] == 1
+    gate.set()
+    for future in blockers:
+        assert future.result(timeout=5)
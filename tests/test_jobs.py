@@ -180,3 +180,58 @@ def test_continue_job(
     assert "fn_cont" in params
     kwargs = ref_job.normalize_kwargs_inv(**params)
     ref_job.prerun_check(**kwargs)
+
+def test_job_directory_cache(
+    make_job_directory: Callable[[str, str], JobDirectory],
+    jobs_dir_spa,
+):
+    from himena_relion.consts import RelionJobState
+
+    star_text = Path(jobs_dir_spa / "Refine3D" / "job001" / "job.star").read_text()
+    job_dir = make_job_directory(star_text, "Refine3D")
+    params = job_dir.get_job_params_as_dict()
+    params["fn_img"] = "modified"  # returned dict must be a copy
+    assert job_dir.get_job_params_as_dict()["fn_img"] != "modified"
+    job_dir.job_star().write_text(star_text.replace("do_ctf_correction", "do_ctf_correction_new"))
+    assert "do_ctf_correction_new" in job_dir.get_job_params_as_dict()
+
+    assert job_dir.state() is RelionJobState.RUNNING
+    marker = job_dir.path / "RELION_JOB_EXIT_SUCCESS"
+    marker.touch()
+    assert job_dir.state() is RelionJobState.RUNNING  # not notified yet
+    job_dir.notify_file_changed(marker)
+    assert job_dir.state() is RelionJobState.EXIT_SUCCESS
+    marker.unlink()
+    job_dir.refresh()
+    assert job_dir.state() is RelionJobState.RUNNING
+
+def test_job_form_cache(make_himena_ui: Callable[[], MainWindow]):
+    from himena_relion.relion5._builtins import (
+        MotionCorrOwnJob, MotionCorr2Job, CtfEstimationJob
+    )
+
+    ui = make_himena_ui("mock")
+    scheduler = QJobScheduler(ui)
+    scheduler.update_by_job(MotionCorrOwnJob)
+    widgets = scheduler._job_param_widget._mgui_widgets
+    default = scheduler.get_parameters()
+    widgets["do_save_ps"].value = not widgets["do_save_ps"].value
+    scheduler._job_param_widget.set_parameters({}, enabled=False)
+    scheduler.update_by_job(CtfEstimationJob)
+    scheduler.update_by_job(MotionCorrOwnJob)
+    # the form is reused, but values and enabled states are reset
+    assert scheduler._job_param_widget._mgui_widgets is widgets
+    assert scheduler.get_parameters() == default
+    assert widgets["do_save_ps"].enabled
+    assert widgets["group_for_ps"].enabled == default["do_save_ps"]
+
+    param_widget = scheduler._job_param_widget
+    param_widget._max_cached_forms = 1
+    param_widget.prewarm([CtfEstimationJob, MotionCorr2Job])
+    assert param_widget._prewarm_queue == [MotionCorr2Job]  # CTF is already cached
+    param_widget._prewarm_next()
+    # the current form is never evicted
+    assert list(param_widget._forms) == [MotionCorrOwnJob, MotionCorr2Job]
+    scheduler.clear_content()
+    scheduler.update_by_job(MotionCorr2Job)
+    assert list(param_widget._forms) == [MotionCorrOwnJob, MotionCorr2Job]
@@ -74,6 +74,104 @@ def test_lock(tmpdir):
             raise ValueError
     assert not tmpdir.joinpath(".relion_lock").exists()
 
+def test_lock_manager(tmpdir):
+    import json
+    import subprocess
+    import sys
+    import threading
+    import time
+    from himena_relion._lock import ProjectLockManager, LOCK_DIR_NAME
+
+    tmpdir = Path(tmpdir)
+    manager = ProjectLockManager()
+    lock_dir = tmpdir / LOCK_DIR_NAME
+
+    # released by another thread
+    released = threading.Event()
+    def _hold():
+        with manager.hold(tmpdir):
+            released.wait(5)
+            time.sleep(0.2)
+    thread = threading.Thread(target=_hold)
+    thread.start()
+    while not lock_dir.exists():
+        time.sleep(0.01)
+    released.set()
+    with manager.hold(tmpdir, wait_sec=3):
+        assert lock_dir.exists()
+    thread.join()
+    assert not lock_dir.exists()
+    stats = manager.stats()
+    assert stats.num_acquired == 2
+    assert stats.num_contended == 1
+    assert 0.1 < stats.max_wait < 1.0
+
+    # stale lock left by a dead process
+    proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True)
+    lock_dir.mkdir()
+    owner = lock_dir.joinpath("himena_lock_owner.json")
+    owner.write_text(json.dumps({"host": __import__("socket").gethostname(), "pid": int(proc.stdout)}))
+    with manager.hold(tmpdir, wait_sec=0.1):
+        pass
+    assert manager.stats().num_stale_removed == 1
+
+    # the stale lock was replaced by a live one after reading the owner
+    from himena_relion import _lock
+
+    with manager.hold(tmpdir):
+        owners = iter([_lock._LockOwner(__import__("socket").gethostname(), int(proc.stdout), "dead")])
+        read_owner = _lock._read_owner
+        _lock._read_owner = lambda d: next(owners, None) or read_owner(d)
+        try:
+            assert not manager._remove_if_stale(lock_dir)
+        finally:
+            _lock._read_owner = read_owner
+        assert owner.exists()
+        assert [p.name for p in tmpdir.iterdir() if p.name.startswith(LOCK_DIR_NAME)] == [LOCK_DIR_NAME]
+    assert manager.stats().num_stale_removed == 1
+
+    # the stale lock was replaced by a live one while reading the owner
+    lock_dir.mkdir()
+    owner.write_text(json.dumps({"host": __import__("socket").gethostname(), "pid": int(proc.stdout)}))
+    read_owner = _lock._read_owner
+
+    def _read_and_replace(d):
+        out = read_owner(d)
+        owner.unlink()
+        lock_dir.rmdir()
+        tmpdir.joinpath("placeholder").mkdir()  # keep the inode number from reuse
+        lock_dir.mkdir()
+        owner.write_text(json.dumps({"host": "other-host", "pid": 1, "nonce": "live"}))
+        return out
+
+    _lock._read_owner = _read_and_replace
+    try:
+        assert not manager._remove_if_stale(lock_dir)
+    finally:
+        _lock._read_owner = read_owner
+    assert _lock._read_owner(lock_dir).nonce == "live"
+    assert [p.name for p in tmpdir.iterdir() if p.name.startswith(LOCK_DIR_NAME)] == [LOCK_DIR_NAME]
+    owner.unlink()
+    lock_dir.rmdir()
+
+    # a lock taken by others after this lock was removed is not released
+    with manager.hold(tmpdir):
+        owner.unlink()
+        lock_dir.rmdir()
+        lock_dir.mkdir()
+        owner.write_text(json.dumps({"host": "other-host", "pid": 1, "nonce": "other"}))
+    assert owner.exists()
+    owner.unlink()
+    lock_dir.rmdir()
+
+    # lock by RELION (no owner file) is never removed
+    lock_dir.mkdir()
+    with pytest.raises(_utils.RelionPipelineLockError):
+        with manager.hold(tmpdir, wait_sec=0.1):
+            pass
+    assert lock_dir.exists()
+    assert manager.stats().num_timeouts == 1
+
 def test_remove_input_edges(tmpdir):
     # Import/job001/tilt_series.star MotionCorr/job002/
     path = Path(tmpdir) / "default_pipeline.star"
@@ -87,3 +185,108 @@ def test_remove_input_edges(tmpdir):
         _utils.replace_input_edges(f, "MotionCorr/job002/")
     assert "Import/job001/tilt_series.star\tMotionCorr/job002/" not in star_path.read_text()
     assert "MotionCorr/job002/corrected_tilt_series.star\tCtfFind/job003/" in star_path.read_text()
+
+def test_pipeline_writer(tmpdir, monkeypatch: pytest.MonkeyPatch):
+    from himena_relion.schemas import RelionPipelineModel
+
+    rln_dir = prep_relion_project(tmpdir)
+    star_path = rln_dir / "default_pipeline.star"
+    star_path.chmod(0o664)
+    with _utils.PipelineWriter(star_path) as writer:
+        writer.set_state("MotionCorr/job002/", "Failed")
+        writer.set_alias("MotionCorr/job002", "MotionCorr/mc/")
+        writer.replace_input_edges("CtfFind/job003/", ["Import/job001/tilt_series.star"])
+    assert not rln_dir.joinpath(".relion_lock").exists()
+    assert star_path.stat().st_mode & 0o777 == 0o664
+    assert list(rln_dir.glob(".default_pipeline.star.*")) == []
+    pipeline = RelionPipelineModel.validate_file(star_path)
+    processes = pipeline.processes.dataframe.filter(pipeline.processes.process_name == "MotionCorr/job002/")
+    assert processes["rlnPipeLineProcessStatusLabel"][0] == "Failed"
+    assert processes["rlnPipeLineProcessAlias"][0] == "MotionCorr/mc/"
+    edges = pipeline.input_edges.from_node.filter(pipeline.input_edges.process == "CtfFind/job003/")
+    assert edges.to_list() == ["Import/job001/tilt_series.star"]
+    with pytest.raises(ValueError):
+        _utils.PipelineWriter(star_path).set_state("MotionCorr/job002/", "Unknown")
+
+    # the file is modified by others after it is read
+    write_temp = _utils.PipelineWriter._write_temp
+    def _write_temp_and_modify(self, text):
+        with _utils.PipelineWriter(star_path) as other:
+            other.set_state("Import/job001/", "Failed")
+        return write_temp(self, text)
+
+    monkeypatch.setattr(_utils.PipelineWriter, "_write_temp", _write_temp_and_modify)
+    with _utils.PipelineWriter(star_path) as writer:
+        writer.remove_jobs(["CtfFind/job003/"])
+    monkeypatch.undo()
+    pipeline = RelionPipelineModel.validate_file(star_path)
+    assert "CtfFind/job003/" not in pipeline.processes.process_name.to_list()
+    assert not pipeline.nodes.name.str.starts_with("CtfFind/job003/").any()
+    assert "CtfFind/job003/" not in pipeline.input_edges.process.to_list()
+    assert "Import/job001/" in pipeline.processes.process_name.filter(pipeline.processes.status_label == "Failed").to_list()
+    assert not _utils.PipelineWriter(star_path).commit()
+
+def test_lowpass_filter():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    img = rng.random((32, 40)).astype(np.float32)
+    fy, fx = np.fft.fftfreq(32)[:, None], np.fft.fftfreq(40)[None, :]
+    expected = np.fft.ifft2(np.fft.fft2(img) * (np.sqrt(fy**2 + fx**2) <= 0.2)).real
+    np.testing.assert_allclose(_utils.lowpass_filter(img, 0.2), expected, atol=1e-5)
+
+    # batched
+    stack = rng.random((3, 32, 40)).astype(np.float32)
+    out = _utils.lowpass_filter(stack, 0.2, kind="gaussian")
+    assert out.shape == stack.shape and out.dtype == np.float32
+    np.testing.assert_allclose(out[1], _utils.lowpass_filter(stack[1], 0.2, kind="gaussian"), atol=1e-5)
+    assert _utils.lowpass_filter(stack, 0.95) is stack
+
+def test_rigid_transform():
+    import numpy as np
+    import polars as pl
+    from scipy.spatial.transform import Rotation
+    from himena_relion import _transform
+
+    rng = np.random.default_rng(0)
+    angles = np.stack(
+        [rng.uniform(-180, 180, 100), rng.uniform(0, 180, 100), rng.uniform(-180, 180, 100)],
+        axis=1,
+    )
+    angles[:2, 1] = [0, 180]  # gimbal lock
+    df = pl.DataFrame(angles, schema=list(_transform.EULER_COLUMNS))
+    expected = Rotation.from_euler("ZYZ", angles, degrees=True).inv().as_matrix()
+
+    def _stack(mat):
+        return np.stack([np.stack(row, axis=-1) for row in mat], axis=-2)
+
+    mat = _transform.particle_matrix(df)
+    np.testing.assert_allclose(_stack(mat), expected, atol=1e-12)
+    df2 = _transform.with_particle_matrix(df, mat)
+    np.testing.assert_allclose(_stack(_transform.particle_matrix(df2)), expected, atol=1e-12)
+    op = _transform.euler_to_matrix(30.0, 60.0, 90.0)
+    np.testing.assert_allclose(
+        _stack(_transform.matmul(mat, op)),
+        expected @ Rotation.from_euler("ZYZ", [30, 60, 90], degrees=True).inv().as_matrix(),
+        atol=1e-12,
+    )
+
+    df3 = _transform.shift_origins(df.with_columns(rlnOriginXAngst=pl.lit(1.0)), (1, 2, 3))
+    assert "rlnOriginZAngst" not in df3.columns
+    shifted = df3.select("rlnOriginXAngst", "rlnOriginYAngst").to_numpy()
+    np.testing.assert_allclose(shifted, (expected @ [1, 2, 3])[:, :2] + [1, 0])
+
+    img = rng.random((5, 6, 7))
+    zz, yy, xx = np.indices(img.shape)
+    com = [(g * img).sum() / img.sum() for g in (zz, yy, xx)]
+    np.testing.assert_allclose(_transform.center_of_mass(img), com)
+
+def test_configs_without_main_window(monkeypatch: pytest.MonkeyPatch):
+    from himena_relion import _configs
+
+    def _no_config():
+        raise RuntimeError("RELION configuration not found.")
+
+    monkeypatch.setattr(_configs, "_get_himena_relion_config", _no_config)
+    assert _configs.get_lazy_read_threshold() == _configs.RelionConfig().lazy_read_threshold * 1024**2
+    assert _configs.get_cache_dir() == ""
@@ -34,3 +34,12 @@ def test_class2d(
     tester.widget._sort_by.setCurrentIndex(1)
     QApplication.processEvents()
     tester.widget._sort_by.setCurrentIndex(2)
+
+    # released and reloaded
+    widget = tester.widget
+    assert widget.memory_usage() > 0
+    widget.release_memory()
+    assert widget.memory_usage() == 0
+    widget.show()
+    assert widget.memory_usage() > 0
+    assert not widget._memory_released
@@ -71,6 +71,23 @@ def test_extract_tomo_2d(
         )
     assert tester.widget._tomo_list.rowCount() == 2
 
+    # deleted files are removed from the listing
+    tester.widget._tomo_list.set_current_row(0)
+    tester.widget.show()
+    qtbot.waitUntil(lambda: tester.widget._worker is None)
+    assert len(tester.widget._subtomo_listing["TS_01"]) == 6
+    fp = job_dir.path / "Subtomograms/TS_01/0_stack2d.mrcs"
+    fp.unlink()
+    tester.widget.on_job_updated(job_dir, str(fp))
+    assert "0_stack2d.mrcs" not in tester.widget._subtomo_listing["TS_01"]
+    # the scanning worker gets a snapshot of the listing
+    scan_subtomos = type(tester.widget).scan_subtomos.__wrapped__
+    (_, (tomo_name, names)), = scan_subtomos(tester.widget, "TS_01", ("1_stack2d.mrcs",))
+    assert (tomo_name, names) == ("TS_01", ("1_stack2d.mrcs",))
+    tester.widget._on_tomo_changed(tester.widget._tomo_list.current_row_texts())
+    qtbot.waitUntil(lambda: tester.widget._worker is None)
+    assert len(tester.widget._subtomo_paths) == 5
+
 def test_extract_tomo_3d(
     qtbot,
     make_job_directory: Callable[[str, str], JobDirectory],
@@ -103,3 +120,36 @@ def test_extract_tomo_3d(
             dtype=np.float16
         )
     assert tester.widget._tomo_list.rowCount() == 2
+
+def test_subtomo_thumbnail_store(tmpdir, monkeypatch):
+    import mrcfile
+    from himena_relion._image_readers import _cache
+    from himena_relion.relion5_tomo.widgets._extract import _ThumbnailStore
+
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(Path(tmpdir) / "cache"))
+    subtomo_dir = Path(tmpdir) / "TS_01"
+    subtomo_dir.mkdir()
+    for i in range(3):
+        with mrcfile.new(subtomo_dir / f"{i}_data.mrc") as mrc:
+            mrc.set_data(np.full((4, 32, 32), i, dtype=np.float32))
+            mrc.voxel_size = 2.0
+    names = [f"{i}_data.mrc" for i in range(3)]
+    store = _ThumbnailStore(subtomo_dir, size=16, is_2d=False)
+    assert store.outdated(names) == names
+    for name in names:
+        store.update(name)
+    assert store.outdated(names) == []
+    store.save()
+
+    store = _ThumbnailStore(subtomo_dir, size=16, is_2d=False)
+    assert store.outdated(names) == []
+    assert store.box_size == 32
+    thumbs = store.get_many(["2_data.mrc", "missing.mrc", "1_data.mrc"])
+    assert thumbs.shape == (3, 16, 16)
+    np.testing.assert_allclose(thumbs[:, 0, 0], [2, 0, 1])
+
+    # 2D image of a stack being written
+    with mrcfile.new(subtomo_dir / "3_data.mrc") as mrc:
+        mrc.set_data(np.full((32, 32), 3, dtype=np.float32))
+    store.update("3_data.mrc")
+    np.testing.assert_allclose(store.get_many(["3_data.mrc"])[0, 0, 0], 3)
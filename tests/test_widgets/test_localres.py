@@ -40,3 +40,26 @@ def test_localres_widget(
     QApplication.processEvents()
     QApplication.processEvents()
     assert tester.widget._viewer._surface._data is not None
+
+def test_derived_array_cache(tmpdir, monkeypatch):
+    from himena_relion._image_readers import _cache
+
+    cache_dir = Path(tmpdir) / "cache"
+    monkeypatch.setattr(_cache, "get_cache_dir", lambda: str(cache_dir))
+    src = Path(tmpdir) / "src.txt"
+    src.write_text("x")
+    key = _cache.cache_key([src], 0.1)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones((4, 4, 4), dtype=np.float32)
+
+    cache = _cache.DerivedArrayCache(maxsize=1)
+    assert cache.get(key, compute).shape == (4, 4, 4)
+    assert _cache.cached_file_path(key).exists()
+    cache.clear()
+    arr = cache.get(key, compute)
+    assert len(calls) == 1
+    assert isinstance(arr, np.memmap) and arr.dtype == np.float16
+    assert _cache.cache_key([src], 0.2) != key
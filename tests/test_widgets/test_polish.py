@@ -0,0 +1,50 @@
+import os
+from typing import Callable
+from pathlib import Path
+
+import numpy as np
+from himena_relion._job_dir import JobDirectory
+from himena_relion.relion5_tomo.widgets._polish import QFrameAlignTomoViewer
+from himena_relion.schemas import ParticleMetaModel
+
+def _motion_block(name: str, nframes: int) -> str:
+    rows = "\n".join(f"{i:.1f} 0.0 0.0" for i in range(nframes))
+    return (
+        f"data_{name}\n\nloop_\n_rlnOriginXAngst #1\n_rlnOriginYAngst #2\n"
+        f"_rlnOriginZAngst #3\n{rows}\n\n"
+    )
+
+def test_frame_align_tomo_index(
+    qtbot,
+    make_job_directory: Callable[[str, str], JobDirectory],
+    jobs_dir_tomo,
+):
+    star_text = Path(jobs_dir_tomo / "Polish" / "job001" / "job.star").read_text()
+    job_dir = make_job_directory(star_text, "Polish")
+    ParticleMetaModel.example(5).write(job_dir.path / "particles.star")
+    motion_star = job_dir.path / "motion.star"
+    motion_star.write_text(
+        "data_general\n\n_rlnParticleNumber 5\n\n"
+        + "".join(_motion_block(f"TS_01/{i}", 3) for i in range(2))
+        + "".join(_motion_block(f"TS_02/{i}", 3) for i in range(3))
+    )
+
+    widget = QFrameAlignTomoViewer(job_dir)
+    qtbot.addWidget(widget)
+    assert widget._get_particles_for_tomo("TS_01").shape == (2, 3)
+    assert widget._get_particles_for_tomo("TS_02").shape == (3, 3)
+    assert widget._get_particles_for_tomo("TS_03").shape == (0, 3)
+    motions = widget._get_motions_for_tomo("TS_02", scale=2.0)
+    assert len(motions) == 3
+    np.testing.assert_allclose(motions[0][:, 0], [0.0, 0.5, 1.0])
+    index = widget._index
+    assert widget._get_motions_for_tomo("TS_01", scale=1.0)
+    assert widget._index is index  # not rebuilt
+
+    # index is rebuilt when the file is updated
+    with motion_star.open("a") as f:
+        f.write(_motion_block("TS_03/0", 4))
+    st = motion_star.stat()
+    os.utime(motion_star, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert len(widget._get_motions_for_tomo("TS_03", scale=1.0)) == 1
+    assert widget._index is not index
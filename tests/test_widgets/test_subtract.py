@@ -36,3 +36,69 @@ def test_subtract_widget(
 
     tester.write_text("particle_subtracted.star", star.to_string())
     tester.write_exit_with_success()
+
+def test_read_mrc_page(
+    qtbot,
+    make_job_directory: Callable[[str, str], JobDirectory],
+    jobs_dir_spa,
+):
+    import numpy as np
+    import polars as pl
+    from himena_relion.relion5.widgets._subtract import read_mrc_page
+
+    star_text = Path(jobs_dir_spa / "Subtract" / "job001" / "job.star").read_text()
+    job_dir = make_job_directory(star_text, "Subtract")
+    tester = JobWidgetTester(QSubtractViewer(job_dir), job_dir)
+    qtbot.addWidget(tester.widget)
+    stack0 = np.random.random((10, 12, 12)).astype(np.float32)
+    stack1 = np.random.random((10, 12, 12)).astype(np.float32)
+    tester.write_mrc("img0.mrcs", stack0)
+    tester.write_mrc("img1.mrcs", stack1)
+    entries = pl.Series(
+        [
+            "000003@Subtract/job025/img0.mrcs",
+            "000004@Subtract/job025/img0.mrcs",
+            "000002@Subtract/job025/img1.mrcs",
+            "000009@Subtract/job025/img0.mrcs",
+            "000001@Subtract/job025/img1.mrcs",
+        ]
+    )
+    out, _ = read_mrc_page(entries, job_dir)
+    np.testing.assert_allclose(out, stack0[[2, 3]].tolist() + stack1[[1]].tolist() + stack0[[8]].tolist() + stack1[[0]].tolist())
+    img_strs = tester.widget._text_edit.images_to_base64(out, None, 0.2)
+    assert len(img_strs) == 5
+
+def test_plot_reboxed_extracts(
+    qtbot,
+    make_job_directory: Callable[[str, str], JobDirectory],
+    jobs_dir_spa,
+):
+    import uuid
+    import polars as pl
+
+    star_text = Path(jobs_dir_spa / "Subtract" / "job001" / "job.star").read_text()
+    job_dir = make_job_directory(star_text, "Subtract")
+    tester = JobWidgetTester(QSubtractViewer(job_dir), job_dir)
+    qtbot.addWidget(tester.widget)
+    # subtracted particles re-boxed by the new_box option
+    tester.write_random_mrc(job_dir.path / "img_orig.mrcs", (5, 12, 12))
+    tester.write_random_mrc(job_dir.path / "img_sub.mrcs", (5, 8, 8))
+    star = as_star(
+        {
+            "particles": pl.DataFrame({
+                "rlnImageName": [
+                    f"{ith + 1:06d}@Subtract/job025/img_sub.mrcs" for ith in range(5)
+                ],
+                "rlnImageOriginalName": [
+                    f"{ith + 1:06d}@Subtract/job025/img_orig.mrcs" for ith in range(5)
+                ],
+            })
+        }
+    )
+    tester.write_text("particles_subtracted.star", star.to_string())
+    widget = tester.widget
+    widget.initialize(job_dir)
+    session = uuid.uuid4()
+    plot_extracts = QSubtractViewer.plot_extracts.__wrapped__
+    outputs = [value for _, value in plot_extracts(widget, 0, session)]
+    assert sum(text == " -> " for text, _ in outputs) == 5
@@ -34,6 +34,14 @@ def test_reconstruct_tomo_widget(
 
     tester.widget._tomo_list.set_current_row(1)
 
+    # released and reloaded
+    widget = tester.widget
+    widget.release_memory()
+    assert not widget._viewer.has_image
+    widget.show()
+    assert widget._viewer.has_image
+    assert widget._tomo_list.current_text() == "TS_02"
+
 def test_reconstruct_by_aretomo_widget(
     qtbot,
     make_job_directory: Callable[[str, str], JobDirectory],